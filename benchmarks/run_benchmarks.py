@@ -0,0 +1,647 @@
+'''
+    Offline benchmark suite for the ingest jobs of the
+    PAGASA-DOST website. Every executor runs against
+    the stored HTML fixtures in benchmarks/fixtures,
+    served through a requests adapter, and the time
+    and memory allocation of each extract, map and
+    save function are recorded for every HTML parser
+    backend. Every public function of the ingest
+    modules is also called directly, including the
+    ones the executors don't pass through
+    timed_call().
+
+    Usage:
+        python benchmarks/run_benchmarks.py
+        python benchmarks/run_benchmarks.py --html-parser lxml selectolax --repeat 20
+'''
+import os
+import sys
+
+# Benchmarks must never hit the network or skip unchanged fixtures
+os.environ['PAGASA_USE_VALIDATOR_CACHE'] = '0'
+os.environ['PAGASA_USE_CONTENT_HASH'] = '0'
+os.environ['PAGASA_USE_TIMING_SPANS'] = '0'
+os.environ['PAGASA_USE_METRICS'] = '0'
+os.environ['PAGASA_USE_HISTORY_STORE'] = '0'
+
+# Fixtures are served locally, so the polite per-host rate limits would only time token bucket sleeps
+os.environ['PAGASA_HOST_RATE'] = '0'
+os.environ['PAGASA_HOST_LIMITS'] = ''
+
+BENCHMARKS_SUBDIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_SUBDIR = os.path.join(BENCHMARKS_SUBDIR, 'fixtures')
+RESULTS_SUBDIR = os.path.join(BENCHMARKS_SUBDIR, 'results')
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARKS_SUBDIR), 'src'))
+
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+import tracemalloc
+from datetime import datetime
+from functools import partial
+from urllib.parse import urldefrag
+import requests
+from requests.adapters import BaseAdapter
+
+from fetch import fetch
+from parse import parse
+from parse.parse import make_beautiful_soup_object
+from ingest import ingest_daily_weather_forecast
+from ingest import ingest_weather_outlook_for_ph_cities
+from ingest import ingest_weather_outlook_for_ph_tourist_areas
+from ingest import ingest_weather_advisory
+from ingest import ingest_tropical_cyclone_associated_rainfall
+from executor.ingest import execute_ingest_daily_weather_forecast
+from executor.ingest import execute_ingest_weather_outlook_for_ph_cities
+from executor.ingest import execute_ingest_weather_outlook_for_ph_tourist_areas
+from executor.ingest import execute_ingest_weather_advisory
+from executor.ingest import execute_ingest_tropical_cyclone_associated_rainfall_executor
+
+# Fixtures of each PAGASA-DOST page
+FIXTURES = {
+    'https://www.pagasa.dost.gov.ph/weather': 'daily_weather_forecast.html',
+    'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-philippine-cities': 'weather_outlook_for_ph_cities.html',
+    'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-tourist-areas': 'weather_outlook_for_ph_tourist_areas.html',
+    'https://www.pagasa.dost.gov.ph/weather/weather-advisory': 'weather_advisory.html',
+    'https://www.pagasa.dost.gov.ph/climate/tropical-cyclone-associated-rainfall': 'tropical_cyclone_associated_rainfall.html'
+}
+
+# Fixture of the tropical cyclone associated rainfall page with the tabs of every year, which the backfill reads
+TC_RAINFALL_WITH_YEAR_LISTING_FIXTURE = 'tropical_cyclone_associated_rainfall_with_year_listing.html'
+
+# Benchmarked jobs with their executor module, executor function, ingest module, page URL and fixture
+JOBS = [
+    (
+        'daily_weather_forecast',
+        execute_ingest_daily_weather_forecast,
+        execute_ingest_daily_weather_forecast.ingest_daily_weather_forecast,
+        ingest_daily_weather_forecast,
+        'https://www.pagasa.dost.gov.ph/weather',
+        'daily_weather_forecast.html'
+    ),
+    (
+        'daily_weather_forecast_with_tropical_cyclone',
+        execute_ingest_daily_weather_forecast,
+        execute_ingest_daily_weather_forecast.ingest_daily_weather_forecast,
+        ingest_daily_weather_forecast,
+        'https://www.pagasa.dost.gov.ph/weather',
+        'daily_weather_forecast_with_tropical_cyclone.html'
+    ),
+    (
+        'weather_outlook_for_ph_cities',
+        execute_ingest_weather_outlook_for_ph_cities,
+        execute_ingest_weather_outlook_for_ph_cities.ingest_weather_outlook_for_ph_cities,
+        ingest_weather_outlook_for_ph_cities,
+        'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-philippine-cities',
+        'weather_outlook_for_ph_cities.html'
+    ),
+    (
+        'weather_outlook_for_ph_tourist_areas',
+        execute_ingest_weather_outlook_for_ph_tourist_areas,
+        execute_ingest_weather_outlook_for_ph_tourist_areas.ingest_weather_outlook_for_ph_tourist_areas,
+        ingest_weather_outlook_for_ph_tourist_areas,
+        'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-tourist-areas',
+        'weather_outlook_for_ph_tourist_areas.html'
+    ),
+    (
+        'weather_advisory',
+        execute_ingest_weather_advisory,
+        execute_ingest_weather_advisory.ingest_weather_advisory,
+        ingest_weather_advisory,
+        'https://www.pagasa.dost.gov.ph/weather/weather-advisory',
+        'weather_advisory.html'
+    ),
+    (
+        'tropical_cyclone_associated_rainfall',
+        execute_ingest_tropical_cyclone_associated_rainfall_executor,
+        execute_ingest_tropical_cyclone_associated_rainfall_executor.ingest_tropical_cyclone_associated_rainfall,
+        ingest_tropical_cyclone_associated_rainfall,
+        'https://www.pagasa.dost.gov.ph/climate/tropical-cyclone-associated-rainfall',
+        'tropical_cyclone_associated_rainfall.html'
+    ),
+    (
+        'tropical_cyclone_associated_rainfall_backfill',
+        execute_ingest_tropical_cyclone_associated_rainfall_executor,
+        partial(
+            execute_ingest_tropical_cyclone_associated_rainfall_executor.backfill_tropical_cyclone_associated_rainfalls,
+            force=True
+        ),
+        ingest_tropical_cyclone_associated_rainfall,
+        'https://www.pagasa.dost.gov.ph/climate/tropical-cyclone-associated-rainfall',
+        TC_RAINFALL_WITH_YEAR_LISTING_FIXTURE
+    )
+]
+
+class FixtureAdapter(BaseAdapter):
+    '''
+        Requests adapter that answers every request
+        for a PAGASA-DOST page with its stored HTML
+        fixture instead of going to the network.
+    '''
+    def __init__(self):
+        super().__init__()
+        self.fixtures = dict(FIXTURES)
+        self._bodies = {}
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.encoding = 'utf-8'
+
+        # Fragments such as #daily-weather-forecast never reach the server
+        url, _ = urldefrag(request.url)
+        filename = self.fixtures.get(url.rstrip('/'))
+
+        if filename is None:
+            response.status_code = 404
+            response._content = b''
+            return response
+
+        if filename not in self._bodies:
+            with open(os.path.join(FIXTURES_SUBDIR, filename), 'rb') as fixture_file:
+                self._bodies[filename] = fixture_file.read()
+
+        response.status_code = 200
+        response._content = self._bodies[filename]
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+
+        return response
+
+    def close(self):
+        pass
+
+class CallRecorder:
+    '''
+        Stand-in for timed_call() and the page loader
+        of an executor that records the time, or the
+        peak memory allocation, of every call.
+    '''
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.durations = {}
+        self.peak_allocations = {}
+
+    def record(self, name, function, *args, **kwargs):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            allocated_before, _ = tracemalloc.get_traced_memory()
+            result = function(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_allocations.setdefault(name, []).append(max(peak - allocated_before, 0))
+            return result
+
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.durations.setdefault(name, []).append(time.perf_counter() - start)
+        return result
+
+    def timed_call(self, stage, function, *args, **kwargs):
+        return self.record(function.__name__, function, *args, **kwargs)
+
+    def call(self, function, *args, **kwargs):
+        return self.record(function.__name__, function, *args, **kwargs)
+
+    def wrap(self, function):
+        def wrapper(*args, **kwargs):
+            return self.record(function.__name__, function, *args, **kwargs)
+
+        return wrapper
+
+def run_job(
+        executor_module,
+        executor_function,
+        recorder: CallRecorder
+) -> float:
+    '''
+    Runs an executor once with its timed_call() and
+    page loader replaced by the recorder, and
+    returns its end-to-end time in seconds.
+    '''
+    original_timed_call = executor_module.timed_call
+    original_loader = executor_module.extract_beautiful_soup_object
+
+    executor_module.timed_call = recorder.timed_call
+    executor_module.extract_beautiful_soup_object = recorder.wrap(original_loader)
+
+    try:
+        start = time.perf_counter()
+        executor_function()
+        return time.perf_counter() - start
+
+    finally:
+        executor_module.timed_call = original_timed_call
+        executor_module.extract_beautiful_soup_object = original_loader
+
+def summarize(
+        values: list[float]
+) -> dict[str, float]:
+    '''
+    Summarizes the timings of a function in seconds.
+    '''
+    return {
+        'calls': len(values),
+        'min_seconds': round(min(values), 6),
+        'median_seconds': round(statistics.median(values), 6),
+        'mean_seconds': round(statistics.fmean(values), 6)
+    }
+
+def benchmark_parsing(
+        html_parser: str,
+        repeat: int
+) -> dict[str, dict]:
+    '''
+    Times how long each fixture takes to parse,
+    both as the regions its ingest module reads
+    and as the whole page.
+    '''
+    results = {}
+
+    for name, _, _, ingest_module, _, filename in JOBS:
+        with open(os.path.join(FIXTURES_SUBDIR, filename), 'r', encoding='utf-8') as fixture_file:
+            markup = fixture_file.read()
+
+        for label, regions in [('regions', ingest_module.PAGE_REGIONS), ('whole_page', None)]:
+            durations = []
+
+            for _ in range(repeat):
+                start = time.perf_counter()
+                make_beautiful_soup_object(markup, regions, html_parser)
+                durations.append(time.perf_counter() - start)
+
+            results[f'{name}:{label}'] = summarize(durations)
+
+    return results
+
+def benchmark_jobs(
+        html_parser: str,
+        repeat: int,
+        adapter: FixtureAdapter
+) -> dict[str, dict]:
+    '''
+    Runs every executor against the fixtures and
+    records the end-to-end time, and the time and
+    peak memory allocation of each function.
+    '''
+    parse.HTML_PARSER = html_parser
+    results = {}
+
+    for name, executor_module, executor_function, _, url, filename in JOBS:
+        adapter.fixtures = dict(FIXTURES, **{url: filename})
+
+        # Warm up once so imports and caches don't count towards the first run
+        run_job(executor_module, executor_function, CallRecorder())
+
+        timing_recorder = CallRecorder()
+        end_to_end_durations = [
+            run_job(executor_module, executor_function, timing_recorder)
+            for _ in range(repeat)
+        ]
+
+        # Trace memory in a separate run so tracing doesn't distort the timings
+        memory_recorder = CallRecorder(trace_memory=True)
+        tracemalloc.start()
+
+        try:
+            run_job(executor_module, executor_function, memory_recorder)
+
+        finally:
+            tracemalloc.stop()
+
+        results[name] = {
+            'end_to_end': summarize(end_to_end_durations),
+            'functions': {
+                function_name: dict(
+                    summarize(durations),
+                    peak_allocation_kib=round(max(memory_recorder.peak_allocations.get(function_name, [0])) / 1024, 1)
+                )
+                for function_name, durations in timing_recorder.durations.items()
+            }
+        }
+
+    adapter.fixtures = dict(FIXTURES)
+    return results
+
+def call_daily_weather_forecast_functions(
+        url: str,
+        recorder: CallRecorder
+) -> None:
+    '''
+    Calls every public function of the
+    ingest_daily_weather_forecast module directly.
+    '''
+    module = ingest_daily_weather_forecast
+    recorder.call(module.create_subdir)
+
+    soup = recorder.call(module.extract_beautiful_soup_object, url)
+    page = recorder.call(module.extract_daily_weather_forecast_page, soup)
+
+    for extract_function, save_function in [
+        (module.extract_issued_datetime, module.save_issued_datetime_to_json),
+        (module.extract_synopsis, module.save_synopsis_to_json),
+        (module.extract_tc_information, module.save_tc_information_to_json),
+        (module.extract_forecast_weather_conditions, module.save_forecast_weather_conditions_to_json),
+        (
+            module.extract_forecast_wind_and_coastal_water_conditions,
+            module.save_forecast_wind_and_coastal_water_conditions_to_json
+        ),
+        (module.extract_temperature_and_relative_humidity, module.save_temperature_and_relative_humidity_to_json)
+    ]:
+        recorder.call(save_function, recorder.call(extract_function, page))
+
+def call_weather_outlook_for_ph_cities_functions(
+        url: str,
+        recorder: CallRecorder
+) -> None:
+    '''
+    Calls every public function of the
+    ingest_weather_outlook_for_ph_cities module
+    directly, both the extract and map functions
+    and the fused extraction the executor uses.
+    '''
+    module = ingest_weather_outlook_for_ph_cities
+    recorder.call(module.create_subdir)
+
+    soup = recorder.call(module.extract_beautiful_soup_object, url)
+    recorder.call(module.save_issued_datetime_to_json, recorder.call(module.extract_issued_datetime, soup))
+    recorder.call(module.save_valid_period_to_json, recorder.call(module.extract_valid_period, soup))
+
+    list_of_all_ph_city_tags = recorder.call(module.extract_ph_city_tags, soup)
+    ph_city_names = recorder.call(module.extract_ph_city_names, list_of_all_ph_city_tags)
+    weather_dates = recorder.call(module.extract_weather_dates, list_of_all_ph_city_tags)
+    temperature_ranges = recorder.call(module.extract_temperature_ranges, list_of_all_ph_city_tags)
+    chance_of_rain_percentages = recorder.call(module.extract_chance_of_rain_percentages, list_of_all_ph_city_tags)
+
+    ph_cities_with_weather_dates = recorder.call(module.map_weather_dates_to_ph_cities, weather_dates, ph_city_names)
+    ph_cities_with_temperature_ranges = recorder.call(
+        module.map_temperature_ranges_to_ph_cities,
+        temperature_ranges,
+        ph_cities_with_weather_dates
+    )
+    recorder.call(
+        module.map_chance_of_rain_percentages_to_ph_cities,
+        chance_of_rain_percentages,
+        ph_cities_with_temperature_ranges
+    )
+
+    for ph_city_tag in list_of_all_ph_city_tags:
+        recorder.call(module.extract_ph_city_record, ph_city_tag)
+
+    ph_cities_weather_outlook = recorder.call(module.extract_ph_cities_weather_outlook, list_of_all_ph_city_tags)
+    recorder.call(module.save_ph_cities_weather_outlook_to_json, ph_cities_weather_outlook)
+
+def call_weather_outlook_for_ph_tourist_areas_functions(
+        url: str,
+        recorder: CallRecorder
+) -> None:
+    '''
+    Calls every public function of the
+    ingest_weather_outlook_for_ph_tourist_areas
+    module directly.
+    '''
+    module = ingest_weather_outlook_for_ph_tourist_areas
+    recorder.call(module.create_subdir)
+
+    soup = recorder.call(module.extract_beautiful_soup_object, url)
+    recorder.call(module.save_issued_datetime_to_json, recorder.call(module.extract_issued_datetime, soup))
+    recorder.call(module.save_valid_period_to_json, recorder.call(module.extract_valid_period, soup))
+
+    list_of_all_ph_tourist_area_tags = recorder.call(module.extract_ph_tourist_area_tags, soup)
+    ph_tourist_area_names = recorder.call(module.extract_ph_tourist_area_names, list_of_all_ph_tourist_area_tags)
+    weather_dates = recorder.call(module.extract_weather_dates, soup)
+    temperature_ranges = recorder.call(module.extract_temperature_ranges, list_of_all_ph_tourist_area_tags)
+
+    ph_tourist_areas_with_weather_dates = recorder.call(
+        module.map_weather_dates_to_ph_tourist_areas,
+        weather_dates,
+        ph_tourist_area_names
+    )
+    ph_tourist_areas_weather_outlook = recorder.call(
+        module.map_temperature_ranges_to_ph_tourist_areas,
+        temperature_ranges,
+        ph_tourist_areas_with_weather_dates
+    )
+    recorder.call(module.save_ph_tourist_areas_weather_outlook_to_json, ph_tourist_areas_weather_outlook)
+
+def call_weather_advisory_functions(
+        url: str,
+        recorder: CallRecorder
+) -> None:
+    '''
+    Calls every public function of the
+    ingest_weather_advisory module directly.
+    '''
+    module = ingest_weather_advisory
+    recorder.call(module.create_subdir)
+
+    soup = recorder.call(module.extract_beautiful_soup_object, url)
+    recorder.call(module.save_weather_advisory_to_json, recorder.call(module.extract_weather_advisory, soup))
+
+def call_tropical_cyclone_associated_rainfall_functions(
+        url: str,
+        recorder: CallRecorder
+) -> None:
+    '''
+    Calls every public function of the
+    ingest_tropical_cyclone_associated_rainfall
+    module directly, including the year listings
+    that only the backfill reads.
+    '''
+    module = ingest_tropical_cyclone_associated_rainfall
+    recorder.call(module.create_subdir)
+
+    soup = recorder.call(module.extract_beautiful_soup_object, url)
+    recorder.call(
+        module.save_tropical_cyclone_associated_rainfall_to_json,
+        recorder.call(module.extract_tropical_cyclone_associated_rainfall, soup)
+    )
+
+    whole_page_soup = recorder.call(module.extract_whole_page_soup, url)
+    year_listing_urls = recorder.call(module.extract_year_listing_urls, whole_page_soup, url)
+
+    for year, year_listing_url in year_listing_urls.items():
+        recorder.call(module.is_year_complete, year)
+        recorder.call(
+            module.save_tropical_cyclone_associated_rainfalls_to_json,
+            year,
+            recorder.call(module.extract_tropical_cyclone_associated_rainfalls, whole_page_soup, year_listing_url)
+        )
+
+# Benchmarked ingest modules with the function that calls their public functions, page URL and fixture
+FUNCTIONS = [
+    (
+        'daily_weather_forecast',
+        call_daily_weather_forecast_functions,
+        'https://www.pagasa.dost.gov.ph/weather',
+        'daily_weather_forecast_with_tropical_cyclone.html'
+    ),
+    (
+        'weather_outlook_for_ph_cities',
+        call_weather_outlook_for_ph_cities_functions,
+        'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-philippine-cities',
+        'weather_outlook_for_ph_cities.html'
+    ),
+    (
+        'weather_outlook_for_ph_tourist_areas',
+        call_weather_outlook_for_ph_tourist_areas_functions,
+        'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-tourist-areas',
+        'weather_outlook_for_ph_tourist_areas.html'
+    ),
+    (
+        'weather_advisory',
+        call_weather_advisory_functions,
+        'https://www.pagasa.dost.gov.ph/weather/weather-advisory',
+        'weather_advisory.html'
+    ),
+    (
+        'tropical_cyclone_associated_rainfall',
+        call_tropical_cyclone_associated_rainfall_functions,
+        'https://www.pagasa.dost.gov.ph/climate/tropical-cyclone-associated-rainfall',
+        TC_RAINFALL_WITH_YEAR_LISTING_FIXTURE
+    )
+]
+
+def benchmark_functions(
+        html_parser: str,
+        repeat: int,
+        adapter: FixtureAdapter
+) -> dict[str, dict]:
+    '''
+    Calls every public function of each ingest
+    module directly against the fixtures and
+    records the time and peak memory allocation
+    of each function.
+    '''
+    parse.HTML_PARSER = html_parser
+    results = {}
+
+    for name, call_functions, url, filename in FUNCTIONS:
+        adapter.fixtures = dict(FIXTURES, **{url: filename})
+
+        # Warm up once so imports and caches don't count towards the first run
+        call_functions(url, CallRecorder())
+
+        timing_recorder = CallRecorder()
+        for _ in range(repeat):
+            call_functions(url, timing_recorder)
+
+        # Trace memory in a separate run so tracing doesn't distort the timings
+        memory_recorder = CallRecorder(trace_memory=True)
+        tracemalloc.start()
+
+        try:
+            call_functions(url, memory_recorder)
+
+        finally:
+            tracemalloc.stop()
+
+        results[name] = {
+            function_name: dict(
+                summarize(durations),
+                peak_allocation_kib=round(max(memory_recorder.peak_allocations.get(function_name, [0])) / 1024, 1)
+            )
+            for function_name, durations in timing_recorder.durations.items()
+        }
+
+    adapter.fixtures = dict(FIXTURES)
+    return results
+
+def print_results(
+        results: dict
+) -> None:
+    '''
+    Prints the results as one table per HTML parser.
+    '''
+    for html_parser, parser_results in results['html_parsers'].items():
+        print(f'\n== {html_parser} ==')
+
+        for job_name, job_results in parser_results['jobs'].items():
+            end_to_end = job_results['end_to_end']
+            print(f'{job_name:<48} end-to-end {end_to_end["median_seconds"] * 1000:9.2f} ms')
+
+            for function_name, function_results in job_results['functions'].items():
+                print(
+                    f'    {function_name:<60} '
+                    f'{function_results["median_seconds"] * 1000:9.3f} ms '
+                    f'{function_results["peak_allocation_kib"]:10.1f} KiB'
+                )
+
+        print('functions called directly (median):')
+        for module_name, module_results in parser_results['functions'].items():
+            print(f'{module_name}')
+
+            for function_name, function_results in module_results.items():
+                print(
+                    f'    {function_name:<60} '
+                    f'{function_results["median_seconds"] * 1000:9.3f} ms '
+                    f'{function_results["peak_allocation_kib"]:10.1f} KiB'
+                )
+
+        print('parsing (median):')
+        for label, parse_results in parser_results['parsing'].items():
+            print(f'    {label:<60} {parse_results["median_seconds"] * 1000:9.3f} ms')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmarks every ingest job against stored HTML fixtures, without network access.'
+    )
+    parser.add_argument(
+        '--html-parser',
+        nargs='+',
+        default=[name for name in parse.SUPPORTED_HTML_PARSERS if parse.is_html_parser_available(name)],
+        help='HTML parser backends to compare (default: every installed backend)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=10,
+        help='number of timed runs of every job and parse'
+    )
+    parser.add_argument(
+        '--output',
+        default=os.path.join(RESULTS_SUBDIR, f'benchmarks_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'),
+        help='JSON file to save the results to'
+    )
+    args = parser.parse_args()
+    output_filepath = os.path.abspath(args.output)
+
+    # Serve every PAGASA-DOST page from the fixtures through the shared session
+    adapter = FixtureAdapter()
+    fetch.get_session().mount('https://www.pagasa.dost.gov.ph', adapter)
+
+    # Run inside a scratch directory so the executors don't overwrite data/raw
+    working_subdir = tempfile.mkdtemp(prefix='pagasa-benchmarks-')
+    original_working_subdir = os.getcwd()
+    os.chdir(working_subdir)
+
+    try:
+        results = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'html_parsers': {
+                html_parser: {
+                    'jobs': benchmark_jobs(html_parser, args.repeat, adapter),
+                    'functions': benchmark_functions(html_parser, args.repeat, adapter),
+                    'parsing': benchmark_parsing(html_parser, args.repeat)
+                }
+                for html_parser in args.html_parser
+            }
+        }
+
+    finally:
+        os.chdir(original_working_subdir)
+        shutil.rmtree(working_subdir, ignore_errors=True)
+
+    print_results(results)
+
+    os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
+    with open(output_filepath, 'w') as json_file:
+        json.dump(results, json_file, indent=4)
+
+    print(f'\nSaved the results to {output_filepath}')
@@ -0,0 +1,6 @@
+'''
+    Command line interface for the ETL pipeline jobs
+    that process data from the PAGASA-DOST website,
+    run from the root of the repository with
+    python -m pagasa.
+'''
@@ -0,0 +1,214 @@
+'''
+    Module for running the ETL pipeline jobs for the
+    PAGASA-DOST website from the command line, such as
+    python -m pagasa run cities advisory. Only the
+    modules that a command needs are imported, so a
+    single-dataset run doesn't pay for the others.
+'''
+import sys
+import os
+sys.path.insert(0, os.path.abspath('src'))
+
+import argparse
+
+from executor.registry import INGEST_JOBS
+from executor.registry import DATASET_ALIASES
+from executor.registry import resolve_dataset
+from monitor.profiling import SUPPORTED_PROFILE_MODES
+
+def add_run_arguments(
+        parser: argparse.ArgumentParser
+) -> None:
+    '''
+    Adds the arguments shared by the run and daemon
+    commands to their parser.
+
+    :param parser: Parser of the command
+    :type parser: argparse.ArgumentParser
+    '''
+    parser.add_argument(
+        'datasets',
+        nargs='*',
+        metavar='dataset',
+        help='datasets to ingest, by name or short name (default: all)'
+    )
+    parser.add_argument(
+        '--concurrent',
+        action='store_true',
+        default=os.environ.get('PAGASA_CONCURRENT', '') == '1',
+        help='run the ingest jobs at the same time using a thread pool'
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=None,
+        help='maximum number of ingest jobs to run at the same time'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='+',
+        choices=SUPPORTED_PROFILE_MODES,
+        default=[],
+        help='profile each ingest job and write the profiles to src/logs/profiles'
+    )
+    parser.add_argument(
+        '--extract-stage',
+        action='store_true',
+        help='stage the new or changed raw files to data/stage after ingesting'
+    )
+    parser.add_argument(
+        '--transform-stage',
+        action='store_true',
+        help='transform the staged datasets into numeric tables in data/transform'
+    )
+    parser.add_argument(
+        '--include-history',
+        action='store_true',
+        help='also transform every archived snapshot of the history store'
+    )
+
+def create_parser(
+) -> argparse.ArgumentParser:
+    '''
+    Creates the parser of the command line.
+
+    :return: Parser with the run, daemon, backfill,
+        download, extract, transform and list commands
+    :rtype: argparse.ArgumentParser
+    '''
+    parser = argparse.ArgumentParser(
+        prog='python -m pagasa',
+        description='Runs the ETL pipeline jobs for the PAGASA-DOST website.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run the ingest jobs once')
+    add_run_arguments(run_parser)
+    run_parser.add_argument(
+        '--download-stage',
+        action='store_true',
+        help='download the new rainfall maps to data/images after ingesting'
+    )
+
+    daemon_parser = subparsers.add_parser('daemon', help='keep polling each dataset on its own interval')
+    add_run_arguments(daemon_parser)
+
+    backfill_parser = subparsers.add_parser(
+        'backfill',
+        help='crawl the tropical cyclone associated rainfalls of every year'
+    )
+    backfill_parser.add_argument(
+        '--force',
+        action='store_true',
+        help='also crawl the past years that are already complete'
+    )
+
+    subparsers.add_parser('download', help='download the new rainfall maps to the content addressed store in data/images')
+
+    subparsers.add_parser('extract', help='stage the new or changed raw files to data/stage')
+
+    transform_parser = subparsers.add_parser('transform', help='transform the staged datasets into numeric tables')
+    transform_parser.add_argument(
+        '--include-history',
+        action='store_true',
+        help='also transform every archived snapshot of the history store'
+    )
+
+    subparsers.add_parser('list', help='list the datasets with their short names')
+
+    return parser
+
+def list_datasets(
+) -> None:
+    '''
+    Prints every dataset with its short name.
+    '''
+    short_names = {dataset: alias for alias, dataset in DATASET_ALIASES.items()}
+
+    for dataset in INGEST_JOBS:
+        print(f'{short_names.get(dataset, ""):<12} {dataset}')
+
+def main(
+        argv: list[str] | None = None
+) -> int:
+    '''
+    Runs a command of the command line.
+
+    :param argv: Arguments of the command line,
+        or None to use sys.argv
+    :type argv: list[str] | None
+
+    :return: Exit status, 0 if every job succeeded
+    :rtype: int
+    '''
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        list_datasets()
+        return 0
+
+    # We need to check if every dataset exists before anything is imported or run
+    datasets = None
+    if getattr(args, 'datasets', None):
+        try:
+            datasets = [resolve_dataset(name) for name in args.datasets]
+
+        except ValueError as error:
+            parser.error(f'{error}, choose from: {", ".join(DATASET_ALIASES)}')
+
+    # Imported here so the list command and argument errors stay instant
+    from logs.logs import MAX_WORKERS
+    from logs.logs import run_daemon
+    from logs.logs import run_backfill
+    from logs.logs import run_download_stage
+    from logs.logs import run_ingest_jobs
+    from logs.logs import run_extract_stage
+    from logs.logs import run_transform_stage
+
+    if args.command == 'backfill':
+        return 0 if run_backfill(args.force) else 1
+
+    if args.command == 'download':
+        return 0 if run_download_stage() else 1
+
+    if args.command == 'extract':
+        return 0 if run_extract_stage() else 1
+
+    if args.command == 'transform':
+        return 0 if run_transform_stage(args.include_history) else 1
+
+    max_workers = args.max_workers or MAX_WORKERS
+
+    if args.command == 'daemon':
+        run_daemon(
+            concurrent=args.concurrent,
+            max_workers=max_workers,
+            profile_modes=tuple(args.profile),
+            extract_stage=args.extract_stage,
+            transform_stage=args.transform_stage,
+            include_history=args.include_history,
+            datasets=datasets
+        )
+        return 0
+
+    all_jobs_succeeded = run_ingest_jobs(
+        concurrent=args.concurrent,
+        max_workers=max_workers,
+        profile_modes=tuple(args.profile),
+        datasets=datasets
+    )
+
+    if args.download_stage:
+        all_jobs_succeeded = run_download_stage() and all_jobs_succeeded
+
+    if args.extract_stage:
+        all_jobs_succeeded = run_extract_stage() and all_jobs_succeeded
+
+    if args.transform_stage:
+        all_jobs_succeeded = run_transform_stage(args.include_history) and all_jobs_succeeded
+
+    return 0 if all_jobs_succeeded else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,6 @@
-from . import extract_daily_weather_forecast
\ No newline at end of file
+from . import stage
+from . import extract_daily_weather_forecast
+from . import extract_weather_outlook_for_ph_cities
+from . import extract_weather_outlook_for_ph_tourist_areas
+from . import extract_weather_advisory
+from . import extract_tropical_cyclone_associated_rainfall
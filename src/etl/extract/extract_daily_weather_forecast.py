@@ -2,7 +2,9 @@
     Module to extract daily weather forecast data
     from the data/raw subdirectory on the local machine.
 '''
-import pandas as pd
+from etl.extract.stage import stage_json_file
+
+DATASET = 'daily_weather_forecast'
 
 def stage_issued_datetime(
         issued_datetime_filepath: str
@@ -18,4 +20,95 @@ def stage_issued_datetime(
         the issued datetime of the daily weather
         forecast
     :type issued_datetime_filepath: str
-    '''
\ No newline at end of file
+    '''
+    stage_json_file(issued_datetime_filepath, DATASET)
+
+def stage_synopsis(
+        synopsis_filepath: str
+) -> None:
+    '''
+    Stages the JSON file that contains
+    the synopsis of the daily weather forecast
+    to the data/stage subdirectory
+    on the local machine.
+
+    :param synopsis_filepath: Relative
+        filepath of the JSON file that contains
+        the synopsis of the daily weather forecast
+    :type synopsis_filepath: str
+    '''
+    stage_json_file(synopsis_filepath, DATASET)
+
+def stage_tc_information(
+        tc_information_filepath: str
+) -> None:
+    '''
+    Stages the JSON file that contains
+    the tropical cyclone information of the daily weather forecast
+    to the data/stage subdirectory
+    on the local machine.
+
+    :param tc_information_filepath: Relative
+        filepath of the JSON file that contains
+        the tropical cyclone information of the daily weather forecast
+    :type tc_information_filepath: str
+    '''
+    stage_json_file(tc_information_filepath, DATASET)
+
+def stage_forecast_weather_conditions(
+        forecast_weather_conditions_filepath: str
+) -> None:
+    '''
+    Stages the JSON file that contains
+    the forecast weather conditions of the daily weather forecast
+    to the data/stage subdirectory
+    on the local machine.
+
+    :param forecast_weather_conditions_filepath: Relative
+        filepath of the JSON file that contains
+        the forecast weather conditions of the daily weather forecast
+    :type forecast_weather_conditions_filepath: str
+    '''
+    stage_json_file(forecast_weather_conditions_filepath, DATASET)
+
+def stage_forecast_wind_and_coastal_water_conditions(
+        forecast_wind_and_coastal_water_conditions_filepath: str
+) -> None:
+    '''
+    Stages the JSON file that contains
+    the forecast wind and coastal water conditions of the daily weather forecast
+    to the data/stage subdirectory
+    on the local machine.
+
+    :param forecast_wind_and_coastal_water_conditions_filepath: Relative
+        filepath of the JSON file that contains
+        the forecast wind and coastal water conditions of the daily weather forecast
+    :type forecast_wind_and_coastal_water_conditions_filepath: str
+    '''
+    stage_json_file(forecast_wind_and_coastal_water_conditions_filepath, DATASET)
+
+def stage_temperature_and_relative_humidity(
+        temperature_and_relative_humidity_filepath: str
+) -> None:
+    '''
+    Stages the JSON file that contains
+    the temperature and relative humidity of the daily weather forecast
+    to the data/stage subdirectory
+    on the local machine.
+
+    :param temperature_and_relative_humidity_filepath: Relative
+        filepath of the JSON file that contains
+        the temperature and relative humidity of the daily weather forecast
+    :type temperature_and_relative_humidity_filepath: str
+    '''
+    stage_json_file(temperature_and_relative_humidity_filepath, DATASET)
+
+# Raw filenames (or filename patterns) with the function that stages them
+STAGE_FUNCTIONS = {
+    'issued_datetime.json': stage_issued_datetime,
+    'synopsis.json': stage_synopsis,
+    'tropical_cyclone_information.json': stage_tc_information,
+    'forecast_weather_conditions.json': stage_forecast_weather_conditions,
+    'forecast_wind_and_coastal_water_conditions.json': stage_forecast_wind_and_coastal_water_conditions,
+    'temperature_and_relative_humidity.json': stage_temperature_and_relative_humidity
+}
@@ -0,0 +1,18 @@
+'''
+    Module to extract the tropical cyclone
+    associated rainfall data from the data/raw
+    subdirectory on the local machine.
+'''
+from functools import partial
+from etl.extract.stage import stage_json_file
+
+DATASET = 'tropical_cyclone_associated_rainfall'
+
+# Every raw file of the dataset is staged as it is, with its strings normalized
+stage_raw_file = partial(stage_json_file, dataset=DATASET)
+
+# Raw filenames (or filename patterns) with the function that stages them
+STAGE_FUNCTIONS = {
+    'current_tropical_cyclone_associated_rainfall.json': stage_raw_file,
+    'tropical_cyclone_associated_rainfalls_of_*.json': stage_raw_file
+}
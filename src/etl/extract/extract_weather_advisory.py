@@ -0,0 +1,17 @@
+'''
+    Module to extract the weather advisory data
+    from the data/raw subdirectory on the local
+    machine.
+'''
+from functools import partial
+from etl.extract.stage import stage_json_file
+
+DATASET = 'weather_advisory'
+
+# Every raw file of the dataset is staged as it is, with its strings normalized
+stage_raw_file = partial(stage_json_file, dataset=DATASET)
+
+# Raw filenames (or filename patterns) with the function that stages them
+STAGE_FUNCTIONS = {
+    'weather_advisory.json': stage_raw_file
+}
@@ -0,0 +1,19 @@
+'''
+    Module to extract the weather outlook for
+    selected Philippine tourist areas data from the
+    data/raw subdirectory on the local machine.
+'''
+from functools import partial
+from etl.extract.stage import stage_json_file
+
+DATASET = 'weather_outlook_for_ph_tourist_areas'
+
+# Every raw file of the dataset is staged as it is, with its strings normalized
+stage_raw_file = partial(stage_json_file, dataset=DATASET)
+
+# Raw filenames (or filename patterns) with the function that stages them
+STAGE_FUNCTIONS = {
+    'issued_datetime.json': stage_raw_file,
+    'valid_period.json': stage_raw_file,
+    'ph_tourist_areas_weather_outlook.json': stage_raw_file
+}
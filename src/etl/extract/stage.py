@@ -0,0 +1,259 @@
+'''
+    Module for incrementally staging raw JSON files
+    from the data/raw subdirectory to the data/stage
+    subdirectory, keeping a watermark of the raw
+    files that were already staged.
+'''
+import os
+import json
+import fnmatch
+import hashlib
+from typing import Callable
+
+# Extract stage settings (can be overridden using environment variables)
+RAW_SUBDIR = os.environ.get('PAGASA_RAW_SUBDIR', 'data/raw')
+STAGE_SUBDIR = os.environ.get('PAGASA_STAGE_SUBDIR', 'data/stage')
+WATERMARK_FILEPATH = os.environ.get(
+    'PAGASA_STAGE_WATERMARK_FILEPATH',
+    'data/cache/stage_watermark.json'
+)
+
+def load_watermark(
+) -> dict[str, dict]:
+    '''
+    Loads the watermark of raw files that were
+    already staged, with the modification time,
+    size and content hash of each file.
+
+    :return: Dictionary of raw filepaths with their
+        modification time, size and content hash
+    :rtype: dict[str, dict]
+    '''
+    # We need to check if nothing was staged yet
+    if not os.path.exists(WATERMARK_FILEPATH):
+        return {}
+
+    with open(WATERMARK_FILEPATH, 'r') as json_file:
+        return json.load(json_file)
+
+def save_watermark(
+        watermark: dict[str, dict]
+) -> None:
+    '''
+    Saves the watermark of raw files that were
+    already staged, writing to a temporary file
+    first so it is never left half-written.
+
+    :param watermark: Dictionary of raw filepaths
+        with their modification time, size and
+        content hash
+    :type watermark: dict[str, dict]
+    '''
+    watermark_subdir = os.path.dirname(WATERMARK_FILEPATH)
+    if watermark_subdir and not os.path.exists(watermark_subdir):
+        os.makedirs(watermark_subdir, exist_ok=True)
+
+    temporary_filepath = f'{WATERMARK_FILEPATH}.{os.getpid()}.tmp'
+    with open(temporary_filepath, 'w') as json_file:
+        json.dump(watermark, json_file, indent=4)
+
+    os.replace(temporary_filepath, WATERMARK_FILEPATH)
+
+def check_raw_file(
+        raw_filepath: str,
+        stat_result: os.stat_result,
+        watermark: dict[str, dict]
+) -> dict | None:
+    '''
+    Checks if a raw file is new or changed since it
+    was last staged. Files with the same modification
+    time and size as in the watermark are skipped
+    without being read, and the others are only
+    staged if their content hash changed.
+
+    :param raw_filepath: Relative filepath of the
+        raw JSON file
+    :type raw_filepath: str
+
+    :param stat_result: Result of os.stat() for the
+        raw JSON file
+    :type stat_result: os.stat_result
+
+    :param watermark: Dictionary of raw filepaths
+        with their modification time, size and
+        content hash
+    :type watermark: dict[str, dict]
+
+    :return: New watermark entry of the raw file if
+        it has to be staged, otherwise None
+    :rtype: dict | None
+    '''
+    entry = watermark.get(raw_filepath, {})
+
+    # Trust the modification time and size so unchanged files aren't read at all
+    if entry.get('mtime_ns') == stat_result.st_mtime_ns and entry.get('size') == stat_result.st_size:
+        return None
+
+    with open(raw_filepath, 'rb') as raw_file:
+        content_hash = hashlib.sha256(raw_file.read()).hexdigest()
+
+    new_entry = {
+        'mtime_ns': stat_result.st_mtime_ns,
+        'size': stat_result.st_size,
+        'content_hash': content_hash
+    }
+
+    # A file that was rewritten with the same content only needs its watermark updated
+    if entry.get('content_hash') == content_hash:
+        watermark[raw_filepath] = new_entry
+        return None
+
+    return new_entry
+
+def normalize_json(
+        value
+):
+    '''
+    Normalizes a JSON value by collapsing the
+    whitespace of every string in it, such as the
+    double spaces and line breaks left over from
+    the HTML of the page.
+
+    :param value: JSON value loaded from a raw file
+
+    :return: Normalized JSON value
+    '''
+    if isinstance(value, str):
+        return ' '.join(value.split())
+
+    if isinstance(value, list):
+        return [normalize_json(item) for item in value]
+
+    if isinstance(value, dict):
+        return {
+            normalize_json(key): normalize_json(item)
+            for key, item in value.items()
+        }
+
+    return value
+
+def stage_json_file(
+        raw_filepath: str,
+        dataset: str
+) -> str:
+    '''
+    Stages a raw JSON file of a dataset to the
+    data/stage subdirectory with its strings
+    normalized.
+
+    :param raw_filepath: Relative filepath of the
+        raw JSON file
+    :type raw_filepath: str
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :return: Relative filepath of the staged JSON file
+    :rtype: str
+    '''
+    with open(raw_filepath, 'r') as json_file:
+        data = json.load(json_file)
+
+    stage_subdir = os.path.join(STAGE_SUBDIR, dataset)
+    if not os.path.exists(stage_subdir):
+        os.makedirs(stage_subdir, exist_ok=True)
+
+    stage_filepath = os.path.join(stage_subdir, os.path.basename(raw_filepath))
+
+    # Write to a temporary file first so readers never see a half-written file
+    temporary_filepath = f'{stage_filepath}.{os.getpid()}.tmp'
+    with open(temporary_filepath, 'w') as json_file:
+        json.dump(normalize_json(data), json_file, indent=4)
+
+    os.replace(temporary_filepath, stage_filepath)
+
+    return stage_filepath
+
+def find_stage_function(
+        filename: str,
+        stage_functions: dict[str, Callable]
+) -> Callable | None:
+    '''
+    Finds the stage function of a raw file by
+    matching its filename against the filename
+    patterns of a dataset.
+
+    :param filename: Name of the raw JSON file
+    :type filename: str
+
+    :param stage_functions: Dictionary of filename
+        patterns with their stage functions
+    :type stage_functions: dict[str, Callable]
+
+    :return: Stage function of the raw file, or None
+        if the dataset doesn't stage it
+    :rtype: Callable | None
+    '''
+    # Look up exact filenames first since almost every raw file has a fixed name
+    if filename in stage_functions:
+        return stage_functions[filename]
+
+    for filename_pattern, stage_function in stage_functions.items():
+        if fnmatch.fnmatchcase(filename, filename_pattern):
+            return stage_function
+
+    return None
+
+def stage_changed_raw_files(
+        stage_functions_by_dataset: dict[str, dict[str, Callable]]
+) -> list[str]:
+    '''
+    Stages every new or changed raw JSON file of all
+    datasets in a single pass. The watermark is
+    loaded and saved once, so the cost of the pass
+    follows what changed rather than the size of the
+    data/raw subdirectory.
+
+    :param stage_functions_by_dataset: Dictionary of
+        datasets with their filename patterns and
+        stage functions
+    :type stage_functions_by_dataset: dict[str, dict[str, Callable]]
+
+    :return: List of raw filepaths that were staged
+    :rtype: list[str]
+    '''
+    watermark = load_watermark()
+    list_of_all_staged_filepaths = []
+
+    for dataset, stage_functions in stage_functions_by_dataset.items():
+        raw_subdir = os.path.join(RAW_SUBDIR, dataset)
+
+        # We need to check if the dataset wasn't ingested yet
+        if not os.path.isdir(raw_subdir):
+            continue
+
+        # scandir() returns the file sizes and modification times without extra stat calls
+        with os.scandir(raw_subdir) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith('.json'):
+                    continue
+
+                stage_function = find_stage_function(entry.name, stage_functions)
+
+                if stage_function is None:
+                    continue
+
+                raw_filepath = os.path.join(raw_subdir, entry.name)
+                new_entry = check_raw_file(raw_filepath, entry.stat(), watermark)
+
+                if new_entry is None:
+                    continue
+
+                stage_function(raw_filepath)
+                watermark[raw_filepath] = new_entry
+                list_of_all_staged_filepaths.append(raw_filepath)
+
+    save_watermark(watermark)
+
+    return list_of_all_staged_filepaths
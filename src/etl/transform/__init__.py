@@ -0,0 +1,3 @@
+from . import categorical
+from . import transform_daily_weather_forecast
+from . import transform_weather_outlook
@@ -0,0 +1,43 @@
+'''
+    Module with helpers for transforming columns
+    of scraped strings through their unique values,
+    since the same strings repeat across areas,
+    places and snapshots.
+'''
+from typing import Callable
+import pandas as pd
+
+def transform_unique_values(
+        series: pd.Series,
+        transform_function: Callable[[pd.Series], pd.Series]
+) -> pd.Series:
+    '''
+    Applies a vectorized transform function to the
+    unique values of a Series only, then broadcasts
+    the results back to every row using the category
+    codes of the Series.
+
+    :param series: Series of scraped strings
+    :type series: pd.Series
+
+    :param transform_function: Vectorized function
+        that transforms a Series of strings
+    :type transform_function: Callable[[pd.Series], pd.Series]
+
+    :return: Transformed Series with the same index
+        as the original Series
+    :rtype: pd.Series
+    '''
+    categorical = series.astype('category')
+    transformed_categories = transform_function(
+        pd.Series(categorical.cat.categories, dtype='string')
+    )
+
+    # Code -1 marks missing values, which take the value of the appended missing category
+    codes = categorical.cat.codes.to_numpy()
+    transformed_values = pd.concat(
+        [transformed_categories, pd.Series([pd.NA], dtype=transformed_categories.dtype)],
+        ignore_index=True
+    ).take(codes)
+
+    return pd.Series(transformed_values.array, index=series.index, name=series.name)
@@ -0,0 +1,192 @@
+'''
+    Module to transform the daily weather forecast
+    from scraped strings into numeric columns using
+    vectorized pandas string operations.
+'''
+import json
+from itertools import zip_longest
+import pandas as pd
+
+# Numbers such as "29.9" in "29.9 °C" or "84" in "84 %"
+NUMBER_PATTERN = r'(-?\d+(?:\.\d+)?)'
+
+# Wind speeds such as "30 to 45 km/h" or "45 km/h"
+WIND_SPEED_KPH_PATTERN = r'(?:(\d+(?:\.\d+)?)\s*(?:to|-)\s*)?(\d+(?:\.\d+)?)\s*km/h'
+
+# Wind forces such as "Moderate to Strong" or "Gale"
+WIND_FORCE_PATTERN = r'^\s*([A-Za-z]+)(?:\s+to\s+([A-Za-z]+))?'
+
+# Wave heights such as "(2.8 to 5.0 meters)" or "(up to 2.0 meters)"
+WAVE_HEIGHT_PATTERN = r'\(\s*(?:up\s+to\s+)?(?:(\d+(?:\.\d+)?)\s*to\s*)?(\d+(?:\.\d+)?)\s*meters?\s*\)'
+
+# Approximate wind speeds in km/h of the wind forces used in the forecast, based on the Beaufort scale
+WIND_FORCE_SPEEDS_KPH = {
+    'light': (1, 19),
+    'moderate': (20, 28),
+    'fresh': (29, 38),
+    'strong': (39, 61),
+    'gale': (62, 88)
+}
+
+def load_temperature_and_relative_humidity(
+        list_of_all_filepaths: list[str]
+) -> pd.DataFrame:
+    '''
+    Loads the temperature and relative humidity JSON
+    files of many snapshots into one DataFrame with
+    one row per measure and extreme, keeping every
+    value as the scraped string.
+
+    :param list_of_all_filepaths: Relative filepaths
+        of the temperature_and_relative_humidity.json
+        files
+    :type list_of_all_filepaths: list[str]
+
+    :return: DataFrame with the source_filepath,
+        measure, extreme, value and observed_time
+        columns
+    :rtype: pd.DataFrame
+    '''
+    records = []
+
+    # Only the JSON loading walks the files, all parsing below is vectorized
+    for filepath in list_of_all_filepaths:
+        with open(filepath, 'r') as json_file:
+            temperature_and_relative_humidity = json.load(json_file)
+
+        for measure, extremes in temperature_and_relative_humidity.items():
+            for extreme, value_and_time in extremes.items():
+                records.append((filepath, measure, extreme, *(list(value_and_time) + [None, None])[:2]))
+
+    return pd.DataFrame(
+        records,
+        columns=['source_filepath', 'measure', 'extreme', 'value', 'observed_time']
+    )
+
+def transform_temperature_and_relative_humidity(
+        temperature_and_relative_humidity: pd.DataFrame
+) -> pd.DataFrame:
+    '''
+    Transforms the scraped strings of the temperature
+    and relative humidity into numeric values, such
+    as 29.9 for "29.9 °C" and 84 for "84 %", and
+    their observation times into HH:MM.
+
+    :param temperature_and_relative_humidity: DataFrame
+        returned by load_temperature_and_relative_humidity()
+    :type temperature_and_relative_humidity: pd.DataFrame
+
+    :return: DataFrame with the source_filepath,
+        measure, extreme, value and observed_time
+        columns
+    :rtype: pd.DataFrame
+    '''
+    values = temperature_and_relative_humidity['value'].astype('string')
+    observed_times = temperature_and_relative_humidity['observed_time'].astype('string')
+
+    return pd.DataFrame({
+        'source_filepath': temperature_and_relative_humidity['source_filepath'].astype('category'),
+        'measure': temperature_and_relative_humidity['measure'].astype('category'),
+        'extreme': temperature_and_relative_humidity['extreme'].astype('category'),
+        'value': pd.to_numeric(
+            values.str.extract(NUMBER_PATTERN, expand=False),
+            errors='coerce'
+        ).astype('Float64'),
+        'observed_time': pd.to_datetime(
+            observed_times.str.strip(),
+            format='%I:%M %p',
+            errors='coerce'
+        ).dt.strftime('%H:%M')
+    })
+
+def load_forecast_wind_and_coastal_water_conditions(
+        list_of_all_filepaths: list[str]
+) -> pd.DataFrame:
+    '''
+    Loads the forecast wind and coastal water
+    conditions JSON files of many snapshots into
+    one DataFrame with one row per place, keeping
+    every value as the scraped string.
+
+    :param list_of_all_filepaths: Relative filepaths
+        of the forecast_wind_and_coastal_water_conditions.json
+        files
+    :type list_of_all_filepaths: list[str]
+
+    :return: DataFrame with the source_filepath,
+        place, speed, direction and coastal_water
+        columns
+    :rtype: pd.DataFrame
+    '''
+    records = []
+
+    # Only the JSON loading walks the files, all parsing below is vectorized
+    for filepath in list_of_all_filepaths:
+        with open(filepath, 'r') as json_file:
+            conditions = json.load(json_file)
+
+        records.extend(
+            (filepath, *row)
+            for row in zip_longest(
+                conditions.get('place', []),
+                conditions.get('speed', []),
+                conditions.get('direction', []),
+                conditions.get('coastal_water', [])
+            )
+        )
+
+    return pd.DataFrame(
+        records,
+        columns=['source_filepath', 'place', 'speed', 'direction', 'coastal_water']
+    )
+
+def transform_forecast_wind_and_coastal_water_conditions(
+        conditions: pd.DataFrame
+) -> pd.DataFrame:
+    '''
+    Transforms the scraped strings of the forecast
+    wind and coastal water conditions into numeric
+    ranges. Wind speeds in km/h are used as they are,
+    and wind forces such as "Moderate to Strong" are
+    converted to their approximate Beaufort speeds.
+    Wave heights come from the meters in parentheses.
+
+    :param conditions: DataFrame returned by
+        load_forecast_wind_and_coastal_water_conditions()
+    :type conditions: pd.DataFrame
+
+    :return: DataFrame with the source_filepath, place,
+        direction, wind speed and wave height columns
+    :rtype: pd.DataFrame
+    '''
+    speeds = conditions['speed'].astype('string')
+    coastal_waters = conditions['coastal_water'].astype('string')
+
+    speeds_in_kph = speeds.str.extract(WIND_SPEED_KPH_PATTERN)
+    max_speed_kph = pd.to_numeric(speeds_in_kph[1], errors='coerce')
+    min_speed_kph = pd.to_numeric(speeds_in_kph[0], errors='coerce').fillna(max_speed_kph)
+
+    # Convert wind forces to speeds where the forecast doesn't give km/h
+    wind_forces = speeds.str.extract(WIND_FORCE_PATTERN)
+    lower_wind_forces = wind_forces[0].str.lower()
+    upper_wind_forces = wind_forces[1].str.lower().fillna(lower_wind_forces)
+
+    min_speeds_by_wind_force = {wind_force: speed_range[0] for wind_force, speed_range in WIND_FORCE_SPEEDS_KPH.items()}
+    max_speeds_by_wind_force = {wind_force: speed_range[1] for wind_force, speed_range in WIND_FORCE_SPEEDS_KPH.items()}
+
+    min_speed_kph = min_speed_kph.fillna(pd.to_numeric(lower_wind_forces.map(min_speeds_by_wind_force), errors='coerce'))
+    max_speed_kph = max_speed_kph.fillna(pd.to_numeric(upper_wind_forces.map(max_speeds_by_wind_force), errors='coerce'))
+
+    wave_heights = coastal_waters.str.extract(WAVE_HEIGHT_PATTERN)
+
+    return pd.DataFrame({
+        'source_filepath': conditions['source_filepath'].astype('category'),
+        'place': conditions['place'].astype('category'),
+        'direction': conditions['direction'].astype('category'),
+        'wind_speed': speeds.astype('category'),
+        'min_wind_speed_kph': min_speed_kph.astype('Float64'),
+        'max_wind_speed_kph': max_speed_kph.astype('Float64'),
+        'coastal_water': coastal_waters.str.split('/').str[0].str.strip().astype('category'),
+        'min_wave_height_meters': pd.to_numeric(wave_heights[0], errors='coerce').astype('Float64'),
+        'max_wave_height_meters': pd.to_numeric(wave_heights[1], errors='coerce').astype('Float64')
+    })
@@ -0,0 +1,200 @@
+'''
+    Module to transform the weather outlooks for
+    selected Philippine cities and tourist areas
+    from scraped strings into numeric columns using
+    vectorized pandas string operations.
+'''
+import json
+import pandas as pd
+from etl.transform.categorical import transform_unique_values
+
+# Format of the weather dates, such as "Saturday December 06, 2025"
+WEATHER_DATE_FORMAT = '%A %B %d, %Y'
+
+# Numbers such as "25" in "25°C" or "100" in "Chance of rain: 100%"
+NUMBER_PATTERN = r'(-?\d+(?:\.\d+)?)'
+
+def explode_with_positions(
+        series: pd.Series,
+        name: str
+) -> pd.DataFrame:
+    '''
+    Explodes a Series of lists into one row per
+    item, keeping the row of the list and the
+    position of the item in it, so lists of
+    different lengths can be aligned.
+
+    :param series: Series of lists
+    :type series: pd.Series
+
+    :param name: Name of the column for the items
+    :type name: str
+
+    :return: DataFrame with the row, position and
+        item columns
+    :rtype: pd.DataFrame
+    '''
+    exploded = series.explode().dropna()
+
+    return pd.DataFrame({
+        'row': exploded.index,
+        'position': exploded.groupby(level=0).cumcount().to_numpy(),
+        name: exploded.to_numpy()
+    })
+
+def load_weather_outlooks(
+        list_of_all_filepaths: list[str]
+) -> pd.DataFrame:
+    '''
+    Loads the weather outlook JSON files of many
+    snapshots into one DataFrame with one row per
+    area, date and snapshot, keeping every value
+    as the scraped string.
+
+    :param list_of_all_filepaths: Relative filepaths
+        of the weather outlook JSON files, such as
+        ph_cities_weather_outlook.json
+    :type list_of_all_filepaths: list[str]
+
+    :return: DataFrame with the source_filepath, area,
+        weather_date, temperature_range and
+        chance_of_rain columns
+    :rtype: pd.DataFrame
+    '''
+    records = []
+
+    # Only the JSON loading walks the files, all parsing below is vectorized
+    for filepath in list_of_all_filepaths:
+        with open(filepath, 'r') as json_file:
+            weather_outlook = json.load(json_file)
+
+        records.extend(
+            (
+                filepath,
+                area,
+                outlook.get('weather_dates', []),
+                outlook.get('temperature_ranges', []),
+                outlook.get('chance_of_rain_percentages', [])
+            )
+            for area, outlook in weather_outlook.items()
+        )
+
+    areas = pd.DataFrame(
+        records,
+        columns=['source_filepath', 'area', 'weather_dates', 'temperature_ranges', 'chance_of_rain_percentages']
+    )
+
+    weather_dates = explode_with_positions(areas['weather_dates'], 'weather_date')
+    temperature_ranges = explode_with_positions(areas['temperature_ranges'], 'temperature_range')
+    chances_of_rain = explode_with_positions(areas['chance_of_rain_percentages'], 'chance_of_rain')
+
+    # Align the items of each area by their position in the lists
+    frame = (
+        weather_dates
+        .merge(temperature_ranges, on=['row', 'position'], how='left')
+        .merge(chances_of_rain, on=['row', 'position'], how='left')
+    )
+    frame = frame.join(areas[['source_filepath', 'area']], on='row')
+
+    return frame[['source_filepath', 'area', 'weather_date', 'temperature_range', 'chance_of_rain']]
+
+def parse_weather_dates(
+        weather_dates: pd.Series
+) -> pd.Series:
+    '''
+    Parses weather dates such as "Saturday December
+    06, 2025" into datetimes.
+
+    :param weather_dates: Series of weather dates
+    :type weather_dates: pd.Series
+
+    :return: Series of datetimes, with NaT for dates
+        in an unknown format
+    :rtype: pd.Series
+    '''
+    return pd.to_datetime(
+        weather_dates.str.split().str.join(' '),
+        format=WEATHER_DATE_FORMAT,
+        errors='coerce'
+    )
+
+def parse_numbers(
+        values: pd.Series
+) -> pd.Series:
+    '''
+    Parses the first number of values such as
+    "25°C" into numbers.
+
+    :param values: Series of scraped values
+    :type values: pd.Series
+
+    :return: Series of numbers, with missing values
+        where there is no number
+    :rtype: pd.Series
+    '''
+    return pd.to_numeric(
+        values.str.extract(NUMBER_PATTERN, expand=False),
+        errors='coerce'
+    )
+
+def parse_percentages(
+        values: pd.Series
+) -> pd.Series:
+    '''
+    Parses percentages such as "Chance of rain: 100%"
+    into numbers.
+
+    :param values: Series of scraped values
+    :type values: pd.Series
+
+    :return: Series of percentages, with missing
+        values where the percentage is empty
+    :rtype: pd.Series
+    '''
+    return pd.to_numeric(
+        values.str.extract(r'(\d+)\s*%', expand=False),
+        errors='coerce'
+    )
+
+def transform_weather_outlooks(
+        weather_outlooks: pd.DataFrame
+) -> pd.DataFrame:
+    '''
+    Transforms the scraped strings of the weather
+    outlooks into typed columns: dates, minimum and
+    maximum temperatures in °C and the chance of
+    rain in percent.
+
+    :param weather_outlooks: DataFrame returned by
+        load_weather_outlooks()
+    :type weather_outlooks: pd.DataFrame
+
+    :return: DataFrame with the source_filepath, area,
+        weather_date, min_temperature_celsius,
+        max_temperature_celsius and
+        chance_of_rain_percent columns
+    :rtype: pd.DataFrame
+    '''
+    temperature_ranges = weather_outlooks['temperature_range']
+
+    # Each distinct string is parsed only once since they repeat across areas and snapshots
+    return pd.DataFrame({
+        'source_filepath': weather_outlooks['source_filepath'].astype('category'),
+        'area': weather_outlooks['area'].astype('category'),
+        'weather_date': transform_unique_values(
+            weather_outlooks['weather_date'],
+            parse_weather_dates
+        ),
+        'min_temperature_celsius': transform_unique_values(
+            temperature_ranges.str[0],
+            parse_numbers
+        ),
+        'max_temperature_celsius': transform_unique_values(
+            temperature_ranges.str[1],
+            parse_numbers
+        ),
+        'chance_of_rain_percent': transform_unique_values(
+            weather_outlooks['chance_of_rain'],
+            parse_percentages
+        ).astype('Int16')
+    })
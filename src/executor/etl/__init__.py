@@ -0,0 +1,14 @@
+import importlib
+
+# Modules are only imported when they are first used, so running one job doesn't import the others
+__all__ = [
+    'execute_download_stage',
+    'execute_extract_stage',
+    'execute_transform_stage'
+]
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,146 @@
+'''
+    Module for executing the download stage of the
+    ETL pipeline, which downloads the rainfall maps
+    that the tropical cyclone associated rainfall
+    files link to into the content addressed image
+    store in the data/images subdirectory.
+'''
+import os
+import json
+import fnmatch
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fetch.download import download_file
+from monitor.timing import timed_call
+from monitor.timing import timed_job
+from storage.images import get_partial_filepath
+from storage.images import load_image_index
+from storage.images import save_image_index
+from storage.images import is_image_stored
+from storage.images import store_image
+
+# Download stage settings (can be overridden using environment variables)
+DOWNLOAD_WORKERS = int(os.environ.get('PAGASA_DOWNLOAD_WORKERS', '8'))
+RAINFALL_SUBDIR = os.environ.get(
+    'PAGASA_RAINFALL_SUBDIR',
+    'data/raw/tropical_cyclone_associated_rainfall'
+)
+
+_image_index_lock = threading.Lock()
+
+def list_rainfall_image_urls(
+        rainfall_subdir: str = RAINFALL_SUBDIR
+) -> list[str]:
+    '''
+    Lists the URLs of every rainfall map that the
+    current and yearly tropical cyclone associated
+    rainfall files link to, each URL once.
+
+    :param rainfall_subdir: Subdirectory of the
+        tropical cyclone associated rainfall files
+    :type rainfall_subdir: str
+
+    :return: List of image URLs
+    :rtype: list[str]
+    '''
+    list_of_all_image_urls = []
+
+    # We need to check if the dataset was never ingested
+    if not os.path.isdir(rainfall_subdir):
+        return list_of_all_image_urls
+
+    for filename in sorted(os.listdir(rainfall_subdir)):
+        if filename == 'current_tropical_cyclone_associated_rainfall.json':
+            with open(os.path.join(rainfall_subdir, filename), 'r') as json_file:
+                image_urls = [json.load(json_file).get('tropical_cyclone_associated_rainfall')]
+
+        elif fnmatch.fnmatch(filename, 'tropical_cyclone_associated_rainfalls_of_*.json'):
+            with open(os.path.join(rainfall_subdir, filename), 'r') as json_file:
+                image_urls = next(iter(json.load(json_file).values()), [])
+
+        else:
+            continue
+
+        for image_url in image_urls:
+            # We need to check if there is no current rainfall map or the URL was listed already
+            if image_url and image_url not in list_of_all_image_urls:
+                list_of_all_image_urls.append(image_url)
+
+    return list_of_all_image_urls
+
+def download_image(
+        url: str,
+        image_index: dict[str, dict]
+) -> None:
+    '''
+    Downloads an image into the content addressed
+    image store and adds it to the image index,
+    which is saved right away so an interrupted
+    stage doesn't download it again.
+
+    :param url: URL of the image
+    :type url: str
+
+    :param image_index: Dictionary of image URLs
+        with the hash, size and path of their
+        stored image
+    :type image_index: dict[str, dict]
+    '''
+    partial_filepath = get_partial_filepath(url)
+    os.makedirs(os.path.dirname(partial_filepath), exist_ok=True)
+
+    download_file(url, partial_filepath)
+    entry = timed_call('save', store_image, url, partial_filepath)
+
+    with _image_index_lock:
+        image_index[url] = entry
+        save_image_index(image_index)
+
+@timed_job('download_stage')
+def execute_download_stage(
+) -> tuple[list[str], dict[str, str]]:
+    '''
+        Downloads the rainfall maps of the tropical
+        cyclone associated rainfall that aren't in
+        the image store yet, several at a time. Maps
+        that were downloaded before are skipped
+        without a request, and maps with the same
+        content are stored only once.
+
+        :return: List of the image URLs that were
+            downloaded and dictionary of the image URLs
+            that failed with their errors
+        :rtype: tuple[list[str], dict[str, str]]
+    '''
+    image_index = load_image_index()
+    list_of_all_image_urls = [
+        image_url
+        for image_url in list_rainfall_image_urls()
+        if not is_image_stored(image_url, image_index)
+    ]
+
+    list_of_all_downloaded_image_urls = []
+    errors_by_failed_image_url = {}
+
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        # Each thread runs in a copy of the context so its spans are tagged with the stage
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run,
+                download_image,
+                image_url,
+                image_index
+            ): image_url
+            for image_url in list_of_all_image_urls
+        }
+
+        for future in as_completed(futures):
+            # A failed image is downloaded again, or resumed, by the next run
+            if future.exception() is not None:
+                errors_by_failed_image_url[futures[future]] = repr(future.exception())
+                continue
+
+            list_of_all_downloaded_image_urls.append(futures[future])
+
+    return list_of_all_downloaded_image_urls, errors_by_failed_image_url
@@ -0,0 +1,36 @@
+'''
+    Module for executing the extract stage of the
+    ETL pipeline, which stages new or changed raw
+    files of every dataset from the data/raw
+    subdirectory to the data/stage subdirectory.
+'''
+from monitor.timing import timed_job
+from etl.extract.stage import stage_changed_raw_files
+from etl.extract import extract_daily_weather_forecast
+from etl.extract import extract_weather_outlook_for_ph_cities
+from etl.extract import extract_weather_outlook_for_ph_tourist_areas
+from etl.extract import extract_weather_advisory
+from etl.extract import extract_tropical_cyclone_associated_rainfall
+
+# Datasets with the filename patterns and stage functions of their raw files
+STAGE_FUNCTIONS_BY_DATASET = {
+    extract_daily_weather_forecast.DATASET: extract_daily_weather_forecast.STAGE_FUNCTIONS,
+    extract_weather_outlook_for_ph_cities.DATASET: extract_weather_outlook_for_ph_cities.STAGE_FUNCTIONS,
+    extract_weather_outlook_for_ph_tourist_areas.DATASET: extract_weather_outlook_for_ph_tourist_areas.STAGE_FUNCTIONS,
+    extract_weather_advisory.DATASET: extract_weather_advisory.STAGE_FUNCTIONS,
+    extract_tropical_cyclone_associated_rainfall.DATASET: extract_tropical_cyclone_associated_rainfall.STAGE_FUNCTIONS
+}
+
+@timed_job('extract_stage')
+def execute_extract_stage(
+) -> list[str]:
+    '''
+        Stages the new or changed raw files of every
+        dataset in a single batched pass by executing
+        the stage functions of the src/etl/extract
+        package.
+
+        :return: List of raw filepaths that were staged
+        :rtype: list[str]
+    '''
+    return stage_changed_raw_files(STAGE_FUNCTIONS_BY_DATASET)
@@ -0,0 +1,189 @@
+'''
+    Module for executing the transform stage of the
+    ETL pipeline, which converts the scraped strings
+    of the staged (and optionally archived) datasets
+    into numeric tables in the data/transform
+    subdirectory.
+'''
+import os
+import json
+import pandas as pd
+from monitor.timing import timed_call
+from monitor.timing import timed_job
+from storage.history import HISTORY_SUBDIR
+from storage.history import load_history_index
+from storage.history import parse_issued_datetime
+from etl.extract.stage import STAGE_SUBDIR
+from etl.transform.transform_weather_outlook import load_weather_outlooks
+from etl.transform.transform_weather_outlook import transform_weather_outlooks
+from etl.transform.transform_daily_weather_forecast import load_temperature_and_relative_humidity
+from etl.transform.transform_daily_weather_forecast import transform_temperature_and_relative_humidity
+from etl.transform.transform_daily_weather_forecast import load_forecast_wind_and_coastal_water_conditions
+from etl.transform.transform_daily_weather_forecast import transform_forecast_wind_and_coastal_water_conditions
+
+# Transform stage settings (can be overridden using environment variables)
+TRANSFORM_SUBDIR = os.environ.get('PAGASA_TRANSFORM_SUBDIR', 'data/transform')
+
+# Tables of the transform stage with their dataset, JSON file, load function and transform function
+TRANSFORM_TABLES = {
+    'ph_cities_weather_outlook': (
+        'weather_outlook_for_ph_cities',
+        'ph_cities_weather_outlook.json',
+        load_weather_outlooks,
+        transform_weather_outlooks
+    ),
+    'ph_tourist_areas_weather_outlook': (
+        'weather_outlook_for_ph_tourist_areas',
+        'ph_tourist_areas_weather_outlook.json',
+        load_weather_outlooks,
+        transform_weather_outlooks
+    ),
+    'temperature_and_relative_humidity': (
+        'daily_weather_forecast',
+        'temperature_and_relative_humidity.json',
+        load_temperature_and_relative_humidity,
+        transform_temperature_and_relative_humidity
+    ),
+    'forecast_wind_and_coastal_water_conditions': (
+        'daily_weather_forecast',
+        'forecast_wind_and_coastal_water_conditions.json',
+        load_forecast_wind_and_coastal_water_conditions,
+        transform_forecast_wind_and_coastal_water_conditions
+    )
+}
+
+def get_staged_issued_at(
+        dataset: str
+) -> str | None:
+    '''
+    Returns the issued datetime of the staged
+    snapshot of a dataset in the same format as the
+    history index.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :return: Issued datetime in ISO format, or None
+        if it wasn't staged or is in an unknown format
+    :rtype: str | None
+    '''
+    issued_datetime_filepath = os.path.join(STAGE_SUBDIR, dataset, 'issued_datetime.json')
+
+    # We need to check if the issued datetime of the dataset wasn't staged yet
+    if not os.path.exists(issued_datetime_filepath):
+        return None
+
+    with open(issued_datetime_filepath, 'r') as json_file:
+        issued_at = parse_issued_datetime(json.load(json_file).get('issued_datetime'))
+
+    return issued_at.isoformat() if issued_at is not None else None
+
+def list_source_filepaths(
+        dataset: str,
+        filename: str,
+        include_history: bool = False
+) -> list[str]:
+    '''
+    Lists the JSON files of a dataset to transform:
+    the staged file and, optionally, the file of
+    every snapshot in the history store, which are
+    looked up through the history index instead of
+    scanning directories. The staged file is left out
+    if its snapshot is already archived, so its rows
+    aren't transformed twice.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :param filename: Name of the JSON file
+    :type filename: str
+
+    :param include_history: Whether to also list
+        the archived snapshots of the dataset
+    :type include_history: bool
+
+    :return: List of relative filepaths that exist
+    :rtype: list[str]
+    '''
+    list_of_all_filepaths = []
+    list_of_all_archived_issued_ats = []
+
+    if include_history:
+        for snapshot in load_history_index(dataset):
+            list_of_all_filepaths.append(os.path.join(HISTORY_SUBDIR, dataset, snapshot['partition'], filename))
+            list_of_all_archived_issued_ats.append(snapshot['issued_at'])
+
+    # We need to check if the staged snapshot is one of the archived snapshots
+    staged_issued_at = get_staged_issued_at(dataset)
+
+    if staged_issued_at is None or staged_issued_at not in list_of_all_archived_issued_ats:
+        list_of_all_filepaths.append(os.path.join(STAGE_SUBDIR, dataset, filename))
+
+    return [filepath for filepath in list_of_all_filepaths if os.path.exists(filepath)]
+
+def save_table_to_csv(
+        table: pd.DataFrame,
+        table_name: str
+) -> str:
+    '''
+    Saves a transformed table as a CSV file in the
+    data/transform subdirectory, writing to a
+    temporary file first so readers never see a
+    half-written file.
+
+    :param table: Transformed table
+    :type table: pd.DataFrame
+
+    :param table_name: Name of the table
+    :type table_name: str
+
+    :return: Relative filepath of the CSV file
+    :rtype: str
+    '''
+    os.makedirs(TRANSFORM_SUBDIR, exist_ok=True)
+
+    filepath = os.path.join(TRANSFORM_SUBDIR, f'{table_name}.csv')
+    temporary_filepath = f'{filepath}.{os.getpid()}.tmp'
+
+    table.to_csv(temporary_filepath, index=False)
+    os.replace(temporary_filepath, filepath)
+
+    return filepath
+
+@timed_job('transform_stage')
+def execute_transform_stage(
+        include_history: bool = False
+) -> dict[str, int]:
+    '''
+        Transforms the staged datasets, and optionally
+        their whole history, into numeric tables by
+        executing the load and transform functions of
+        the src/etl/transform package.
+
+        :param include_history: Whether to also
+            transform the archived snapshots of the
+            history store
+        :type include_history: bool
+
+        :return: Dictionary of table names with their
+            number of rows
+        :rtype: dict[str, int]
+    '''
+    number_of_rows_by_table = {}
+
+    for table_name, (dataset, filename, load_function, transform_function) in TRANSFORM_TABLES.items():
+        list_of_all_filepaths = list_source_filepaths(dataset, filename, include_history)
+
+        # We need to check if the dataset wasn't staged or archived yet
+        if list_of_all_filepaths == []:
+            continue
+
+        raw_table = timed_call('extract', load_function, list_of_all_filepaths)
+        table = timed_call('transform', transform_function, raw_table)
+        timed_call('save', save_table_to_csv, table, table_name)
+
+        number_of_rows_by_table[table_name] = len(table)
+
+    return number_of_rows_by_table
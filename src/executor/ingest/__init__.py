@@ -1,6 +1,17 @@
-from . import execute_ingest_daily_weather_forecast
-from . import execute_ingest_weather_outlook_for_ph_cities
-from . import execute_ingest_weather_outlook_for_ph_tourist_areas
-from . import execute_ingest_weather_advisory
-from . import execute_ingest_tropical_cyclone_advisory
-from . import execute_ingest_tropical_cyclone_associated_rainfall_executor
\ No newline at end of file
+import importlib
+
+# Modules are only imported when they are first used, so running one job doesn't import the others
+__all__ = [
+    'execute_ingest_daily_weather_forecast',
+    'execute_ingest_weather_outlook_for_ph_cities',
+    'execute_ingest_weather_outlook_for_ph_tourist_areas',
+    'execute_ingest_weather_advisory',
+    'execute_ingest_tropical_cyclone_advisory',
+    'execute_ingest_tropical_cyclone_associated_rainfall_executor'
+]
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
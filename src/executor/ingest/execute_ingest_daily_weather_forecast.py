@@ -3,8 +3,17 @@
     for the dialy weather forecast from the
     PAGASA-DOST website.
 '''
+from fetch.fetch import commit_page
+from monitor.timing import timed_call
+from monitor.timing import timed_job
+from monitor.profiling import profiled
+from monitor.metrics import observe_records
+from storage.snapshot import snapshot_writer
+from storage.history import archive_snapshot
+from storage.sqlite import save_snapshot_to_sqlite
 from ingest.ingest_daily_weather_forecast import create_subdir
 from ingest.ingest_daily_weather_forecast import extract_beautiful_soup_object
+from ingest.ingest_daily_weather_forecast import extract_daily_weather_forecast_page
 from ingest.ingest_daily_weather_forecast import extract_issued_datetime
 from ingest.ingest_daily_weather_forecast import save_issued_datetime_to_json
 from ingest.ingest_daily_weather_forecast import extract_synopsis
@@ -18,6 +27,8 @@ from ingest.ingest_daily_weather_forecast import save_forecast_wind_and_coastal_
 from ingest.ingest_daily_weather_forecast import extract_temperature_and_relative_humidity
 from ingest.ingest_daily_weather_forecast import save_temperature_and_relative_humidity_to_json
 
+@profiled
+@timed_job('daily_weather_forecast')
 def ingest_daily_weather_forecast(
 ) -> None:
     '''
@@ -28,24 +39,49 @@ def ingest_daily_weather_forecast(
     '''
     # Run all functions to ingest daily weather forecast
     create_subdir()
-    soup = extract_beautiful_soup_object(
-        'https://www.pagasa.dost.gov.ph/weather#daily-weather-forecast'
-    )
+    url = 'https://www.pagasa.dost.gov.ph/weather#daily-weather-forecast'
+    soup = extract_beautiful_soup_object(url)
+
+    # Locate all sections of the page once and share them with every extractor
+    page = timed_call('extract', extract_daily_weather_forecast_page, soup)
+
+    # Stage all files of the dataset and publish them together as one snapshot
+    with snapshot_writer('data/raw/daily_weather_forecast') as snapshot_subdir:
+        issued_datetime = timed_call('extract', extract_issued_datetime, page)
+        timed_call('save', save_issued_datetime_to_json, issued_datetime, snapshot_subdir)
+
+        synopsis = timed_call('extract', extract_synopsis, page)
+        timed_call('save', save_synopsis_to_json, synopsis, snapshot_subdir)
 
-    issued_datetime = extract_issued_datetime(soup)
-    save_issued_datetime_to_json(issued_datetime)
+        tc_information = timed_call('extract', extract_tc_information, page)
+        timed_call('save', save_tc_information_to_json, tc_information, snapshot_subdir)
 
-    synopsis = extract_synopsis(soup)
-    save_synopsis_to_json(synopsis)
+        forecast_weather_conditions = timed_call('extract', extract_forecast_weather_conditions, page)
+        observe_records(len(forecast_weather_conditions.get('place', [])))
+        timed_call('save', save_forecast_weather_conditions_to_json, forecast_weather_conditions, snapshot_subdir)
 
-    tc_information = extract_tc_information(soup)
-    save_tc_information_to_json(tc_information)
+        forecast_wind_and_coastal_water_conditions = timed_call('extract', extract_forecast_wind_and_coastal_water_conditions, page)
+        timed_call('save', save_forecast_wind_and_coastal_water_conditions_to_json, forecast_wind_and_coastal_water_conditions, snapshot_subdir)
 
-    forecast_weather_conditions = extract_forecast_weather_conditions(soup)
-    save_forecast_weather_conditions_to_json(forecast_weather_conditions)
+        temperature_and_relative_humidity = timed_call('extract', extract_temperature_and_relative_humidity, page)
+        timed_call('save', save_temperature_and_relative_humidity_to_json, temperature_and_relative_humidity, snapshot_subdir)
+
+    # Keep a copy of the published snapshot in the history store
+    timed_call(
+        'save',
+        archive_snapshot,
+        'data/raw/daily_weather_forecast',
+        'daily_weather_forecast',
+        issued_datetime
+    )
+
+    # Also load the published snapshot into SQLite if the SQLite sink is turned on
+    timed_call(
+        'save',
+        save_snapshot_to_sqlite,
+        'daily_weather_forecast',
+        'data/raw/daily_weather_forecast'
+    )
 
-    forecast_wind_and_coastal_water_conditions = extract_forecast_wind_and_coastal_water_conditions(soup)
-    save_forecast_wind_and_coastal_water_conditions_to_json(forecast_wind_and_coastal_water_conditions)
-    
-    temperature_and_relative_humidity = extract_temperature_and_relative_humidity(soup)
-    save_temperature_and_relative_humidity_to_json(temperature_and_relative_humidity)
\ No newline at end of file
+    # Remember the page validators only after everything was saved
+    commit_page(url)
\ No newline at end of file
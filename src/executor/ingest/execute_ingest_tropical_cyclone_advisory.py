@@ -3,7 +3,11 @@
     the tropical cyclone advisory from the PAGASA-
     DOST webite.
 '''
+from monitor.timing import timed_job
+from monitor.profiling import profiled
 
+@profiled
+@timed_job('tropical_cyclone_advisory')
 def ingest_tropical_cyclone_advisory(
 ) -> None:
     '''
@@ -3,11 +3,32 @@
     tropical cyclone associated rainfall from the
     PAGASA-DOST website.
 '''
+import os
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urldefrag
+from bs4 import BeautifulSoup
+from fetch.fetch import FetchError
+from fetch.fetch import commit_page
+from monitor.timing import timed_call
+from monitor.timing import timed_job
+from monitor.profiling import profiled
+from storage.sqlite import save_snapshot_to_sqlite
 from ingest.ingest_tropical_cyclone_associated_rainfall import create_subdir
 from ingest.ingest_tropical_cyclone_associated_rainfall import extract_beautiful_soup_object
 from ingest.ingest_tropical_cyclone_associated_rainfall import extract_tropical_cyclone_associated_rainfall
 from ingest.ingest_tropical_cyclone_associated_rainfall import save_tropical_cyclone_associated_rainfall_to_json
+from ingest.ingest_tropical_cyclone_associated_rainfall import extract_whole_page_soup
+from ingest.ingest_tropical_cyclone_associated_rainfall import extract_year_listing_urls
+from ingest.ingest_tropical_cyclone_associated_rainfall import extract_tropical_cyclone_associated_rainfalls
+from ingest.ingest_tropical_cyclone_associated_rainfall import is_year_complete
+from ingest.ingest_tropical_cyclone_associated_rainfall import save_tropical_cyclone_associated_rainfalls_to_json
 
+# Number of year listings to crawl at the same time (can be overridden using environment variables)
+BACKFILL_WORKERS = int(os.environ.get('PAGASA_BACKFILL_WORKERS', '4'))
+
+@profiled
+@timed_job('tropical_cyclone_associated_rainfall')
 def ingest_tropical_cyclone_associated_rainfall(
 ) -> None:
     '''
@@ -20,13 +41,162 @@ def ingest_tropical_cyclone_associated_rainfall(
     '''
     # Run all functions to ingest weather advisory data
     create_subdir()
-    soup = extract_beautiful_soup_object(
-        'https://www.pagasa.dost.gov.ph/climate/tropical-cyclone-associated-rainfall'
-    )
+    url = 'https://www.pagasa.dost.gov.ph/climate/tropical-cyclone-associated-rainfall'
+    soup = extract_beautiful_soup_object(url)
 
-    tropical_cyclone_associated_rainfall = extract_tropical_cyclone_associated_rainfall(
+    tropical_cyclone_associated_rainfall = timed_call(
+        'extract',
+        extract_tropical_cyclone_associated_rainfall,
         soup
     )
-    save_tropical_cyclone_associated_rainfall_to_json(
+    timed_call(
+        'save',
+        save_tropical_cyclone_associated_rainfall_to_json,
         tropical_cyclone_associated_rainfall
-    )
\ No newline at end of file
+    )
+
+    # Also load the published snapshot into SQLite if the SQLite sink is turned on
+    timed_call(
+        'save',
+        save_snapshot_to_sqlite,
+        'tropical_cyclone_associated_rainfall',
+        'data/raw/tropical_cyclone_associated_rainfall'
+    )
+
+    # Remember the page validators only after everything was saved
+    commit_page(url)
+
+def crawl_year_listing_page(
+        page_url: str,
+        year_listing_urls: dict[int, str],
+        soup: BeautifulSoup | None = None
+) -> dict[int, int]:
+    '''
+        Crawls one page with the listings of one or
+        more years and saves the tropical cyclone
+        associated rainfalls of each year as soon as
+        they are extracted.
+
+        :param page_url: URL of the page
+        :type page_url: str
+
+        :param year_listing_urls: Dictionary of the
+            years on the page with the URLs of their
+            listings
+        :type year_listing_urls: dict[int, str]
+
+        :param soup: BeautifulSoup object of the page
+            if it was already fetched
+        :type soup: BeautifulSoup | None
+
+        :return: Dictionary of the saved years with
+            their number of images
+        :rtype: dict[int, int]
+    '''
+    number_of_images_by_year = {}
+
+    # We need to check if the page was already fetched, such as the page with the year tabs
+    if soup is None:
+        soup = extract_whole_page_soup(page_url)
+
+    for year, year_listing_url in year_listing_urls.items():
+        tropical_cyclone_associated_rainfalls = timed_call(
+            'extract',
+            extract_tropical_cyclone_associated_rainfalls,
+            soup,
+            year_listing_url
+        )
+
+        # We need to check if the listing is empty, so a missing page never overwrites a saved year
+        if tropical_cyclone_associated_rainfalls == []:
+            continue
+
+        timed_call(
+            'save',
+            save_tropical_cyclone_associated_rainfalls_to_json,
+            year,
+            tropical_cyclone_associated_rainfalls
+        )
+        number_of_images_by_year[year] = len(tropical_cyclone_associated_rainfalls)
+
+    return number_of_images_by_year
+
+@profiled
+@timed_job('tropical_cyclone_associated_rainfall_backfill')
+def backfill_tropical_cyclone_associated_rainfalls(
+        force: bool = False
+) -> tuple[dict[int, int], dict[str, str]]:
+    '''
+        Backfills the tropical cyclone associated
+        rainfalls of every year from the PAGASA-DOST
+        website by crawling the listings of the years
+        concurrently. Past years that are already
+        saved are skipped, and each year is saved as
+        soon as its listing is crawled. A page that
+        fails doesn't stop the others, and the saved
+        years are always loaded into SQLite.
+
+        :param force: Whether to crawl the years that
+            are already complete as well
+        :type force: bool
+
+        :return: Dictionary of the saved years with
+            their number of images and dictionary of
+            the listing pages that failed with their
+            errors
+        :rtype: tuple[dict[int, int], dict[str, str]]
+
+        :raises FetchError: If the page with the links
+            to the years couldn't be fetched
+    '''
+    create_subdir()
+    url = 'https://www.pagasa.dost.gov.ph/climate/tropical-cyclone-associated-rainfall'
+    soup = extract_whole_page_soup(url)
+
+    # We need to check if the page couldn't be fetched, so no listing URLs are guessed
+    if soup is None:
+        raise FetchError(f'failed to fetch {url} for the backfill')
+
+    year_listing_urls = timed_call('extract', extract_year_listing_urls, soup, url)
+
+    # Group the years by the page that lists them, so a page with year tabs is crawled once
+    year_listing_urls_by_page = {}
+
+    for year, year_listing_url in sorted(year_listing_urls.items()):
+        if force or not is_year_complete(year):
+            page_url = urldefrag(year_listing_url)[0]
+            year_listing_urls_by_page.setdefault(page_url, {})[year] = year_listing_url
+
+    number_of_images_by_year = {}
+    errors_by_failed_page_url = {}
+
+    with ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as executor:
+        # Each thread runs in a copy of the context so its spans are tagged with the dataset
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run,
+                crawl_year_listing_page,
+                page_url,
+                years_on_page,
+                soup if page_url == urldefrag(url)[0] else None
+            ): page_url
+            for page_url, years_on_page in year_listing_urls_by_page.items()
+        }
+
+        for future in as_completed(futures):
+            # A failed page is crawled again by the next run, since its years aren't complete
+            if future.exception() is not None:
+                errors_by_failed_page_url[futures[future]] = repr(future.exception())
+                continue
+
+            number_of_images_by_year.update(future.result())
+
+    # Also load the backfilled years into SQLite if the SQLite sink is turned on
+    timed_call(
+        'save',
+        save_snapshot_to_sqlite,
+        'tropical_cyclone_associated_rainfall',
+        'data/raw/tropical_cyclone_associated_rainfall'
+    )
+
+    return number_of_images_by_year, errors_by_failed_page_url
@@ -3,11 +3,18 @@
     the weather advisory from the PAGASA-DOST
     website.
 '''
+from fetch.fetch import commit_page
+from monitor.timing import timed_call
+from monitor.timing import timed_job
+from monitor.profiling import profiled
+from storage.sqlite import save_snapshot_to_sqlite
 from ingest.ingest_weather_advisory import create_subdir
 from ingest.ingest_weather_advisory import extract_beautiful_soup_object
 from ingest.ingest_weather_advisory import extract_weather_advisory
 from ingest.ingest_weather_advisory import save_weather_advisory_to_json
 
+@profiled
+@timed_job('weather_advisory')
 def ingest_weather_advisory(
 ) -> None:
     '''
@@ -19,9 +26,19 @@ def ingest_weather_advisory(
     '''
     # Run all functions to ingest weather advisory data
     create_subdir()
-    soup = extract_beautiful_soup_object(
-        'https://www.pagasa.dost.gov.ph/weather/weather-advisory'
+    url = 'https://www.pagasa.dost.gov.ph/weather/weather-advisory'
+    soup = extract_beautiful_soup_object(url)
+
+    weather_advisory = timed_call('extract', extract_weather_advisory, soup)
+    timed_call('save', save_weather_advisory_to_json, weather_advisory)
+
+    # Also load the published snapshot into SQLite if the SQLite sink is turned on
+    timed_call(
+        'save',
+        save_snapshot_to_sqlite,
+        'weather_advisory',
+        'data/raw/weather_advisory'
     )
 
-    weather_advisory = extract_weather_advisory(soup)
-    save_weather_advisory_to_json(weather_advisory)
\ No newline at end of file
+    # Remember the page validators only after everything was saved
+    commit_page(url)
\ No newline at end of file
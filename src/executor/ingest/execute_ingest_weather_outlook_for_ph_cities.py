@@ -3,6 +3,15 @@
     weather outlook of selected Philippine cities from
     the PAGASA-DOST website.
 '''
+from fetch.fetch import commit_page
+from monitor.timing import timed_call
+from monitor.timing import timed_job
+from monitor.profiling import profiled
+from monitor.metrics import observe_records
+from storage.snapshot import snapshot_writer
+from storage.history import archive_snapshot
+from storage.parquet import save_weather_outlook_to_parquet
+from storage.sqlite import save_snapshot_to_sqlite
 from ingest.ingest_weather_outlook_for_ph_cities import create_subdir
 from ingest.ingest_weather_outlook_for_ph_cities import extract_beautiful_soup_object
 from ingest.ingest_weather_outlook_for_ph_cities import extract_issued_datetime
@@ -10,15 +19,11 @@ from ingest.ingest_weather_outlook_for_ph_cities import save_issued_datetime_to_
 from ingest.ingest_weather_outlook_for_ph_cities import extract_valid_period
 from ingest.ingest_weather_outlook_for_ph_cities import save_valid_period_to_json
 from ingest.ingest_weather_outlook_for_ph_cities import extract_ph_city_tags
-from ingest.ingest_weather_outlook_for_ph_cities import extract_ph_city_names
-from ingest.ingest_weather_outlook_for_ph_cities import extract_weather_dates
-from ingest.ingest_weather_outlook_for_ph_cities import map_weather_dates_to_ph_cities
-from ingest.ingest_weather_outlook_for_ph_cities import extract_temperature_ranges
-from ingest.ingest_weather_outlook_for_ph_cities import map_temperature_ranges_to_ph_cities
-from ingest.ingest_weather_outlook_for_ph_cities import extract_chance_of_rain_percentages
-from ingest.ingest_weather_outlook_for_ph_cities import map_chance_of_rain_percentages_to_ph_cities
+from ingest.ingest_weather_outlook_for_ph_cities import extract_ph_cities_weather_outlook
 from ingest.ingest_weather_outlook_for_ph_cities import save_ph_cities_weather_outlook_to_json
 
+@profiled
+@timed_job('weather_outlook_for_ph_cities')
 def ingest_weather_outlook_for_ph_cities(
 ) -> None:
     '''
@@ -30,35 +35,51 @@ def ingest_weather_outlook_for_ph_cities(
     '''
     # Run all functions to ingest weather outlook data for selected Philippine cities
     create_subdir()
-    soup = extract_beautiful_soup_object(
-        'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-philippine-cities'
-    )
+    url = 'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-philippine-cities'
+    soup = extract_beautiful_soup_object(url)
+
+    # Stage all files of the dataset and publish them together as one snapshot
+    with snapshot_writer('data/raw/weather_outlook_for_ph_cities') as snapshot_subdir:
+        issued_datetime = timed_call('extract', extract_issued_datetime, soup)
+        timed_call('save', save_issued_datetime_to_json, issued_datetime, snapshot_subdir)
+
+        valid_period = timed_call('extract', extract_valid_period, soup)
+        timed_call('save', save_valid_period_to_json, valid_period, snapshot_subdir)
 
-    issued_datetime = extract_issued_datetime(soup)
-    save_issued_datetime_to_json(issued_datetime)
+        list_of_all_ph_city_tags = timed_call('extract', extract_ph_city_tags, soup)
 
-    valid_period = extract_valid_period(soup)
-    save_valid_period_to_json(valid_period)
+        # Walk each city panel exactly once to build the complete weather outlook
+        ph_cities_weather_outlook = timed_call('extract', extract_ph_cities_weather_outlook, list_of_all_ph_city_tags)
+        observe_records(len(ph_cities_weather_outlook))
 
-    list_of_all_ph_city_tags = extract_ph_city_tags(soup)
-    ph_city_names = extract_ph_city_names(list_of_all_ph_city_tags)
+        timed_call('save', save_ph_cities_weather_outlook_to_json, ph_cities_weather_outlook, snapshot_subdir)
 
-    weather_dates = extract_weather_dates(list_of_all_ph_city_tags)
-    ph_cities_with_weather_dates = map_weather_dates_to_ph_cities(
-        weather_dates,
-        ph_city_names
+    # Keep a copy of the published snapshot in the history store
+    timed_call(
+        'save',
+        archive_snapshot,
+        'data/raw/weather_outlook_for_ph_cities',
+        'weather_outlook_for_ph_cities',
+        issued_datetime,
+        valid_period
     )
 
-    temperature_ranges = extract_temperature_ranges(list_of_all_ph_city_tags)
-    ph_cities_weather_outlook = map_temperature_ranges_to_ph_cities(
-        temperature_ranges,
-        ph_cities_with_weather_dates
+    # Also save the weather outlook as typed Parquet if the Parquet sink is turned on
+    timed_call(
+        'save',
+        save_weather_outlook_to_parquet,
+        ph_cities_weather_outlook,
+        'weather_outlook_for_ph_cities',
+        'ph_cities_weather_outlook.parquet'
     )
 
-    chance_of_rain_percentages = extract_chance_of_rain_percentages(list_of_all_ph_city_tags)
-    ph_cities_weather_outlook = map_chance_of_rain_percentages_to_ph_cities(
-        chance_of_rain_percentages,
-        ph_cities_weather_outlook
+    # Also load the published snapshot into SQLite if the SQLite sink is turned on
+    timed_call(
+        'save',
+        save_snapshot_to_sqlite,
+        'weather_outlook_for_ph_cities',
+        'data/raw/weather_outlook_for_ph_cities'
     )
 
-    save_ph_cities_weather_outlook_to_json(ph_cities_weather_outlook)
\ No newline at end of file
+    # Remember the page validators only after everything was saved
+    commit_page(url)
\ No newline at end of file
@@ -3,6 +3,15 @@
     weather outlook of selected Philippine tourist
     areas from the PAGASA-DOST website.
 '''
+from fetch.fetch import commit_page
+from monitor.timing import timed_call
+from monitor.timing import timed_job
+from monitor.profiling import profiled
+from monitor.metrics import observe_records
+from storage.snapshot import snapshot_writer
+from storage.history import archive_snapshot
+from storage.parquet import save_weather_outlook_to_parquet
+from storage.sqlite import save_snapshot_to_sqlite
 from ingest.ingest_weather_outlook_for_ph_tourist_areas import create_subdir
 from ingest.ingest_weather_outlook_for_ph_tourist_areas import extract_beautiful_soup_object
 from ingest.ingest_weather_outlook_for_ph_tourist_areas import extract_issued_datetime
@@ -17,6 +26,8 @@ from ingest.ingest_weather_outlook_for_ph_tourist_areas import extract_temperatu
 from ingest.ingest_weather_outlook_for_ph_tourist_areas import map_temperature_ranges_to_ph_tourist_areas
 from ingest.ingest_weather_outlook_for_ph_tourist_areas import save_ph_tourist_areas_weather_outlook_to_json
 
+@profiled
+@timed_job('weather_outlook_for_ph_tourist_areas')
 def ingest_weather_outlook_for_ph_tourist_areas(
 ) -> None:
     '''
@@ -28,29 +39,65 @@ def ingest_weather_outlook_for_ph_tourist_areas(
     '''
     # Run all functions to ingest weather outlook data for selected Philippine tourist areas
     create_subdir()
-    soup = extract_beautiful_soup_object(
-        'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-tourist-areas'
-    )
+    url = 'https://www.pagasa.dost.gov.ph/weather/weather-outlook-selected-tourist-areas'
+    soup = extract_beautiful_soup_object(url)
+
+    # Stage all files of the dataset and publish them together as one snapshot
+    with snapshot_writer('data/raw/weather_outlook_for_ph_tourist_areas') as snapshot_subdir:
+        issued_datetime = timed_call('extract', extract_issued_datetime, soup)
+        timed_call('save', save_issued_datetime_to_json, issued_datetime, snapshot_subdir)
+
+        valid_period = timed_call('extract', extract_valid_period, soup)
+        timed_call('save', save_valid_period_to_json, valid_period, snapshot_subdir)
 
-    issued_datetime = extract_issued_datetime(soup)
-    save_issued_datetime_to_json(issued_datetime)
+        list_of_all_ph_tourist_area_tags = timed_call('extract', extract_ph_tourist_area_tags, soup)
+        ph_tourist_area_names = timed_call('extract', extract_ph_tourist_area_names, list_of_all_ph_tourist_area_tags)
 
-    valid_period = extract_valid_period(soup)
-    save_valid_period_to_json(valid_period)
+        weather_dates = timed_call('extract', extract_weather_dates, soup)
+        ph_tourist_areas_with_weather_dates = timed_call(
+            'map',
+            map_weather_dates_to_ph_tourist_areas,
+            weather_dates,
+            ph_tourist_area_names
+        )
 
-    list_of_all_ph_tourist_area_tags = extract_ph_tourist_area_tags(soup)
-    ph_tourist_area_names = extract_ph_tourist_area_names(list_of_all_ph_tourist_area_tags)
+        temperature_ranges = timed_call('extract', extract_temperature_ranges, list_of_all_ph_tourist_area_tags)
+        ph_tourist_areas_weather_outlook = timed_call(
+            'map',
+            map_temperature_ranges_to_ph_tourist_areas,
+            temperature_ranges,
+            ph_tourist_areas_with_weather_dates
+        )
+        observe_records(len(ph_tourist_areas_weather_outlook))
+
+        timed_call('save', save_ph_tourist_areas_weather_outlook_to_json, ph_tourist_areas_weather_outlook, snapshot_subdir)
+
+    # Keep a copy of the published snapshot in the history store
+    timed_call(
+        'save',
+        archive_snapshot,
+        'data/raw/weather_outlook_for_ph_tourist_areas',
+        'weather_outlook_for_ph_tourist_areas',
+        issued_datetime,
+        valid_period
+    )
 
-    weather_dates = extract_weather_dates(soup)
-    ph_tourist_areas_with_weather_dates = map_weather_dates_to_ph_tourist_areas(
-        weather_dates,
-        ph_tourist_area_names
+    # Also save the weather outlook as typed Parquet if the Parquet sink is turned on
+    timed_call(
+        'save',
+        save_weather_outlook_to_parquet,
+        ph_tourist_areas_weather_outlook,
+        'weather_outlook_for_ph_tourist_areas',
+        'ph_tourist_areas_weather_outlook.parquet'
     )
 
-    temperature_ranges = extract_temperature_ranges(list_of_all_ph_tourist_area_tags)
-    ph_tourist_areas_weather_outlook = map_temperature_ranges_to_ph_tourist_areas(
-        temperature_ranges,
-        ph_tourist_areas_with_weather_dates
+    # Also load the published snapshot into SQLite if the SQLite sink is turned on
+    timed_call(
+        'save',
+        save_snapshot_to_sqlite,
+        'weather_outlook_for_ph_tourist_areas',
+        'data/raw/weather_outlook_for_ph_tourist_areas'
     )
 
-    save_ph_tourist_areas_weather_outlook_to_json(ph_tourist_areas_weather_outlook)
\ No newline at end of file
+    # Remember the page validators only after everything was saved
+    commit_page(url)
\ No newline at end of file
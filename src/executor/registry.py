@@ -0,0 +1,94 @@
+'''
+    Module for looking up the ingest jobs for the
+    PAGASA-DOST website by dataset, importing the
+    executor module of a job only when it is run.
+'''
+import importlib
+from typing import Callable
+
+# Ingest jobs by dataset with their executor module, function and the message to log once each job succeeds
+INGEST_JOBS = {
+    'daily_weather_forecast': (
+        'executor.ingest.execute_ingest_daily_weather_forecast',
+        'ingest_daily_weather_forecast',
+        '(DEV): Ingest the data for the daily weather forecast.'
+    ),
+    'weather_outlook_for_ph_cities': (
+        'executor.ingest.execute_ingest_weather_outlook_for_ph_cities',
+        'ingest_weather_outlook_for_ph_cities',
+        '(DEV): Ingest the data for the weather outlook for selected Philippine cities.'
+    ),
+    'weather_outlook_for_ph_tourist_areas': (
+        'executor.ingest.execute_ingest_weather_outlook_for_ph_tourist_areas',
+        'ingest_weather_outlook_for_ph_tourist_areas',
+        '(DEV): Ingest the data for the weather outlook for selected Philippine tourist areas.'
+    ),
+    'weather_advisory': (
+        'executor.ingest.execute_ingest_weather_advisory',
+        'ingest_weather_advisory',
+        '(DEV): Ingest the data for the weather advisory'
+    ),
+    'tropical_cyclone_advisory': (
+        'executor.ingest.execute_ingest_tropical_cyclone_advisory',
+        'ingest_tropical_cyclone_advisory',
+        '(DEV): Ingests the data for the tropical cyclone advisory'
+    ),
+    'tropical_cyclone_associated_rainfall': (
+        'executor.ingest.execute_ingest_tropical_cyclone_associated_rainfall_executor',
+        'ingest_tropical_cyclone_associated_rainfall',
+        '(DEV): Ingest the data for the tropical cyclone associated rainfall'
+    )
+}
+
+# Short names of the datasets for the command line
+DATASET_ALIASES = {
+    'daily': 'daily_weather_forecast',
+    'cities': 'weather_outlook_for_ph_cities',
+    'tourist': 'weather_outlook_for_ph_tourist_areas',
+    'advisory': 'weather_advisory',
+    'tc-advisory': 'tropical_cyclone_advisory',
+    'rainfall': 'tropical_cyclone_associated_rainfall'
+}
+
+def resolve_dataset(
+        name: str
+) -> str:
+    '''
+    Resolves a dataset or its short name, such as
+    cities, to the name of the dataset.
+
+    :param name: Dataset or its short name
+    :type name: str
+
+    :return: Name of the dataset, such as
+        weather_outlook_for_ph_cities
+    :rtype: str
+
+    :raises ValueError: If there is no ingest job
+        for the dataset
+    '''
+    dataset = DATASET_ALIASES.get(name, name)
+
+    # We need to check if there is an ingest job for the dataset
+    if dataset not in INGEST_JOBS:
+        raise ValueError(f'Unknown dataset: {name}')
+
+    return dataset
+
+def load_ingest_job(
+        dataset: str
+) -> Callable:
+    '''
+    Imports the executor module of a dataset and
+    returns its ingest job.
+
+    :param dataset: Name of the dataset, such as
+        weather_advisory
+    :type dataset: str
+
+    :return: Ingest job of the dataset
+    :rtype: Callable
+    '''
+    module_name, function_name, _ = INGEST_JOBS[dataset]
+
+    return getattr(importlib.import_module(module_name), function_name)
@@ -0,0 +1 @@
+from . import fetch
\ No newline at end of file
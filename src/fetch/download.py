@@ -0,0 +1,262 @@
+'''
+    Module for downloading files, such as the rainfall
+    maps of the PAGASA-DOST website, in streamed
+    chunks through the shared HTTP session, resuming
+    partial downloads with HTTP Range requests.
+'''
+import os
+import json
+import requests
+from functools import partial
+from fetch.fetch import CONNECT_TIMEOUT
+from fetch.fetch import READ_TIMEOUT
+from fetch.fetch import FetchError
+from fetch.fetch import RetryRequest
+from fetch.fetch import get_session
+from fetch.fetch import send_with_retries
+from monitor.timing import timing_span
+
+# Size of the chunks that are written to disk (can be overridden using environment variables)
+CHUNK_SIZE = int(os.environ.get('PAGASA_DOWNLOAD_CHUNK_SIZE', str(64 * 1024)))
+
+def get_validators_filepath(
+        partial_filepath: str
+) -> str:
+    '''
+    Returns the path of the file next to a partial
+    file that holds the ETag/Last-Modified validators
+    of the response it was started from.
+
+    :param partial_filepath: Path of the partial file
+    :type partial_filepath: str
+
+    :return: Path of the validators file, such as
+        <partial file>.validators.json
+    :rtype: str
+    '''
+    return f'{partial_filepath}.validators.json'
+
+def save_partial_validators(
+        partial_filepath: str,
+        response: requests.Response
+) -> None:
+    '''
+    Saves the ETag/Last-Modified validators of the
+    response a partial file is started from, so a
+    resumed download can check the file is unchanged.
+
+    :param partial_filepath: Path of the partial file
+    :type partial_filepath: str
+
+    :param response: Response with the whole file
+    :type response: requests.Response
+    '''
+    validators = {
+        'etag': response.headers.get('ETag', ''),
+        'last_modified': response.headers.get('Last-Modified', '')
+    }
+
+    with open(get_validators_filepath(partial_filepath), 'w') as json_file:
+        json.dump(validators, json_file, indent=4)
+
+def get_if_range(
+        partial_filepath: str
+) -> str | None:
+    '''
+    Returns the If-Range header that resumes a
+    partial file only if the file on the server is
+    unchanged: the strong ETag of the response the
+    partial file was started from, otherwise its
+    Last-Modified date.
+
+    :param partial_filepath: Path of the partial file
+    :type partial_filepath: str
+
+    :return: Value of the If-Range header, or None if
+        the partial file has no usable validator
+    :rtype: str | None
+    '''
+    validators_filepath = get_validators_filepath(partial_filepath)
+
+    # We need to check if the validators of the partial file were saved
+    if not os.path.exists(validators_filepath):
+        return None
+
+    with open(validators_filepath, 'r') as json_file:
+        validators = json.load(json_file)
+
+    # Weak ETags aren't allowed in If-Range
+    if validators.get('etag') and not validators['etag'].startswith('W/'):
+        return validators['etag']
+
+    return validators.get('last_modified') or None
+
+def discard_partial_file(
+        partial_filepath: str
+) -> None:
+    '''
+    Removes a partial file and its validators, so the
+    download starts from scratch.
+
+    :param partial_filepath: Path of the partial file
+    :type partial_filepath: str
+    '''
+    for filepath in (partial_filepath, get_validators_filepath(partial_filepath)):
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+def write_response_chunks(
+        response: requests.Response,
+        partial_filepath: str,
+        offset: int,
+        span: dict
+) -> None:
+    '''
+    Writes the body of a response to the partial
+    file chunk by chunk, appending to it if the
+    response continues the partial download. A
+    response with the whole file, such as when the
+    file changed since the partial file was started,
+    replaces the partial file.
+
+    :param response: Streamed response of the request
+    :type response: requests.Response
+
+    :param partial_filepath: Path of the partial file
+    :type partial_filepath: str
+
+    :param offset: Size of the partial file that was
+        requested to be continued
+    :type offset: int
+
+    :param span: Span of the download to add the
+        number of received bytes to
+    :type span: dict
+
+    :raises RetryRequest: If the partial file was
+        discarded because the server can't continue it
+    '''
+    # We need to check if the server doesn't have the bytes after the partial file, such as when the file changed
+    if response.status_code == 416:
+        discard_partial_file(partial_filepath)
+        raise RetryRequest('status code 416')
+
+    file_mode = 'wb'
+
+    if response.status_code == 206:
+        # We need to check if the server continues exactly where the partial file ends
+        if not response.headers.get('Content-Range', '').startswith(f'bytes {offset}-'):
+            discard_partial_file(partial_filepath)
+            raise RetryRequest(f'unexpected content range {response.headers.get("Content-Range")!r}')
+
+        file_mode = 'ab'
+
+    else:
+        save_partial_validators(partial_filepath, response)
+
+    with open(partial_filepath, file_mode) as partial_file:
+        for chunk in response.iter_content(CHUNK_SIZE):
+            partial_file.write(chunk)
+            span['response_bytes'] += len(chunk)
+
+def request_file(
+        url: str,
+        partial_filepath: str,
+        attempt: int,
+        queue_wait_seconds: float
+) -> requests.Response:
+    '''
+    Sends one attempt of a download and writes the
+    body to the partial file, asking only for the
+    bytes after the partial file if a download was
+    interrupted. The bytes written before an error
+    are kept, so the next attempt continues after
+    them, and If-Range makes the server send the
+    whole file instead if it changed meanwhile.
+
+    :param url: URL of the file
+    :type url: str
+
+    :param partial_filepath: Path of the partial file
+    :type partial_filepath: str
+
+    :param attempt: Number of the attempt, starting
+        at 0
+    :type attempt: int
+
+    :param queue_wait_seconds: Seconds the attempt
+        waited for a slot of the host
+    :type queue_wait_seconds: float
+
+    :return: Response of the request, whose body was
+        already written
+    :rtype: requests.Response
+    '''
+    offset = os.path.getsize(partial_filepath) if os.path.exists(partial_filepath) else 0
+    headers = {}
+
+    if offset:
+        if_range = get_if_range(partial_filepath)
+
+        # We need to check if the partial file can be checked against the file on the server
+        if if_range is None:
+            discard_partial_file(partial_filepath)
+            offset = 0
+
+        else:
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = if_range
+
+    with timing_span(
+        'download',
+        url=url,
+        attempt=attempt,
+        offset=offset,
+        queue_wait_seconds=round(queue_wait_seconds, 6)
+    ) as span:
+        with get_session().get(
+            url,
+            headers=headers,
+            stream=True,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        ) as response:
+            span['status_code'] = response.status_code
+            span['response_bytes'] = 0
+
+            if response.status_code in (200, 206, 416):
+                write_response_chunks(response, partial_filepath, offset, span)
+
+    return response
+
+def download_file(
+        url: str,
+        partial_filepath: str
+) -> None:
+    '''
+    Downloads a file to a partial file using the
+    shared HTTP session, within the concurrency cap,
+    rate limit and retries of its host. The body is
+    streamed to disk in chunks so the file is never
+    held in memory, and an existing partial file is
+    resumed with a Range request, such as after a
+    dropped connection or an interrupted run.
+
+    :param url: URL of the file
+    :type url: str
+
+    :param partial_filepath: Path of the partial file,
+        which holds the whole file once this returns
+    :type partial_filepath: str
+
+    :raises FetchError: If the file couldn't be
+        downloaded after retrying, or the circuit of
+        its host is open
+    '''
+    response = send_with_retries(url, partial(request_file, url, partial_filepath))
+
+    # We need to check if the request is unsuccessful, such as a removed file
+    if response.status_code not in (200, 206):
+        raise FetchError(f'failed to download {url}: status code {response.status_code}')
+
+    # The partial file is whole, so its validators aren't needed anymore
+    os.remove(get_validators_filepath(partial_filepath))
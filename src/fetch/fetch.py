@@ -0,0 +1,575 @@
+'''
+    Module for fetching pages from the PAGASA-DOST
+    website through one shared, pooled HTTP session
+    so that connections are kept alive between
+    requests.
+'''
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+import requests
+from typing import Callable
+from functools import partial
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from fetch.limiter import host_slot
+from monitor.timing import timing_span
+
+# Connection pool and timeout settings (can be overridden using environment variables)
+POOL_CONNECTIONS = int(os.environ.get('PAGASA_POOL_CONNECTIONS', '4'))
+POOL_MAXSIZE = int(os.environ.get('PAGASA_POOL_MAXSIZE', '10'))
+CONNECT_TIMEOUT = float(os.environ.get('PAGASA_CONNECT_TIMEOUT', '10'))
+READ_TIMEOUT = float(os.environ.get('PAGASA_READ_TIMEOUT', '30'))
+
+# Retry settings, so a fetch takes at most about the deadline plus one timeout (can be overridden using environment variables)
+FETCH_RETRIES = int(os.environ.get('PAGASA_FETCH_RETRIES', '3'))
+BACKOFF_BASE = float(os.environ.get('PAGASA_BACKOFF_BASE', '0.5'))
+BACKOFF_MAX = float(os.environ.get('PAGASA_BACKOFF_MAX', '8'))
+FETCH_DEADLINE = float(os.environ.get('PAGASA_FETCH_DEADLINE', '60'))
+
+# Status codes of responses and errors that are worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+# Circuit breaker settings: fail fast for a host after this many failed attempts in a row
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('PAGASA_CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_COOLDOWN = float(os.environ.get('PAGASA_CIRCUIT_COOLDOWN', '60'))
+
+# Conditional GET settings for the on-disk cache of ETag/Last-Modified validators
+USE_VALIDATOR_CACHE = os.environ.get('PAGASA_USE_VALIDATOR_CACHE', '1') == '1'
+VALIDATOR_CACHE_FILEPATH = os.environ.get(
+    'PAGASA_VALIDATOR_CACHE_FILEPATH',
+    'data/cache/validators.json'
+)
+
+# Skip pages whose body hashes the same as the last ingested body
+USE_CONTENT_HASH = os.environ.get('PAGASA_USE_CONTENT_HASH', '1') == '1'
+
+_session = None
+_session_lock = threading.Lock()
+
+_validators = None
+_pending_validators = {}
+_validators_lock = threading.Lock()
+
+# State of the circuit of every host: failures in a row, when it opened and whether a probe is running
+_circuits = {}
+_circuits_lock = threading.Lock()
+
+class FetchError(Exception):
+    '''
+        Raised when a page of the PAGASA-DOST website
+        couldn't be fetched, even after retrying.
+    '''
+
+class CircuitOpenError(FetchError):
+    '''
+        Raised without sending a request when recent
+        fetches from the same host kept failing, so
+        an outage doesn't stall every ingest job.
+    '''
+
+class RetryRequest(Exception):
+    '''
+        Raised by a request function to send the
+        request again, such as after discarding a
+        partial download the server can't continue.
+    '''
+
+class PageNotModified(Exception):
+    '''
+        Raised when the PAGASA-DOST website answers
+        a conditional request with 304 Not Modified,
+        meaning the page hasn't changed since it was
+        last ingested.
+    '''
+
+class PageUnchanged(PageNotModified):
+    '''
+        Raised when the body of a page hashes the
+        same as the body that was last ingested,
+        for servers that don't support conditional
+        requests.
+    '''
+
+def configure_session(
+        pool_connections: int | None = None,
+        pool_maxsize: int | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None
+) -> None:
+    '''
+    Overrides the connection pool and timeout
+    settings of the shared HTTP session. The
+    current session is closed so the next fetch
+    creates one with the new settings.
+
+    :param pool_connections: Number of host
+        connection pools to cache
+    :type pool_connections: int | None
+
+    :param pool_maxsize: Maximum number of
+        connections to keep alive per host
+    :type pool_maxsize: int | None
+
+    :param connect_timeout: Seconds to wait
+        for a connection to be established
+    :type connect_timeout: float | None
+
+    :param read_timeout: Seconds to wait for
+        the server to send data
+    :type read_timeout: float | None
+    '''
+    global POOL_CONNECTIONS, POOL_MAXSIZE, CONNECT_TIMEOUT, READ_TIMEOUT
+
+    # Only override the settings that were passed
+    if pool_connections is not None:
+        POOL_CONNECTIONS = pool_connections
+
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = pool_maxsize
+
+    if connect_timeout is not None:
+        CONNECT_TIMEOUT = connect_timeout
+
+    if read_timeout is not None:
+        READ_TIMEOUT = read_timeout
+
+    close_session()
+
+def get_session(
+) -> requests.Session:
+    '''
+    Returns the shared HTTP session, creating
+    it on first use with a pooled, keep-alive
+    adapter for both HTTP and HTTPS.
+
+    :return: Shared HTTP session
+    :rtype: requests.Session
+    '''
+    global _session
+
+    # Use a lock so concurrent ingest jobs don't create more than one session
+    with _session_lock:
+        if _session is None:
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+
+    return _session
+
+def close_session(
+) -> None:
+    '''
+    Closes the shared HTTP session and releases
+    all of its pooled connections.
+    '''
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def check_circuit(
+        host: str
+) -> bool:
+    '''
+    Checks if requests may be sent to a host. Once
+    the cooldown of an open circuit has passed, a
+    single request is let through as a probe.
+
+    :param host: Host of the URL, such as
+        www.pagasa.dost.gov.ph
+    :type host: str
+
+    :return: True if the request is the probe of an
+        open circuit, which has to be released with
+        release_probe() once it is sent
+    :rtype: bool
+
+    :raises CircuitOpenError: If the circuit of the
+        host is open
+    '''
+    with _circuits_lock:
+        circuit = _circuits.get(host)
+
+        # We need to check if the host has failed enough times to open its circuit
+        if circuit is None or circuit['opened_at'] is None:
+            return False
+
+        remaining_cooldown = circuit['opened_at'] + CIRCUIT_COOLDOWN - time.monotonic()
+
+        if remaining_cooldown > 0 or circuit['probing']:
+            raise CircuitOpenError(
+                f'the circuit for {host} is open after {circuit["failures"]} failed attempts'
+            )
+
+        circuit['probing'] = True
+        return True
+
+def release_probe(
+        host: str
+) -> None:
+    '''
+    Lets the next request to a host be a probe
+    again, even if the probe ended in an error that
+    wasn't recorded, such as an interrupted run.
+
+    :param host: Host of the URL
+    :type host: str
+    '''
+    with _circuits_lock:
+        circuit = _circuits.get(host)
+
+        if circuit is not None:
+            circuit['probing'] = False
+
+def record_attempt(
+        host: str,
+        succeeded: bool
+) -> None:
+    '''
+    Records the outcome of a request to a host,
+    closing its circuit on success and opening it
+    after too many failures in a row.
+
+    :param host: Host of the URL
+    :type host: str
+
+    :param succeeded: Whether the host answered
+        with a response that isn't worth retrying
+    :type succeeded: bool
+    '''
+    with _circuits_lock:
+        circuit = _circuits.setdefault(host, {'failures': 0, 'opened_at': None, 'probing': False})
+        circuit['probing'] = False
+
+        if succeeded:
+            circuit['failures'] = 0
+            circuit['opened_at'] = None
+            return
+
+        circuit['failures'] += 1
+
+        if circuit['failures'] >= CIRCUIT_FAILURE_THRESHOLD:
+            circuit['opened_at'] = time.monotonic()
+
+def is_circuit_open(
+        host: str
+) -> bool:
+    '''
+    Checks if the circuit of a host is open.
+
+    :param host: Host of the URL
+    :type host: str
+
+    :return: True if the circuit is open
+    :rtype: bool
+    '''
+    with _circuits_lock:
+        circuit = _circuits.get(host)
+        return circuit is not None and circuit['opened_at'] is not None
+
+def get_backoff_delay(
+        attempt: int,
+        response: requests.Response | None
+) -> float:
+    '''
+    Returns how long to wait before retrying a
+    request, using exponential backoff with full
+    jitter so retries from concurrent jobs spread
+    out. A Retry-After header in seconds is
+    honoured up to the maximum backoff.
+
+    :param attempt: Number of the failed attempt,
+        starting at 0
+    :type attempt: int
+
+    :param response: Response of the failed attempt,
+        or None if there was no response
+    :type response: requests.Response | None
+
+    :return: Seconds to wait
+    :rtype: float
+    '''
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    # We need to check if the server told us how long to wait
+    retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+
+    if retry_after.isdigit():
+        delay = max(delay, min(float(retry_after), BACKOFF_MAX))
+
+    return delay
+
+def load_validators(
+) -> dict[str, dict]:
+    '''
+    Loads the cached ETag/Last-Modified validators
+    and content hash of every fetched URL from the
+    on-disk validator cache.
+
+    :return: Dictionary of URLs with their cached
+        validators
+    :rtype: dict[str, dict]
+    '''
+    global _validators
+
+    with _validators_lock:
+        if _validators is None:
+            _validators = {}
+
+            # We need to check if the validator cache exists before reading it
+            if os.path.exists(VALIDATOR_CACHE_FILEPATH):
+                with open(VALIDATOR_CACHE_FILEPATH, 'r') as json_file:
+                    _validators = json.load(json_file)
+
+    return _validators
+
+def commit_page(
+        url: str
+) -> None:
+    '''
+    Saves the validators and content hash of the
+    last successful fetch of a URL to the on-disk
+    validator cache. Executors call this only after
+    the page was fully extracted and saved, so a
+    failed run is never skipped by a later fetch.
+
+    :param url: URL of the PAGASA-DOST page
+    :type url: str
+    '''
+    validators = load_validators()
+
+    with _validators_lock:
+        pending_validators = _pending_validators.pop(url, None)
+
+        # We need to check if there is anything new to save for this URL
+        if pending_validators is None:
+            return
+
+        validators[url] = pending_validators
+
+        cache_subdir = os.path.dirname(VALIDATOR_CACHE_FILEPATH)
+        if cache_subdir and not os.path.exists(cache_subdir):
+            os.makedirs(cache_subdir, exist_ok=True)
+
+        # Write to a temporary file first so the cache is never left half-written
+        temporary_filepath = f'{VALIDATOR_CACHE_FILEPATH}.{os.getpid()}.tmp'
+        with open(temporary_filepath, 'w') as json_file:
+            json.dump(validators, json_file, indent=4)
+
+        os.replace(temporary_filepath, VALIDATOR_CACHE_FILEPATH)
+
+def send_with_retries(
+        url: str,
+        send_request: Callable[[int, float], requests.Response]
+) -> requests.Response:
+    '''
+    Sends a request within the concurrency cap and
+    rate limit of its host, retrying connection
+    errors, timeouts and retryable status codes with
+    backoff until the retries, the deadline or the
+    circuit of the host run out.
+
+    :param url: URL of the request
+    :type url: str
+
+    :param send_request: Function that sends one
+        attempt of the request, given the number of
+        the attempt and the seconds it waited for a
+        slot of the host
+    :type send_request: Callable[[int, float], requests.Response]
+
+    :return: Response of the last attempt, which has
+        a status code that isn't worth retrying
+    :rtype: requests.Response
+
+    :raises FetchError: If the request failed after
+        retrying, or the circuit of its host is open
+    '''
+    host = urlsplit(url).hostname or ''
+    deadline = time.monotonic() + FETCH_DEADLINE
+
+    is_probe = check_circuit(host)
+
+    for attempt in range(FETCH_RETRIES + 1):
+        response = None
+
+        try:
+            try:
+                # Wait for a free slot of the host, which is recorded apart from the request latency
+                with host_slot(host) as queue_wait_seconds:
+                    response = send_request(attempt, queue_wait_seconds)
+
+            finally:
+                # The probe is over however the attempt ended, so the host never stays stuck open
+                if is_probe:
+                    release_probe(host)
+                    is_probe = False
+
+        except RetryRequest as error:
+            # Record the attempt so a probe of an open circuit that has to be retried is finished
+            record_attempt(host, succeeded=False)
+            failure = str(error)
+
+        except RETRY_EXCEPTIONS as error:
+            record_attempt(host, succeeded=False)
+            failure = repr(error)
+
+        except requests.RequestException as error:
+            # Errors such as too many redirects won't go away by retrying
+            record_attempt(host, succeeded=False)
+            raise FetchError(f'failed to fetch {url}: {error!r}') from error
+
+        else:
+            # We need to check if the response is final, such as 200, 304 or 404
+            if response.status_code not in RETRY_STATUS_CODES:
+                record_attempt(host, succeeded=True)
+                return response
+
+            record_attempt(host, succeeded=False)
+            failure = f'status code {response.status_code}'
+
+        delay = get_backoff_delay(attempt, response)
+
+        # We need to check if another attempt fits the retries, the deadline and the circuit
+        if (
+            attempt == FETCH_RETRIES
+            or time.monotonic() + delay > deadline
+            or is_circuit_open(host)
+        ):
+            raise FetchError(f'failed to fetch {url} after {attempt + 1} attempts: {failure}')
+
+        time.sleep(delay)
+
+def request_page(
+        url: str,
+        headers: dict[str, str],
+        attempt: int,
+        queue_wait_seconds: float
+) -> requests.Response:
+    '''
+    Sends one attempt of a request for a page using
+    the shared HTTP session.
+
+    :param url: URL of the PAGASA-DOST page
+    :type url: str
+
+    :param headers: Headers of the request
+    :type headers: dict[str, str]
+
+    :param attempt: Number of the attempt, starting
+        at 0
+    :type attempt: int
+
+    :param queue_wait_seconds: Seconds the attempt
+        waited for a slot of the host
+    :type queue_wait_seconds: float
+
+    :return: Response of the request
+    :rtype: requests.Response
+    '''
+    # Record the fetch latency and the size of the response body of every attempt
+    with timing_span(
+        'fetch',
+        url=url,
+        attempt=attempt,
+        queue_wait_seconds=round(queue_wait_seconds, 6)
+    ) as span:
+        response = get_session().get(
+            url,
+            headers=headers,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+        span['status_code'] = response.status_code
+        span['response_bytes'] = len(response.content)
+
+    return response
+
+def fetch_page(
+        url: str,
+        conditional: bool = True
+) -> requests.Response:
+    '''
+    Fetches a page from the PAGASA-DOST website
+    using the shared HTTP session, within the
+    concurrency cap and rate limit of its host.
+    The cached ETag/Last-Modified validators of
+    the URL are sent along so unchanged pages
+    aren't downloaded again, and the body is
+    hashed so unchanged pages aren't parsed
+    again.
+
+    :param url: URL of the PAGASA-DOST page
+    :type url: str
+
+    :param conditional: Whether to skip the page if
+        it is unchanged since it was last ingested,
+        which crawlers that keep track of what they
+        fetched on their own turn off
+    :type conditional: bool
+
+    :return: Response of the request
+    :rtype: requests.Response
+
+    :raises PageNotModified: If the page hasn't
+        changed since it was last ingested
+    :raises PageUnchanged: If the body of the page
+        is identical to the last ingested body
+    :raises FetchError: If the page couldn't be
+        fetched after retrying, or the circuit of
+        its host is open
+    '''
+    headers = {}
+
+    # Send the cached validators of the URL as conditional request headers
+    if USE_VALIDATOR_CACHE and conditional:
+        cached_validators = load_validators().get(url, {})
+
+        if cached_validators.get('etag'):
+            headers['If-None-Match'] = cached_validators['etag']
+
+        if cached_validators.get('last_modified'):
+            headers['If-Modified-Since'] = cached_validators['last_modified']
+
+    response = send_with_retries(url, partial(request_page, url, headers))
+
+    # We need to check if the page is unchanged since the last ingestion
+    if response.status_code == 304:
+        raise PageNotModified('the page returned 304 Not Modified')
+
+    # We need to check if the request is unsuccessful before caching anything
+    if response.status_code != 200 or not conditional:
+        return response
+
+    new_validators = {}
+
+    if USE_VALIDATOR_CACHE:
+        new_validators['etag'] = response.headers.get('ETag', '')
+        new_validators['last_modified'] = response.headers.get('Last-Modified', '')
+
+    # Compare the hash of the body with the hash of the last ingested body
+    if USE_CONTENT_HASH:
+        content_hash = hashlib.sha256(response.content).hexdigest()
+
+        if load_validators().get(url, {}).get('content_hash') == content_hash:
+            raise PageUnchanged('the page has the same content hash as the last ingestion')
+
+        new_validators['content_hash'] = content_hash
+
+    # Keep the new validators until the executor commits the page
+    if any(new_validators.values()):
+        with _validators_lock:
+            _pending_validators[url] = new_validators
+
+    return response
\ No newline at end of file
@@ -0,0 +1,149 @@
+'''
+    Module for limiting how many requests are sent
+    to each host of the PAGASA-DOST website at the
+    same time and how fast, so concurrent ingest
+    jobs and backfills stay polite.
+'''
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+# Default limits of every host (can be overridden using environment variables)
+HOST_CONCURRENCY = int(os.environ.get('PAGASA_HOST_CONCURRENCY', '4'))
+HOST_RATE = float(os.environ.get('PAGASA_HOST_RATE', '2'))
+HOST_BURST = float(os.environ.get('PAGASA_HOST_BURST', '4'))
+
+# Limits of single hosts as host=concurrency:rate:burst, separated by commas
+HOST_LIMITS = os.environ.get(
+    'PAGASA_HOST_LIMITS',
+    'www.pagasa.dost.gov.ph=4:2:4,pubfiles.pagasa.dost.gov.ph=6:4:8'
+)
+
+# Concurrency cap and token bucket of every host that was fetched from
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+def parse_host_limits(
+        host_limits: str
+) -> dict[str, tuple[int, float, float]]:
+    '''
+    Parses the limits of single hosts, such as
+    pubfiles.pagasa.dost.gov.ph=6:4:8.
+
+    :param host_limits: Limits as host=concurrency:rate:burst,
+        separated by commas
+    :type host_limits: str
+
+    :return: Dictionary of hosts with their maximum
+        number of requests at the same time, requests
+        per second and burst size
+    :rtype: dict[str, tuple[int, float, float]]
+    '''
+    limits_by_host = {}
+
+    for host_limit in host_limits.split(','):
+        # We need to check if the entry is empty, such as after a trailing comma
+        if '=' not in host_limit:
+            continue
+
+        host, limits = host_limit.split('=', 1)
+        concurrency, rate, burst = limits.split(':')
+        limits_by_host[host.strip()] = (int(concurrency), float(rate), float(burst))
+
+    return limits_by_host
+
+LIMITS_BY_HOST = parse_host_limits(HOST_LIMITS)
+
+def get_host_state(
+        host: str
+) -> dict:
+    '''
+    Returns the concurrency cap and token bucket of
+    a host, creating them with the limits of the host
+    on first use.
+
+    :param host: Host of the URL, such as
+        www.pagasa.dost.gov.ph
+    :type host: str
+
+    :return: Dictionary with the semaphore, rate,
+        burst, tokens and last refill time of the host
+    :rtype: dict
+    '''
+    with _hosts_lock:
+        if host not in _hosts:
+            concurrency, rate, burst = LIMITS_BY_HOST.get(host, (HOST_CONCURRENCY, HOST_RATE, HOST_BURST))
+
+            _hosts[host] = {
+                'semaphore': threading.BoundedSemaphore(max(concurrency, 1)),
+                'rate': rate,
+                'burst': max(burst, 1),
+                'tokens': max(burst, 1),
+                'refilled_at': time.monotonic(),
+                'lock': threading.Lock()
+            }
+
+        return _hosts[host]
+
+def take_token(
+        host_state: dict
+) -> None:
+    '''
+    Takes a token from the bucket of a host, waiting
+    until one is refilled if the bucket is empty.
+
+    :param host_state: State of the host returned by
+        get_host_state()
+    :type host_state: dict
+    '''
+    # We need to check if the rate of the host is unlimited
+    if host_state['rate'] <= 0:
+        return
+
+    while True:
+        with host_state['lock']:
+            now = time.monotonic()
+            host_state['tokens'] = min(
+                host_state['burst'],
+                host_state['tokens'] + (now - host_state['refilled_at']) * host_state['rate']
+            )
+            host_state['refilled_at'] = now
+
+            if host_state['tokens'] >= 1:
+                host_state['tokens'] -= 1
+                return
+
+            wait_seconds = (1 - host_state['tokens']) / host_state['rate']
+
+        # Sleep outside of the lock so other requests can check the bucket meanwhile
+        time.sleep(wait_seconds)
+
+@contextmanager
+def host_slot(
+        host: str
+) -> Iterator[float]:
+    '''
+    Waits for a free slot of a host, under both its
+    concurrency cap and its token bucket, and holds
+    the slot while the with block sends the request.
+
+    :param host: Host of the URL, such as
+        pubfiles.pagasa.dost.gov.ph
+    :type host: str
+
+    :return: Seconds the request waited in the queue
+    :rtype: Iterator[float]
+    '''
+    host_state = get_host_state(host)
+    start = time.perf_counter()
+
+    host_state['semaphore'].acquire()
+
+    try:
+        take_token(host_state)
+        yield time.perf_counter() - start
+
+    finally:
+        host_state['semaphore'].release()
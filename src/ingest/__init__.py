@@ -1,6 +1,17 @@
-from . import ingest_daily_weather_forecast
-from . import ingest_weather_outlook_for_ph_cities
-from . import ingest_weather_outlook_for_ph_tourist_areas
-from . import ingest_weather_advisory
-from . import ingest_tropical_cyclone_advisory
-from . import ingest_tropical_cyclone_associated_rainfall
\ No newline at end of file
+import importlib
+
+# Modules are only imported when they are first used, so running one job doesn't import the others
+__all__ = [
+    'ingest_daily_weather_forecast',
+    'ingest_weather_outlook_for_ph_cities',
+    'ingest_weather_outlook_for_ph_tourist_areas',
+    'ingest_weather_advisory',
+    'ingest_tropical_cyclone_advisory',
+    'ingest_tropical_cyclone_associated_rainfall'
+]
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
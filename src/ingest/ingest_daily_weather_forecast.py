@@ -3,9 +3,30 @@
     from the PAGASA-DOST website.
 '''
 import os
-import requests
 import json
+from dataclasses import dataclass
 from bs4 import BeautifulSoup
+from fetch.fetch import fetch_page
+from parse.parse import make_beautiful_soup_object
+
+# Regions of the page that the extractors read, so only these are parsed
+PAGE_REGIONS = [('div', 'row weather-page')]
+
+@dataclass
+class DailyWeatherForecastPage:
+    '''
+        Sections of the daily weather forecast page
+        located once so every extractor can use the
+        pre-resolved HTML tags instead of searching
+        the whole page again. A section is None if it
+        is missing from the page.
+    '''
+    issued_datetime_tag: BeautifulSoup | None = None
+    synopsis_tag: BeautifulSoup | None = None
+    tc_information_tag: BeautifulSoup | None = None
+    forecast_weather_conditions_tag: BeautifulSoup | None = None
+    forecast_wind_and_coastal_water_conditions_tag: BeautifulSoup | None = None
+    temperature_and_relative_humidity_tag: BeautifulSoup | None = None
 
 def create_subdir(
 ) -> None:
@@ -35,46 +56,102 @@ def extract_beautiful_soup_object(
         and manipulating the page content, or
         None if extraction fails
     :rtype: BeautifulSoup | None
+
+    :raises PageNotModified: If the page hasn't
+        changed since it was last ingested
     '''
-    response = requests.get(url)
+    # Use the shared pooled session so connections are reused across pages
+    response = fetch_page(url)
 
     # We need to check if the status code of the response for the request is unsuccessful
     if response.status_code != 200: 
         return None
 
-    # Parse as a BeautifulSoup object
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Parse only the regions read by the extractors using the configured HTML parser backend
+    soup = make_beautiful_soup_object(response.text, PAGE_REGIONS)
     return soup
 
+def extract_daily_weather_forecast_page(
+        soup: BeautifulSoup | DailyWeatherForecastPage | None
+) -> DailyWeatherForecastPage | None:
+    '''
+    Locates all sections of the daily weather
+    forecast page in a single pass over the
+    BeautifulSoup object.
+
+    :param soup: BeautifulSoup object for navigating
+        and manipulating the page content, an already
+        located page, or None if extraction fails
+    :type soup: BeautifulSoup | DailyWeatherForecastPage | None
+
+    :return: Located sections of the daily weather
+        forecast page, or None if extraction fails
+    :rtype: DailyWeatherForecastPage | None
+    '''
+    # We need to check if the sections were already located or the BeautifulSoup object is missing
+    if soup is None or isinstance(soup, DailyWeatherForecastPage):
+        return soup
+
+    page = DailyWeatherForecastPage()
+
+    div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
+
+    # We need to check if the div_tag_with_row_weather_page_class is missing
+    if div_tag_with_row_weather_page_class is None:
+        return page
+
+    page.issued_datetime_tag = div_tag_with_row_weather_page_class.find(
+        'div',
+        attrs={
+            'class': 'col-md-12 col-lg-12 issue'
+        }
+    )
+    list_of_all_daily_weather_forecast_tags = div_tag_with_row_weather_page_class.find_all(
+        'div',
+        attrs={
+            'class': 'col-md-12 col-lg-12'
+        }
+    )
+
+    # Verify TC info section exists: exactly 5 divs with class 'col-md-12 col-lg-12'
+    if len(list_of_all_daily_weather_forecast_tags) == 5:
+        page.tc_information_tag = list_of_all_daily_weather_forecast_tags[1]
+        list_of_all_daily_weather_forecast_tags.pop(1)
+
+    # The remaining sections are always in the same order after the TC info section is removed
+    list_of_all_daily_weather_forecast_tags += [None] * (4 - len(list_of_all_daily_weather_forecast_tags))
+    page.synopsis_tag = list_of_all_daily_weather_forecast_tags[0]
+    page.forecast_weather_conditions_tag = list_of_all_daily_weather_forecast_tags[1]
+    page.forecast_wind_and_coastal_water_conditions_tag = list_of_all_daily_weather_forecast_tags[2]
+    page.temperature_and_relative_humidity_tag = list_of_all_daily_weather_forecast_tags[3]
+
+    return page
+
 def extract_issued_datetime(
-    soup: BeautifulSoup | None
+    soup: BeautifulSoup | DailyWeatherForecastPage | None
 ) -> str:
     '''
     Extracts the issued datetime of the daily
     weather forecast from the PAGASA-DOST website.
 
     :param soup: BeautifulSoup object for navigating
-        and manipulating the page content, or
-        None if extraction fails
-    :type soup: BeautifulSoup | None
+        and manipulating the page content, the located
+        page sections, or None if extraction fails
+    :type soup: BeautifulSoup | DailyWeatherForecastPage | None
 
     :return: Issued datetime of the daily weather forecast
     :rtype: str
     '''
     issued_datetime = ''
 
-    # We need to check if the BeautifulSoup object is missing
-    if soup is None:
+    page = extract_daily_weather_forecast_page(soup)
+
+    # We need to check if the BeautifulSoup object or the issued datetime section is missing
+    if page is None or page.issued_datetime_tag is None:
         return issued_datetime
 
     # Extract HTML tags for issued datetime of the daily weather forecast
-    div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
-    issued_datetime_tag = div_tag_with_row_weather_page_class.find(
-        'div',
-        attrs={
-            'class': 'col-md-12 col-lg-12 issue'
-        }
-    )
+    issued_datetime_tag = page.issued_datetime_tag
     bold_tag = issued_datetime_tag.find('b')
 
     # We need to check if the bold_tag is not missing
@@ -84,7 +161,8 @@ def extract_issued_datetime(
     return issued_datetime
 
 def save_issued_datetime_to_json(
-        issued_datetime: str
+        issued_datetime: str,
+        subdir: str = 'data/raw/daily_weather_forecast'
 ) -> None:
     '''
     Saves the issued datetime of the daily
@@ -95,6 +173,10 @@ def save_issued_datetime_to_json(
     :param issued_datetime: Issued datetime
         of the daily weather forecast
     :type issued_datetime: str
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store issued datetime of the daily weather forecast
     data = {
@@ -103,7 +185,7 @@ def save_issued_datetime_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/daily_weather_forecast/issued_datetime.json',
+        f'{subdir}/issued_datetime.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -111,7 +193,7 @@ def save_issued_datetime_to_json(
     json_file.close()
 
 def extract_synopsis(
-        soup: BeautifulSoup | None
+        soup: BeautifulSoup | DailyWeatherForecastPage | None
 ) -> str:
     '''
     Extracts the synopsis of the daily weather
@@ -119,21 +201,23 @@ def extract_synopsis(
 
     :param soup: BeautifulSoup object for
         navigating and manipulating the page
-        content, or None if extraction fails
-    :type soup: BeautifulSoup | None
+        content, the located page sections, or
+        None if extraction fails
+    :type soup: BeautifulSoup | DailyWeatherForecastPage | None
 
     :return: Synopsis of the daily weather forecast
     :rtype: str
     '''
     synopsis = ''
 
-    # We need to check if the BeautifulSoup object is missing
-    if soup is None:
+    page = extract_daily_weather_forecast_page(soup)
+
+    # We need to check if the BeautifulSoup object or the synopsis section is missing
+    if page is None or page.synopsis_tag is None:
         return synopsis
 
     # Extract HTML tags for synopsis of the daily weather forecast
-    div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
-    synopsis_tag = div_tag_with_row_weather_page_class.find('div', attrs={'class': 'col-md-12 col-lg-12'})
+    synopsis_tag = page.synopsis_tag
     div_tag_with_panel_body_class = synopsis_tag.find('div', attrs={'class': 'panel-body'})
 
     # We need to check if the div_tag_with_panel_body_class is not missing
@@ -143,7 +227,8 @@ def extract_synopsis(
     return synopsis
 
 def save_synopsis_to_json(
-        synopsis: str
+        synopsis: str,
+        subdir: str = 'data/raw/daily_weather_forecast'
 ) -> None:
     '''
     Saves the synopsis of the daily weather forecast to a
@@ -152,6 +237,10 @@ def save_synopsis_to_json(
 
     :param synopsis: Synopsis of the daily weather forecast
     :type synopsis: str
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store synopsis of the daily weather forecast
     data = {
@@ -160,7 +249,7 @@ def save_synopsis_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/daily_weather_forecast/synopsis.json',
+        f'{subdir}/synopsis.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -168,16 +257,16 @@ def save_synopsis_to_json(
     json_file.close()
 
 def extract_tc_information(
-        soup: BeautifulSoup | None
+        soup: BeautifulSoup | DailyWeatherForecastPage | None
 ) -> dict[str, str]:
     '''
     Extracts tropical cyclone information from the daily
     weather forecast on the PAGASA-DOST website.
 
     :param soup: BeautifulSoup object for navigating
-        and manipulating the page content, or
-        None if extraction fails
-    :type soup: BeautifulSoup | None
+        and manipulating the page content, the located
+        page sections, or None if extraction fails
+    :type soup: BeautifulSoup | DailyWeatherForecastPage | None
 
     :return: Dictionary containing tropical cyclone
         information
@@ -192,27 +281,19 @@ def extract_tc_information(
         'movement': ''
     }
 
-    # We need to check if the BeautifulSoup object is missing    
-    if soup is None:
+    page = extract_daily_weather_forecast_page(soup)
+
+    # We need to check if the BeautifulSoup object or the tropical cyclone information section is missing
+    if page is None or page.tc_information_tag is None:
         return tc_information
 
-    # Extract HTML tags for tropical cyclone information from the daily weather forecast
-    div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
-    list_of_all_daily_weather_forecast_tags = div_tag_with_row_weather_page_class.find_all(
-        'div',
-        attrs={
-            'class': 'col-md-12 col-lg-12'
-        }
-    )
+    tc_information_tag = page.tc_information_tag
+    tbody_tag = tc_information_tag.find('tbody')
 
-    # Verify TC info section exists: exactly 5 divs with class 'col-md-12 col-lg-12'
-    if len(list_of_all_daily_weather_forecast_tags) == 5:
-        tc_information_tag = list_of_all_daily_weather_forecast_tags[1]
-    
-    else:
+    # We need to check if the tbody_tag is missing
+    if tbody_tag is None:
         return tc_information
 
-    tbody_tag = tc_information_tag.find('tbody')
     list_of_all_table_data_row_tags = tbody_tag.find_all('tr')
 
     # Loop through rows containing data of tropical cyclone information
@@ -233,6 +314,11 @@ def extract_tc_information(
 
         # Use the current row index to access the correct key in the tc_information dictionary
         tc_information_keys = list(tc_information.keys())
+
+        # We need to check if the table has more rows than there are keys
+        if row_number >= len(tc_information_keys):
+            break
+
         key = tc_information_keys[row_number]
         value = cell
         tc_information[key] = value
@@ -240,7 +326,8 @@ def extract_tc_information(
     return tc_information
 
 def save_tc_information_to_json(
-        tc_information: dict[str, str]
+        tc_information: dict[str, str],
+        subdir: str = 'data/raw/daily_weather_forecast'
 ) -> None:
     '''
     Saves the tropical cyclone information of the daily weather forecast to
@@ -249,6 +336,10 @@ def save_tc_information_to_json(
 
     :param tc_information: Dictionary containing tropical cyclone information
     :type tc_information: dict[str, str]
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store tropical cyclone information from the daily weather forecast
     data = {
@@ -262,7 +353,7 @@ def save_tc_information_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/daily_weather_forecast/tropical_cyclone_information.json',
+        f'{subdir}/tropical_cyclone_information.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -270,16 +361,16 @@ def save_tc_information_to_json(
     json_file.close()
 
 def extract_forecast_weather_conditions(
-        soup: BeautifulSoup | None
+        soup: BeautifulSoup | DailyWeatherForecastPage | None
 ) -> dict[str, list]:
     ''' 
     Extracts forecast weather conditions from the daily weather
     forecast on the PAGASA-DOST website.
 
     :param soup: BeautifulSoup object for navigating and 
-        manipulating the page content, or None if extraction
-        fails
-    :type soup: BeautifulSoup | None
+        manipulating the page content, the located page
+        sections, or None if extraction fails
+    :type soup: BeautifulSoup | DailyWeatherForecastPage | None
 
     :return: Dictionary containing forecast weather conditions
     :rtype: dict[str, list]
@@ -291,26 +382,13 @@ def extract_forecast_weather_conditions(
         'impacts': []
     }
 
-    # We need to check if the BeautifulSoup object is missing
-    if soup is None:
-        return forecast_weather_conditions
-
-    # Extract HTML tags for forecast weather conditions from the daily weather forecast
-    div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
-    list_of_all_daily_weather_forecast_tags = div_tag_with_row_weather_page_class.find_all(
-        'div',
-        attrs={
-            'class': 'col-md-12 col-lg-12'
-        }
-    )
+    page = extract_daily_weather_forecast_page(soup)
 
-    # Verify TC info section exists: exactly 5 divs with class 'col-md-12 col-lg-12'
-    if len(list_of_all_daily_weather_forecast_tags) == 5:
-        forecast_weather_conditions_tag = list_of_all_daily_weather_forecast_tags[2]
-    
-    else:
-        forecast_weather_conditions_tag = list_of_all_daily_weather_forecast_tags[1]
+    # We need to check if the BeautifulSoup object or the forecast weather conditions section is missing
+    if page is None or page.forecast_weather_conditions_tag is None:
+        return forecast_weather_conditions
 
+    forecast_weather_conditions_tag = page.forecast_weather_conditions_tag
     tbody_tag = forecast_weather_conditions_tag.find('tbody')
 
     # We need to check if the tbody_tag is missing
@@ -324,6 +402,10 @@ def extract_forecast_weather_conditions(
         # Use find_all() to retrieve all forecast weather conditions data
         list_of_all_table_data_tags = table_row_tag.find_all('td')
 
+        # We need to check if the table row is missing any of its four cells
+        if len(list_of_all_table_data_tags) < 4:
+            continue
+
         place = str(list_of_all_table_data_tags[0].text).strip()
         forecast_weather_conditions['place'].append(place)
 
@@ -339,7 +421,8 @@ def extract_forecast_weather_conditions(
     return forecast_weather_conditions
 
 def save_forecast_weather_conditions_to_json(
-    forecast_weather_conditions: dict[str, list]
+    forecast_weather_conditions: dict[str, list],
+    subdir: str = 'data/raw/daily_weather_forecast'
 ) -> None:
     '''
     Saves the forecast weather conditions of the daily
@@ -350,6 +433,10 @@ def save_forecast_weather_conditions_to_json(
     :param forecast_weather_conditions: Dictionary
         containing forecast weather conditions
     :type forecast_weather_conditions: dict[str, list]
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store forecast weather conditions from the daily weather forecast
     data = {
@@ -361,7 +448,7 @@ def save_forecast_weather_conditions_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/daily_weather_forecast/forecast_weather_conditions.json',
+        f'{subdir}/forecast_weather_conditions.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -369,7 +456,7 @@ def save_forecast_weather_conditions_to_json(
     json_file.close()
 
 def extract_forecast_wind_and_coastal_water_conditions(
-        soup: BeautifulSoup | None
+        soup: BeautifulSoup | DailyWeatherForecastPage | None
 ) -> dict[str, list]:
     '''
     Extracts forecast wind and coastal water conditions
@@ -377,9 +464,9 @@ def extract_forecast_wind_and_coastal_water_conditions(
     website.
 
     :param soup: BeautifulSoup object for navigating
-        and manipulating the page content, or None if
-        extraction fails
-    :type soup: BeautifulSoup | None
+        and manipulating the page content, the located
+        page sections, or None if extraction fails
+    :type soup: BeautifulSoup | DailyWeatherForecastPage | None
 
     :return: Dictionary containing forecast wind and
         coastal water conditions
@@ -392,26 +479,13 @@ def extract_forecast_wind_and_coastal_water_conditions(
         'coastal_water': []
     }
 
-    # We need to check if the BeautifulSoup object is missing
-    if soup is None:
-        return forecast_wind_and_coastal_water_conditions
+    page = extract_daily_weather_forecast_page(soup)
 
-    # Extract HTML tags for forecast wind and coastal water conditions from the daily weather forecast
-    div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
-    list_of_all_daily_weather_forecast_tags = div_tag_with_row_weather_page_class.find_all(
-        'div',
-        attrs={
-            'class': 'col-md-12 col-lg-12'
-        }
-    )
-
-    # Verify TC info section exists: exactly 5 divs with class 'col-md-12 col-lg-12'
-    if len(list_of_all_daily_weather_forecast_tags) == 5:
-        forecast_wind_and_coastal_water_conditions_tag = list_of_all_daily_weather_forecast_tags[3]
-    
-    else:
-        forecast_wind_and_coastal_water_conditions_tag = list_of_all_daily_weather_forecast_tags[2]
+    # We need to check if the BeautifulSoup object or the forecast wind and coastal water conditions section is missing
+    if page is None or page.forecast_wind_and_coastal_water_conditions_tag is None:
+        return forecast_wind_and_coastal_water_conditions
 
+    forecast_wind_and_coastal_water_conditions_tag = page.forecast_wind_and_coastal_water_conditions_tag
     tbody_tag = forecast_wind_and_coastal_water_conditions_tag.find('tbody')
 
     # We need to check if the tbody_tag is missing
@@ -425,6 +499,10 @@ def extract_forecast_wind_and_coastal_water_conditions(
         # Use find_all() to retrieve all forecast wind and coastal water conditions data
         list_of_all_table_data_tags = table_row_tag.find_all('td')
 
+        # We need to check if the table row is missing any of its four cells
+        if len(list_of_all_table_data_tags) < 4:
+            continue
+
         place = str(list_of_all_table_data_tags[0].text).strip()
         forecast_wind_and_coastal_water_conditions['place'].append(place)
 
@@ -440,7 +518,8 @@ def extract_forecast_wind_and_coastal_water_conditions(
     return forecast_wind_and_coastal_water_conditions
 
 def save_forecast_wind_and_coastal_water_conditions_to_json(
-    forecast_wind_and_coastal_water_conditions: dict[str, list]
+    forecast_wind_and_coastal_water_conditions: dict[str, list],
+    subdir: str = 'data/raw/daily_weather_forecast'
 ) -> None:
     '''
     Saves the forecast wind and coastal water conditions of the
@@ -451,6 +530,10 @@ def save_forecast_wind_and_coastal_water_conditions_to_json(
     :param forecast_wind_and_coastal_water_conditions: Dictionary
         containing forecast wind and coastal water conditions
     :type forecast_wind_and_coastal_water_conditions: dict[str, list]
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store forecast wind and coastal water conditions from the daily weather forecast
     data = {
@@ -462,7 +545,7 @@ def save_forecast_wind_and_coastal_water_conditions_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/daily_weather_forecast/forecast_wind_and_coastal_water_conditions.json',
+        f'{subdir}/forecast_wind_and_coastal_water_conditions.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -470,7 +553,7 @@ def save_forecast_wind_and_coastal_water_conditions_to_json(
     json_file.close()
 
 def extract_temperature_and_relative_humidity(
-        soup: BeautifulSoup | None
+        soup: BeautifulSoup | DailyWeatherForecastPage | None
 ) -> dict[str, str]:
     '''
     Extracts temperature and relative humidity from
@@ -478,9 +561,9 @@ def extract_temperature_and_relative_humidity(
     website.
     
     :param soup: BeautifulSoup object for navigating
-        and manipulating the page content, or None if
-        extraction fails
-    :type soup: BeautifulSoup | None
+        and manipulating the page content, the located
+        page sections, or None if extraction fails
+    :type soup: BeautifulSoup | DailyWeatherForecastPage | None
 
     :return: Dictionary containing temperature and
         relative humidity
@@ -491,26 +574,13 @@ def extract_temperature_and_relative_humidity(
         'relative_humidity_percentage': {'max': [], 'min': []}
     }
 
-    # We need to check if the BeautifulSoup object is missing
-    if soup is None:
-        return temperature_and_relative_humidity
+    page = extract_daily_weather_forecast_page(soup)
 
-    # Extract HTML tags for temperature and relative humidity from the daily weather forecast
-    div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
-    list_of_all_daily_weather_forecast_tags = div_tag_with_row_weather_page_class.find_all(
-        'div',
-        attrs={
-            'class': 'col-md-12 col-lg-12'
-        }
-    )
-
-    # Verify TC info section exists: exactly 5 divs with class 'col-md-12 col-lg-12'
-    if len(list_of_all_daily_weather_forecast_tags) == 5:
-        temperature_and_relative_humidity_tag = list_of_all_daily_weather_forecast_tags[4]
-    
-    else:
-        temperature_and_relative_humidity_tag = list_of_all_daily_weather_forecast_tags[3]
+    # We need to check if the BeautifulSoup object or the temperature and relative humidity section is missing
+    if page is None or page.temperature_and_relative_humidity_tag is None:
+        return temperature_and_relative_humidity
 
+    temperature_and_relative_humidity_tag = page.temperature_and_relative_humidity_tag
     tbody_tag = temperature_and_relative_humidity_tag.find('tbody')
 
     # We need to check if the tbody_tag is missing
@@ -525,6 +595,10 @@ def extract_temperature_and_relative_humidity(
         # Use find_all() to retrieve all temperature and relative humidity data
         list_of_all_table_data_tags = table_row_tag.find_all('td')[1:]
 
+        # We need to check if the table row is missing any of its four cells
+        if len(list_of_all_table_data_tags) < 4:
+            continue
+
         first_instance_of_table_data_tag = str(list_of_all_table_data_tags[0].text).strip()
         second_instance_of_table_data_tag = str(list_of_all_table_data_tags[1].text).strip()
         third_instance_of_table_data_tag = str(list_of_all_table_data_tags[2].text).strip()
@@ -562,7 +636,8 @@ def extract_temperature_and_relative_humidity(
     return temperature_and_relative_humidity
 
 def save_temperature_and_relative_humidity_to_json(
-        temperature_and_relative_humidity: dict[str, dict]
+        temperature_and_relative_humidity: dict[str, dict],
+        subdir: str = 'data/raw/daily_weather_forecast'
 ) -> None:
     '''
     Saves the temperature and relative humidity of the daily
@@ -573,6 +648,10 @@ def save_temperature_and_relative_humidity_to_json(
     :param temperature_and_relative_humidity: Dictionary
         containing temperature and relative humidity data
     :type temperature_and_relative_humidity: dict[str, dict]
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store temperature and relative humidity from the daily weather forecast
     data = {
@@ -588,7 +667,7 @@ def save_temperature_and_relative_humidity_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/daily_weather_forecast/temperature_and_relative_humidity.json',
+        f'{subdir}/temperature_and_relative_humidity.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -4,9 +4,26 @@
     DOST website.
 '''
 import os
-import requests
 import json
+import threading
+from datetime import date
+from urllib.parse import urljoin, urlsplit
 from bs4 import BeautifulSoup
+from fetch.fetch import fetch_page
+from parse.parse import make_beautiful_soup_object
+
+# Regions of the page that the extractors read, so only these are parsed
+PAGE_REGIONS = [('div', 'row climate-page')]
+
+# Backfill settings (can be overridden using environment variables)
+FIRST_YEAR = int(os.environ.get('PAGASA_TC_RAINFALL_FIRST_YEAR', '2018'))
+YEAR_LISTING_URL_FORMAT = os.environ.get(
+    'PAGASA_TC_RAINFALL_YEAR_LISTING_URL',
+    'https://www.pagasa.dost.gov.ph/climate/tropical-cyclone-associated-rainfall/{year}'
+)
+
+# Part of the path of every tropical cyclone associated rainfall image
+TC_RAINFALL_IMAGE_PATH = '/climate/tropicalcyclone/'
 
 def create_subdir(
 ) -> None:
@@ -38,15 +55,19 @@ def extract_beautiful_soup_object(
         the page content, or None if extraction
         fails
     :rtype: BeautifulSoup | None
+
+    :raises PageNotModified: If the page hasn't
+        changed since it was last ingested
     '''
-    response = requests.get(url)
+    # Use the shared pooled session so connections are reused across pages
+    response = fetch_page(url)
 
     # We need to check if the status code of the response for the request is unsuccessful
     if response.status_code != 200:
         return None
 
-    # Parse as a BeautifulSoup object
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Parse only the regions read by the extractors using the configured HTML parser backend
+    soup = make_beautiful_soup_object(response.text, PAGE_REGIONS)
     return soup
 
 def extract_tropical_cyclone_associated_rainfall(
@@ -73,12 +94,22 @@ def extract_tropical_cyclone_associated_rainfall(
 
     # Extract HTML tags for tropical cyclone associated rainfall
     div_tag_with_row_climate_page_class = soup.find('div', attrs={'class': 'row climate-page'})
+
+    # We need to check if the div_tag_with_row_climate_page_class is missing
+    if div_tag_with_row_climate_page_class is None:
+        return tropical_cyclone_associated_rainfall
+
     tropical_cyclone_associated_rainfall_tag = div_tag_with_row_climate_page_class.find(
         'div',
         attrs={
             'class': 'col-md-12 article-content'
         }
     )
+
+    # We need to check if the tropical_cyclone_associated_rainfall_tag is missing
+    if tropical_cyclone_associated_rainfall_tag is None:
+        return tropical_cyclone_associated_rainfall
+
     div_tag_with_panel_class = tropical_cyclone_associated_rainfall_tag.find(
         'div',
         attrs={
@@ -96,7 +127,17 @@ def extract_tropical_cyclone_associated_rainfall(
             'class': 'col-md-8'
         }
     )
+
+    # We need to check if the tropical_cyclone_associated_rainfall_tag is missing
+    if tropical_cyclone_associated_rainfall_tag is None:
+        return tropical_cyclone_associated_rainfall
+
     img_tag = tropical_cyclone_associated_rainfall_tag.find('img')
+
+    # We need to check if the img_tag is missing
+    if img_tag is None:
+        return tropical_cyclone_associated_rainfall
+
     tropical_cyclone_associated_rainfall = img_tag['src']
     tropical_cyclone_associated_rainfall = str(tropical_cyclone_associated_rainfall).strip()
 
@@ -127,4 +168,215 @@ def save_tropical_cyclone_associated_rainfall_to_json(
     ) as json_file:
         json.dump(data, json_file, indent=4)
 
-    json_file.close()
\ No newline at end of file
+    json_file.close()
+
+def extract_whole_page_soup(
+        url: str
+) -> BeautifulSoup | None:
+    '''
+    Extracts the BeautifulSoup object of a whole
+    page that lists tropical cyclone associated
+    rainfalls, such as the listing of a year. The
+    page is always downloaded, since the backfill
+    keeps track of the years it completed on its own.
+
+    :param url: URL of the PAGASA-DOST page
+    :type url: str
+
+    :return: BeautifulSoup object for navigating
+        the page content, or None if extraction
+        fails
+    :rtype: BeautifulSoup | None
+    '''
+    response = fetch_page(url, conditional=False)
+
+    # We need to check if the status code of the response for the request is unsuccessful
+    if response.status_code != 200:
+        return None
+
+    # Parse the whole page since the links to the years can be outside of the page regions
+    soup = make_beautiful_soup_object(response.text)
+    return soup
+
+def extract_year_listing_urls(
+        soup: BeautifulSoup | None,
+        url: str
+) -> dict[int, str]:
+    '''
+    Extracts the URLs of the listings of every year
+    of tropical cyclone associated rainfalls, such
+    as the year tabs of the page. If the page was
+    parsed but has no links to the years, a listing
+    URL is made for every year from the first
+    archived year up to the current one.
+
+    :param soup: BeautifulSoup object of the whole
+        page, or None if extraction fails
+    :type soup: BeautifulSoup | None
+
+    :param url: URL of the page, which relative
+        links are resolved against
+    :type url: str
+
+    :return: Dictionary of years with the URLs of
+        their listings, where a tab of the page
+        itself has the year as its fragment, or an
+        empty dictionary if extraction fails
+    :rtype: dict[int, str]
+    '''
+    year_listing_urls = {}
+
+    # We need to check if the BeautifulSoup object is missing, so no listing URLs are guessed for a failed fetch
+    if soup is None:
+        return year_listing_urls
+
+    # Links to the years are the links whose text is just a year, such as 2024
+    for a_tag in soup.find_all('a', href=True):
+        text = str(a_tag.text).strip()
+
+        if len(text) == 4 and text.isdigit() and FIRST_YEAR <= int(text):
+            year_listing_urls.setdefault(int(text), urljoin(url, a_tag['href']))
+
+    # We need to check if the page has no links to the years
+    if year_listing_urls == {}:
+        year_listing_urls = {
+            year: YEAR_LISTING_URL_FORMAT.format(year=year)
+            for year in range(FIRST_YEAR, date.today().year + 1)
+        }
+
+    return year_listing_urls
+
+def extract_tropical_cyclone_associated_rainfalls(
+        soup: BeautifulSoup | None,
+        year_listing_url: str
+) -> list[str]:
+    '''
+    Extracts the image URLs of all tropical cyclone
+    associated rainfalls of one year, in the order
+    they are listed.
+
+    :param soup: BeautifulSoup object of the whole
+        page with the listing, or None if extraction
+        fails
+    :type soup: BeautifulSoup | None
+
+    :param year_listing_url: URL of the listing of
+        the year, whose fragment is the id of its tab
+        if the page lists many years
+    :type year_listing_url: str
+
+    :return: List of image URLs
+    :rtype: list[str]
+    '''
+    tropical_cyclone_associated_rainfalls = []
+
+    # We need to check if the BeautifulSoup object is missing
+    if soup is None:
+        return tropical_cyclone_associated_rainfalls
+
+    fragment = urlsplit(year_listing_url).fragment
+
+    # Read only the tab of the year if the page lists many years, otherwise the whole listing
+    if fragment:
+        listing_tag = soup.find(id=fragment)
+    else:
+        listing_tag = soup.find('div', attrs={'class': 'row climate-page'}) or soup
+
+    # We need to check if the listing_tag is missing
+    if listing_tag is None:
+        return tropical_cyclone_associated_rainfalls
+
+    for img_tag in listing_tag.find_all('img', src=True):
+        image_url = urljoin(year_listing_url, str(img_tag['src']).strip())
+
+        # We need to check if the image is a rainfall map and not listed twice
+        if TC_RAINFALL_IMAGE_PATH in image_url and image_url not in tropical_cyclone_associated_rainfalls:
+            tropical_cyclone_associated_rainfalls.append(image_url)
+
+    return tropical_cyclone_associated_rainfalls
+
+def get_year_filepath(
+        year: int,
+        subdir: str = 'data/raw/tropical_cyclone_associated_rainfall'
+) -> str:
+    '''
+    Returns the path of the JSON file with the
+    tropical cyclone associated rainfalls of a year.
+
+    :param year: Year of the tropical cyclones
+    :type year: int
+
+    :param subdir: Subdirectory of the JSON files
+    :type subdir: str
+
+    :return: Relative filepath, such as
+        tropical_cyclone_associated_rainfalls_of_2024.json
+    :rtype: str
+    '''
+    return os.path.join(subdir, f'tropical_cyclone_associated_rainfalls_of_{year}.json')
+
+def is_year_complete(
+        year: int,
+        subdir: str = 'data/raw/tropical_cyclone_associated_rainfall'
+) -> bool:
+    '''
+    Checks if the tropical cyclone associated
+    rainfalls of a year are already saved for good,
+    which is the case for past years with a non-empty
+    JSON file, since no more tropical cyclones are
+    added to them.
+
+    :param year: Year of the tropical cyclones
+    :type year: int
+
+    :param subdir: Subdirectory of the JSON files
+    :type subdir: str
+
+    :return: True if the year can be skipped
+    :rtype: bool
+    '''
+    filepath = get_year_filepath(year, subdir)
+
+    # We need to check if the year is still running or was never saved
+    if year >= date.today().year or not os.path.exists(filepath):
+        return False
+
+    with open(filepath, 'r') as json_file:
+        data = json.load(json_file)
+
+    return bool(data.get(f'tropical_cyclone_associated_rainfalls_of_{year}'))
+
+def save_tropical_cyclone_associated_rainfalls_to_json(
+        year: int,
+        tropical_cyclone_associated_rainfalls: list[str],
+        subdir: str = 'data/raw/tropical_cyclone_associated_rainfall'
+) -> None:
+    '''
+    Saves the tropical cyclone associated rainfalls
+    of a year to a JSON file in the
+    data/raw/tropical_cyclone_associated_rainfall
+    subdirectory, writing to a temporary file first
+    so a concurrent backfill never leaves it
+    half-written.
+
+    :param year: Year of the tropical cyclones
+    :type year: int
+
+    :param tropical_cyclone_associated_rainfalls: List
+        of image URLs
+    :type tropical_cyclone_associated_rainfalls: list[str]
+
+    :param subdir: Subdirectory of the JSON files
+    :type subdir: str
+    '''
+    data = {
+        f'tropical_cyclone_associated_rainfalls_of_{year}': tropical_cyclone_associated_rainfalls
+    }
+
+    filepath = get_year_filepath(year, subdir)
+    temporary_filepath = f'{filepath}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+    with open(temporary_filepath, 'w') as json_file:
+        json.dump(data, json_file, indent=4)
+
+    os.replace(temporary_filepath, filepath)
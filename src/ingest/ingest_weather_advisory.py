@@ -3,9 +3,13 @@
     PAGASA-DOST website.
 '''
 import os
-import requests
 import json
 from bs4 import BeautifulSoup
+from fetch.fetch import fetch_page
+from parse.parse import make_beautiful_soup_object
+
+# Regions of the page that the extractors read, so only these are parsed
+PAGE_REGIONS = [('div', 'row marine')]
 
 def create_subdir(
 ) -> None:
@@ -35,15 +39,19 @@ def extract_beautiful_soup_object(
         the page content, or None if extraction
         fails
     :rtype: BeautifulSoup | None
+
+    :raises PageNotModified: If the page hasn't
+        changed since it was last ingested
     '''
-    response = requests.get(url)
+    # Use the shared pooled session so connections are reused across pages
+    response = fetch_page(url)
 
     # We need to check if the status code of the response for the request is unsuccessful
     if response.status_code != 200:
         return None
 
-    # Parse as a BeautifulSoup object
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Parse only the regions read by the extractors using the configured HTML parser backend
+    soup = make_beautiful_soup_object(response.text, PAGE_REGIONS)
     return soup
 
 def extract_weather_advisory(
@@ -70,6 +78,11 @@ def extract_weather_advisory(
 
     # Extract HTML tags for weather advisory
     div_tag_with_row_marine_class = soup.find('div', attrs={'class': 'row marine'})
+
+    # We need to check if the div_tag_with_row_marine_class is missing
+    if div_tag_with_row_marine_class is None:
+        return weather_advisory
+
     weather_advisory_tag = div_tag_with_row_marine_class.find(
         'div',
         attrs={
@@ -82,6 +95,11 @@ def extract_weather_advisory(
         return weather_advisory
 
     iframe_tag = weather_advisory_tag.find('iframe')
+
+    # We need to check if the iframe_tag is missing
+    if iframe_tag is None:
+        return weather_advisory
+
     weather_advisory = iframe_tag['src']
     weather_advisory = str(weather_advisory).strip()
 
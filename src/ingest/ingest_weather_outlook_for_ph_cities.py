@@ -3,9 +3,13 @@
     Philippine cities from the PAGASA-DOST website.
 '''
 import os
-import requests
 import json
 from bs4 import BeautifulSoup
+from fetch.fetch import fetch_page
+from parse.parse import make_beautiful_soup_object
+
+# Regions of the page that the extractors read, so only these are parsed
+PAGE_REGIONS = [('div', 'row weather-page')]
 
 def create_subdir(
 ) -> None:
@@ -36,15 +40,19 @@ def extract_beautiful_soup_object(
         and manipulating the page content, or None
         if extraction fails
     :rtype: BeautifulSoup | None
+
+    :raises PageNotModified: If the page hasn't
+        changed since it was last ingested
     '''
-    response = requests.get(url)
+    # Use the shared pooled session so connections are reused across pages
+    response = fetch_page(url)
 
     # We need to check if the status code of the response for the request is unsuccessful
     if response.status_code != 200:
         return None
     
-    # Parse as a BeautifulSoup object
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Parse only the regions read by the extractors using the configured HTML parser backend
+    soup = make_beautiful_soup_object(response.text, PAGE_REGIONS)
     return soup
 
 def extract_issued_datetime(
@@ -72,12 +80,22 @@ def extract_issued_datetime(
 
     # Extract HTML tags for issued datetime of the weather outlook for selected PH cities
     div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
+
+    # We need to check if the div_tag_with_row_weather_page_class is missing
+    if div_tag_with_row_weather_page_class is None:
+        return issued_datetime
+
     issued_datetime_and_valid_period_tag = div_tag_with_row_weather_page_class.find(
         'div',
         attrs={
             'class': 'col-md-12 col-lg-12 issue'
         }
     )
+
+    # We need to check if the issued_datetime_and_valid_period_tag is missing
+    if issued_datetime_and_valid_period_tag is None:
+        return issued_datetime
+
     div_tag_with_validity_class = issued_datetime_and_valid_period_tag.find(
         'div',
         attrs={
@@ -88,6 +106,11 @@ def extract_issued_datetime(
     # We need to check if the div_tag_with_validity_class is not missing
     if div_tag_with_validity_class is not None:
         issued_datetime_tag = div_tag_with_validity_class.find('b')
+
+        # We need to check if the issued_datetime_tag is missing
+        if issued_datetime_tag is None:
+            return issued_datetime
+
         issued_datetime = str(issued_datetime_tag.text).strip()
         # Use split() method to remove extra whitespaces in between words
         issued_datetime = ' '.join(issued_datetime.split())
@@ -95,7 +118,8 @@ def extract_issued_datetime(
     return issued_datetime
 
 def save_issued_datetime_to_json(
-        issued_datetime: str
+        issued_datetime: str,
+        subdir: str = 'data/raw/weather_outlook_for_ph_cities'
 ) -> None:
     '''
     Saves the issued datetime of the
@@ -108,6 +132,10 @@ def save_issued_datetime_to_json(
         of the weather outlook for selected
         Philippine cities
     :type issued_datetime: str
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store issued datetime of the weather outlook for selected PH cities
     data = {
@@ -116,7 +144,7 @@ def save_issued_datetime_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/weather_outlook_for_ph_cities/issued_datetime.json',
+        f'{subdir}/issued_datetime.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -148,12 +176,22 @@ def extract_valid_period(
 
     # Extract HTML tags for valid period of the weather outlook for selected PH cities
     div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
+
+    # We need to check if the div_tag_with_row_weather_page_class is missing
+    if div_tag_with_row_weather_page_class is None:
+        return valid_period
+
     issued_datetime_and_valid_period_tag = div_tag_with_row_weather_page_class.find(
         'div',
         attrs={
             'class': 'col-md-12 col-lg-12 issue'
         }
     )
+
+    # We need to check if the issued_datetime_and_valid_period_tag is missing
+    if issued_datetime_and_valid_period_tag is None:
+        return valid_period
+
     div_tag_with_validity_class = issued_datetime_and_valid_period_tag.find(
         'div',
         attrs={
@@ -163,13 +201,20 @@ def extract_valid_period(
 
     # We need to check if the div_tag_with_validity_class is not missing
     if div_tag_with_validity_class is not None:
-        valid_period_tag = div_tag_with_validity_class.find_all('b')[1]
+        list_of_all_bold_tags = div_tag_with_validity_class.find_all('b')
+
+        # We need to check if the valid period tag is missing
+        if len(list_of_all_bold_tags) < 2:
+            return valid_period
+
+        valid_period_tag = list_of_all_bold_tags[1]
         valid_period = str(valid_period_tag.text).strip()
 
     return valid_period
 
 def save_valid_period_to_json(
-        valid_period: str
+        valid_period: str,
+        subdir: str = 'data/raw/weather_outlook_for_ph_cities'
 ) -> None:
     '''
     Saves the valid period of the
@@ -182,6 +227,10 @@ def save_valid_period_to_json(
         the weather outlook for selected Philippine
         cities
     :type issued_datetime: str
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store valid period of the weather outlook for selected PH cities
     data = {
@@ -190,7 +239,7 @@ def save_valid_period_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/weather_outlook_for_ph_cities/valid_period.json',
+        f'{subdir}/valid_period.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -220,12 +269,22 @@ def extract_ph_city_tags(
 
     # Extract HTML tags for all selected PH cities to get their weather outlook
     div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
+
+    # We need to check if the div_tag_with_row_weather_page_class is missing
+    if div_tag_with_row_weather_page_class is None:
+        return list_of_all_ph_city_tags
+
     weather_outlook_for_ph_city_tag = div_tag_with_row_weather_page_class.find(
         'div',
         attrs={
             'class': 'col-md-12 col-lg-12'
         }
     )
+
+    # We need to check if the weather_outlook_for_ph_city_tag is missing
+    if weather_outlook_for_ph_city_tag is None:
+        return list_of_all_ph_city_tags
+
     div_tag_with_panel_group_class = weather_outlook_for_ph_city_tag.find(
         'div',
         attrs={
@@ -271,6 +330,11 @@ def extract_ph_city_names(
     # Loop through rows containing HTML tags to extract the names of the selected PH cities
     for ph_city_tag in list_of_all_ph_city_tags:
         ph_city_name_tag = ph_city_tag.find('a')
+
+        # We need to check if the ph_city_name_tag is missing
+        if ph_city_name_tag is None:
+            continue
+
         ph_city_name = str(ph_city_name_tag.text).strip()
         result[ph_city_name] = {}
 
@@ -301,6 +365,11 @@ def extract_weather_dates(
 
     # Extract HTML tags to get all weather dates of selected PH cities
     table_tag = ph_city_tag.find('table', attrs={'class': 'table'})
+
+    # We need to check if the table_tag is missing
+    if table_tag is None:
+        return weather_dates
+
     list_of_all_table_header_tags = table_tag.find_all('th')
 
     # Loop through rows containing HTML tags to extract all weather dates of selected PH cities
@@ -370,26 +439,11 @@ def extract_temperature_ranges(
     if list_of_all_ph_city_tags == []:
         return result
 
-    # Loop through PH city tags to extract temperature range tags
+    # Loop through PH city tags to extract temperature ranges of each selected PH city
     for ph_city_tag in list_of_all_ph_city_tags:
-        table_tag = ph_city_tag.find('table', attrs={'class': 'table'})
-        temperature_ranges_tag = table_tag.find('tr', attrs={'class': 'desktop-view-tr'})
-        list_of_all_table_data_tags = temperature_ranges_tag.find_all('td')
-
-        temperature_ranges = []
-
-        # Loop through tags to extract temperature ranges for selected PH cities
-        for table_data_tag in list_of_all_table_data_tags:
-            minimum_temperature_tag = table_data_tag.find('span', attrs={'class': 'min'})
-            minimum_temperature = str(minimum_temperature_tag.text).strip()
-
-            maximum_temperature_tag = table_data_tag.find('span', attrs={'class': 'max'})
-            maximum_temperature = str(maximum_temperature_tag.text).strip()
-            
-            temperature_ranges.append([minimum_temperature, maximum_temperature])
-        
-        result.append(temperature_ranges)
-    
+        _, ph_city_record = extract_ph_city_record(ph_city_tag)
+        result.append(ph_city_record['temperature_ranges'])
+
     return result
 
 def map_temperature_ranges_to_ph_cities(
@@ -453,26 +507,10 @@ def extract_chance_of_rain_percentages(
     if list_of_all_ph_city_tags == []:
         return result
 
-    # Loop through the selected Ph city HTML tags list to extract rain chance pct tags
+    # Loop through the selected PH city HTML tags list to extract rain chance pcts of each selected PH city
     for ph_city_tag in list_of_all_ph_city_tags:
-        table_tag = ph_city_tag.find('table', attrs={'class': 'table'})
-        chance_of_rain_percentages_tag = table_tag.find('tr', attrs={'class': 'desktop-view-tr'})
-        list_of_all_table_data_tags = chance_of_rain_percentages_tag.find_all('td')
-
-        chance_of_rain_percentages = []
-
-        # Loop through tags to extract rain chance pcts for selected PH cities
-        for table_data_tag in list_of_all_table_data_tags:
-            chance_of_rain_percentage_tag = table_data_tag.find(
-                'span',
-                attrs={
-                    'style': 'font-weight:bold; color: rgb(9, 73, 156);'
-                }
-            )
-            chance_of_rain_percentage = str(chance_of_rain_percentage_tag.text).strip()
-            chance_of_rain_percentages.append(chance_of_rain_percentage)
-        
-        result.append(chance_of_rain_percentages)
+        _, ph_city_record = extract_ph_city_record(ph_city_tag)
+        result.append(ph_city_record['chance_of_rain_percentages'])
 
     return result
 
@@ -519,8 +557,118 @@ def map_chance_of_rain_percentages_to_ph_cities(
 
     return result
 
+def extract_ph_city_record(
+        ph_city_tag: BeautifulSoup
+) -> tuple[str, dict[str, list]]:
+    '''
+    Extracts the name, temperature ranges and
+    chance of rain percentages of a selected
+    Philippine city by walking its HTML tag
+    exactly once.
+
+    :param ph_city_tag: HTML tag of a selected
+        Philippine city
+    :type ph_city_tag: BeautifulSoup
+
+    :return: Name of the Philippine city and a
+        dictionary of its temperature ranges and
+        chance of rain percentages
+    :rtype: tuple[str, dict[str, list]]
+    '''
+    ph_city_name_tag = ph_city_tag.find('a')
+    ph_city_name = str(ph_city_name_tag.text).strip() if ph_city_name_tag is not None else ''
+
+    temperature_ranges = []
+    chance_of_rain_percentages = []
+    list_of_all_table_data_tags = []
+
+    # Find the table row with the daily outlook only once for all values of the PH city
+    table_tag = ph_city_tag.find('table', attrs={'class': 'table'})
+    desktop_view_table_row_tag = None
+
+    # We need to check if the table_tag or its desktop view row is missing
+    if table_tag is not None:
+        desktop_view_table_row_tag = table_tag.find('tr', attrs={'class': 'desktop-view-tr'})
+
+    if desktop_view_table_row_tag is not None:
+        list_of_all_table_data_tags = desktop_view_table_row_tag.find_all('td')
+
+    # Loop through tags to extract temperature ranges and rain chance pcts for the selected PH city
+    for table_data_tag in list_of_all_table_data_tags:
+        minimum_temperature_tag = table_data_tag.find('span', attrs={'class': 'min'})
+        minimum_temperature = str(minimum_temperature_tag.text).strip() if minimum_temperature_tag is not None else ''
+
+        maximum_temperature_tag = table_data_tag.find('span', attrs={'class': 'max'})
+        maximum_temperature = str(maximum_temperature_tag.text).strip() if maximum_temperature_tag is not None else ''
+
+        temperature_ranges.append([minimum_temperature, maximum_temperature])
+
+        chance_of_rain_percentage_tag = table_data_tag.find(
+            'span',
+            attrs={
+                'style': 'font-weight:bold; color: rgb(9, 73, 156);'
+            }
+        )
+        chance_of_rain_percentage = (
+            str(chance_of_rain_percentage_tag.text).strip()
+            if chance_of_rain_percentage_tag is not None
+            else ''
+        )
+        chance_of_rain_percentages.append(chance_of_rain_percentage)
+
+    ph_city_record = {
+        'temperature_ranges': temperature_ranges,
+        'chance_of_rain_percentages': chance_of_rain_percentages
+    }
+
+    return ph_city_name, ph_city_record
+
+def extract_ph_cities_weather_outlook(
+        list_of_all_ph_city_tags: list[BeautifulSoup]
+) -> dict[str, dict]:
+    '''
+    Extracts the complete weather outlook of
+    all selected Philippine cities in a single
+    walk over each city's HTML tag, producing the
+    same dictionary as the extract_* and map_*
+    functions combined.
+
+    :param list_of_all_ph_city_tags: List of
+        selected Philippine city HTML tags
+    :type list_of_all_ph_city_tags: list[BeautifulSoup]
+
+    :return: Dictionary of city names with weather
+        dates, temperature ranges, and chance of rain
+        percentages
+    :rtype: dict[str, dict]
+    '''
+    result = {}
+
+    # We need to check if the selected PH city HTML tags list is missing
+    if list_of_all_ph_city_tags == []:
+        return result
+
+    # All selected PH cities share the weather dates of the first city
+    weather_dates = extract_weather_dates(list_of_all_ph_city_tags)
+
+    # We need to check if the weather dates list is missing
+    if weather_dates == []:
+        return result
+
+    # Loop through the selected PH city HTML tags once to build each city's weather outlook
+    for ph_city_tag in list_of_all_ph_city_tags:
+        ph_city_name, ph_city_record = extract_ph_city_record(ph_city_tag)
+        result[ph_city_name] = {
+            'weather_dates': weather_dates,
+            'temperature_ranges': ph_city_record['temperature_ranges'],
+            'chance_of_rain_percentages': ph_city_record['chance_of_rain_percentages']
+        }
+
+    return result
+
 def save_ph_cities_weather_outlook_to_json(
-        ph_cities_weather_outlook: dict[str, dict]
+        ph_cities_weather_outlook: dict[str, dict],
+        subdir: str = 'data/raw/weather_outlook_for_ph_cities'
 ) -> None:
     '''
     Saves the weather outlook for selected
@@ -532,13 +680,17 @@ def save_ph_cities_weather_outlook_to_json(
         city names with weather dates, temperature ranges,
         and chance of rain percentages
     :type ph_cities_weather_outlook: dict[str, dict]
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''    
     # Create a dictionary to store weather outlook of selected PH cities
     data = ph_cities_weather_outlook
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/weather_outlook_for_ph_cities/ph_cities_weather_outlook.json',
+        f'{subdir}/ph_cities_weather_outlook.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
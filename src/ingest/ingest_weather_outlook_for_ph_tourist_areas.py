@@ -4,9 +4,13 @@
     website.
 '''
 import os
-import requests
 import json
 from bs4 import BeautifulSoup
+from fetch.fetch import fetch_page
+from parse.parse import make_beautiful_soup_object
+
+# Regions of the page that the extractors read, so only these are parsed
+PAGE_REGIONS = [('div', 'row weather-page')]
 
 def create_subdir(
 ) -> None:
@@ -37,15 +41,19 @@ def extract_beautiful_soup_object(
         the page content, or None if extraction
         fails
     :rtype: BeautifulSoup | None
+
+    :raises PageNotModified: If the page hasn't
+        changed since it was last ingested
     '''
-    response = requests.get(url)
+    # Use the shared pooled session so connections are reused across pages
+    response = fetch_page(url)
 
     # We need to check if the status code of the response for the request is unsuccessful
     if response.status_code != 200:
         return None
     
-    # Parse as a BeautifulSoup object
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Parse only the regions read by the extractors using the configured HTML parser backend
+    soup = make_beautiful_soup_object(response.text, PAGE_REGIONS)
     return soup
 
 def extract_issued_datetime(
@@ -73,12 +81,22 @@ def extract_issued_datetime(
 
     # Extract HTML tags for issued datetime of the weather outlook for selected PH tourist areas
     div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
+
+    # We need to check if the div_tag_with_row_weather_page_class is missing
+    if div_tag_with_row_weather_page_class is None:
+        return issued_datetime
+
     issued_datetime_and_valid_period_tag = div_tag_with_row_weather_page_class.find(
         'div',
         attrs={
             'class': 'col-md-12 col-lg-12 issue'
         }
     )
+
+    # We need to check if the issued_datetime_and_valid_period_tag is missing
+    if issued_datetime_and_valid_period_tag is None:
+        return issued_datetime
+
     div_tag_with_validity_class = issued_datetime_and_valid_period_tag.find(
         'div',
         attrs={
@@ -89,12 +107,18 @@ def extract_issued_datetime(
     # We need to check if the div_tag_with_validity_class is not missing
     if div_tag_with_validity_class is not None:
         issued_datetime_tag = div_tag_with_validity_class.find('b')
+
+        # We need to check if the issued_datetime_tag is missing
+        if issued_datetime_tag is None:
+            return issued_datetime
+
         issued_datetime = str(issued_datetime_tag.text).strip()
     
     return issued_datetime
 
 def save_issued_datetime_to_json(
-        issued_datetime: str
+        issued_datetime: str,
+        subdir: str = 'data/raw/weather_outlook_for_ph_tourist_areas'
 ) -> None:
     '''
     Saves the issued datetime of the
@@ -107,6 +131,10 @@ def save_issued_datetime_to_json(
         of the weather outlook for selected
         Philippine tourist areas
     :type issued_datetime: str
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store issued datetime of the weather outlook for selected PH tourist areas
     data = {
@@ -115,7 +143,7 @@ def save_issued_datetime_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/weather_outlook_for_ph_tourist_areas/issued_datetime.json',
+        f'{subdir}/issued_datetime.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -147,12 +175,22 @@ def extract_valid_period(
 
     # Extract HTML tags for valid period of the weather outlook for selected PH tourist areas
     div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
+
+    # We need to check if the div_tag_with_row_weather_page_class is missing
+    if div_tag_with_row_weather_page_class is None:
+        return valid_period
+
     issued_datetime_and_valid_period_tag = div_tag_with_row_weather_page_class.find(
         'div',
         attrs={
             'class': 'col-md-12 col-lg-12 issue'
         }
     )
+
+    # We need to check if the issued_datetime_and_valid_period_tag is missing
+    if issued_datetime_and_valid_period_tag is None:
+        return valid_period
+
     div_tag_with_validity_class = issued_datetime_and_valid_period_tag.find(
         'div',
         attrs={
@@ -162,13 +200,20 @@ def extract_valid_period(
 
     # We need to check if the div_tag_with_validity_class is not missing
     if div_tag_with_validity_class is not None:
-        valid_period_tag = div_tag_with_validity_class.find_all('b')[1]
+        list_of_all_bold_tags = div_tag_with_validity_class.find_all('b')
+
+        # We need to check if the valid period tag is missing
+        if len(list_of_all_bold_tags) < 2:
+            return valid_period
+
+        valid_period_tag = list_of_all_bold_tags[1]
         valid_period = str(valid_period_tag.text).strip()
 
     return valid_period
 
 def save_valid_period_to_json(
-        valid_period: str
+        valid_period: str,
+        subdir: str = 'data/raw/weather_outlook_for_ph_tourist_areas'
 ) -> None:
     '''
     Saves the valid period of the
@@ -181,6 +226,10 @@ def save_valid_period_to_json(
         the weather outlook for selected Philippine
         tourist areas
     :type issued_datetime: str
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store valid period of the weather outlook for selected PH tourist areas
     data = {
@@ -189,7 +238,7 @@ def save_valid_period_to_json(
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/weather_outlook_for_ph_tourist_areas/valid_period.json',
+        f'{subdir}/valid_period.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
@@ -220,12 +269,22 @@ def extract_ph_tourist_area_tags(
 
     # Extract HTML tags for all selected PH tourist areas to get their weather outlook
     div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
+
+    # We need to check if the div_tag_with_row_weather_page_class is missing
+    if div_tag_with_row_weather_page_class is None:
+        return list_of_all_ph_tourist_area_tags
+
     weather_outlook_for_ph_tourist_area_tag = div_tag_with_row_weather_page_class.find(
         'div',
         attrs={
             'class': 'col-md-12 col-lg-12'
         }
     )
+
+    # We need to check if the weather_outlook_for_ph_tourist_area_tag is missing
+    if weather_outlook_for_ph_tourist_area_tag is None:
+        return list_of_all_ph_tourist_area_tags
+
     table_tag = weather_outlook_for_ph_tourist_area_tag.find('table', attrs={'class': 'table desktop'})
 
     # We need to check if the table_tag is missing
@@ -233,6 +292,11 @@ def extract_ph_tourist_area_tags(
         return list_of_all_ph_tourist_area_tags
 
     tbody_tag = table_tag.find('tbody')
+
+    # We need to check if the tbody_tag is missing
+    if tbody_tag is None:
+        return list_of_all_ph_tourist_area_tags
+
     # Use find_all() method to access all selected PH tourist area HTML tags
     list_of_all_ph_tourist_area_tags = tbody_tag.find_all('tr')
 
@@ -262,6 +326,11 @@ def extract_ph_tourist_area_names(
     # Loop through the PH tourist area HTML tags to extract the names of the selected PH tourist area
     for ph_tourist_area_tag in list_of_all_ph_tourist_area_tags:
         ph_tourist_area_name_tag = ph_tourist_area_tag.find('td')
+
+        # We need to check if the ph_tourist_area_name_tag is missing
+        if ph_tourist_area_name_tag is None:
+            continue
+
         ph_tourist_area_name = str(ph_tourist_area_name_tag.text).strip()
         # Use replace() to remove extra whitespace after '(' in PH tourist area names
         ph_tourist_area_name = ph_tourist_area_name.replace('( ', '(')
@@ -293,12 +362,22 @@ def extract_weather_dates(
 
     # Extract HTML tags to get all weather dates of selected PH tourist areas
     div_tag_with_row_weather_page_class = soup.find('div', attrs={'class': 'row weather-page'})
+
+    # We need to check if the div_tag_with_row_weather_page_class is missing
+    if div_tag_with_row_weather_page_class is None:
+        return weather_dates
+
     weather_outlook_for_ph_tourist_area_tag = div_tag_with_row_weather_page_class.find(
         'div',
         attrs={
             'class': 'col-md-12 col-lg-12'
         }
     )
+
+    # We need to check if the weather_outlook_for_ph_tourist_area_tag is missing
+    if weather_outlook_for_ph_tourist_area_tag is None:
+        return weather_dates
+
     table_tag = weather_outlook_for_ph_tourist_area_tag.find('table', attrs={'class': 'table desktop'})
 
     # We need to check if the table_tag is missing
@@ -306,6 +385,11 @@ def extract_weather_dates(
         return weather_dates
 
     thead_tag = table_tag.find('thead')
+
+    # We need to check if the thead_tag is missing
+    if thead_tag is None:
+        return weather_dates
+
     # Use find_all() method to access all weather dates
     list_of_all_table_header_tags = thead_tag.find_all('th')[1:]
 
@@ -385,10 +469,10 @@ def extract_temperature_ranges(
         # Loop through tags to extract temperature ranges list for selected PH tourist areas
         for table_data_tag in list_of_all_table_data_tags:
             minimum_temperature_tag = table_data_tag.find('span', attrs={'class': 'min'})
-            minimum_temperature = str(minimum_temperature_tag.text).strip()
+            minimum_temperature = str(minimum_temperature_tag.text).strip() if minimum_temperature_tag is not None else ''
 
             maximum_temperature_tag = table_data_tag.find('span', attrs={'class': 'max'})
-            maximum_temperature = str(maximum_temperature_tag.text).strip()
+            maximum_temperature = str(maximum_temperature_tag.text).strip() if maximum_temperature_tag is not None else ''
 
             temperature_ranges.append([minimum_temperature, maximum_temperature])
 
@@ -436,7 +520,8 @@ def map_temperature_ranges_to_ph_tourist_areas(
     return result
 
 def save_ph_tourist_areas_weather_outlook_to_json(
-        ph_tourist_areas_weather_outlook: dict[str, dict]
+        ph_tourist_areas_weather_outlook: dict[str, dict],
+        subdir: str = 'data/raw/weather_outlook_for_ph_tourist_areas'
 ) -> None:
     '''
     Saves the weather outlook for selected Philippine
@@ -448,13 +533,17 @@ def save_ph_tourist_areas_weather_outlook_to_json(
         of tourist area names with weather dates and
         temperature ranges
     :type ph_tourust_areas_weather_outlook: dict[str, dict]
+
+    :param subdir: Subdirectory to save the
+        JSON file to
+    :type subdir: str
     '''
     # Create a dictionary to store weather outlook of selected PH tourist areas
     data = ph_tourist_areas_weather_outlook
 
     # Save the dictionary to a json file using open() method and json module
     with open(
-        'data/raw/weather_outlook_for_ph_tourist_areas/ph_tourist_areas_weather_outlook.json',
+        f'{subdir}/ph_tourist_areas_weather_outlook.json',
         'w'
     ) as json_file:
         json.dump(data, json_file, indent=4)
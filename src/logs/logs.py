@@ -7,15 +7,89 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath('src'))
 
-import pandas as pd
+import io
+import csv
+import heapq
+import time
+import atexit
+import signal
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Callable
 
-from executor.ingest.execute_ingest_daily_weather_forecast import ingest_daily_weather_forecast
-from executor.ingest.execute_ingest_weather_outlook_for_ph_cities import ingest_weather_outlook_for_ph_cities
-from executor.ingest.execute_ingest_weather_outlook_for_ph_tourist_areas import ingest_weather_outlook_for_ph_tourist_areas
-from executor.ingest.execute_ingest_weather_advisory import ingest_weather_advisory
-from executor.ingest.execute_ingest_tropical_cyclone_advisory import ingest_tropical_cyclone_advisory
-from executor.ingest.execute_ingest_tropical_cyclone_associated_rainfall_executor import ingest_tropical_cyclone_associated_rainfall
+# File locking is only available on POSIX systems
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
+from fetch.fetch import PageNotModified
+from fetch.fetch import close_session
+from monitor.metrics import write_metrics
+from monitor.profiling import profile_job
+from monitor.profiling import SUPPORTED_PROFILE_MODES
+from executor.registry import INGEST_JOBS
+from executor.registry import load_ingest_job
+
+# Logs dataset (csv format) with its columns
+LOGS_FILEPATH = 'src/logs/logs.csv'
+LOGS_COLUMNS = ['messages', 'timestamps']
+
+# Number of log rows to buffer before they are appended and fsynced to the logs dataset
+LOGS_FSYNC_BATCH_SIZE = int(os.environ.get('PAGASA_LOGS_FSYNC_BATCH_SIZE', '8'))
+
+_pending_log_rows = []
+_logs_lock = threading.Lock()
+
+def flush_logs(
+) -> None:
+    '''
+    Appends all buffered log rows to the logs
+    dataset with a single write and fsyncs it.
+    The file is locked while writing so several
+    processes can log to it at the same time
+    without losing rows.
+    '''
+    with _logs_lock:
+        # We need to check if there is anything to write
+        if _pending_log_rows == []:
+            return
+
+        # Format all buffered rows the same way as the existing csv rows
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerows(_pending_log_rows)
+
+        file_descriptor = os.open(
+            LOGS_FILEPATH,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+            0o644
+        )
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+
+            # Write the header first if the logs dataset is new or empty
+            if os.fstat(file_descriptor).st_size == 0:
+                os.write(file_descriptor, (','.join(LOGS_COLUMNS) + '\n').encode('utf-8'))
+
+            os.write(file_descriptor, buffer.getvalue().encode('utf-8'))
+            os.fsync(file_descriptor)
+
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file_descriptor, fcntl.LOCK_UN)
+
+            os.close(file_descriptor)
+
+        _pending_log_rows.clear()
+
+# Make sure buffered log rows are written when the process exits
+atexit.register(flush_logs)
 
 def generate_logs(
     log_message: str
@@ -33,50 +107,512 @@ def generate_logs(
     now = datetime.now()
     timestamp = now.strftime(format)
 
-    # Generate logs using pandas for logs dataset (csv format)
-    logs = pd.read_csv('src/logs/logs.csv')
-    logs = pd.concat([
-        logs,
-        pd.DataFrame({
-            'messages': [log_message],
-            'timestamps': [timestamp]
-        })
-    ], ignore_index=True)
-    logs.to_csv('src/logs/logs.csv', index=False)
+    # Buffer the log row and append the whole batch to the logs dataset once it is full
+    with _logs_lock:
+        _pending_log_rows.append([log_message, timestamp])
+        batch_is_full = len(_pending_log_rows) >= LOGS_FSYNC_BATCH_SIZE
+
+    if batch_is_full:
+        flush_logs()
+
+# Maximum number of ingest jobs to run at the same time in concurrent mode
+MAX_WORKERS = int(os.environ.get('PAGASA_MAX_WORKERS', str(len(INGEST_JOBS))))
+
+# Seconds between two runs of each ingest job in daemon mode (can be overridden using environment variables)
+POLLING_INTERVALS = {
+    'daily_weather_forecast': int(os.environ.get('PAGASA_DAILY_WEATHER_FORECAST_INTERVAL', '3600')),
+    'weather_outlook_for_ph_cities': int(os.environ.get('PAGASA_WEATHER_OUTLOOK_FOR_PH_CITIES_INTERVAL', '21600')),
+    'weather_outlook_for_ph_tourist_areas': int(os.environ.get('PAGASA_WEATHER_OUTLOOK_FOR_PH_TOURIST_AREAS_INTERVAL', '21600')),
+    'weather_advisory': int(os.environ.get('PAGASA_WEATHER_ADVISORY_INTERVAL', '600')),
+    'tropical_cyclone_advisory': int(os.environ.get('PAGASA_TROPICAL_CYCLONE_ADVISORY_INTERVAL', '600')),
+    'tropical_cyclone_associated_rainfall': int(os.environ.get('PAGASA_TROPICAL_CYCLONE_ASSOCIATED_RAINFALL_INTERVAL', '900'))
+}
+
+# Set when the daemon is asked to stop, such as by SIGTERM
+_stop_event = threading.Event()
+
+def load_ingest_jobs(
+        datasets: list[str] | None = None,
+        profile_modes: tuple[str, ...] = ()
+) -> dict[str, tuple[Callable, str]]:
+    '''
+    Imports the ingest jobs of the given datasets,
+    so datasets that are not run are never imported.
+
+    :param datasets: Datasets to load the ingest jobs
+        of, or None for all datasets
+    :type datasets: list[str] | None
+
+    :param profile_modes: Profilers to run each
+        ingest job under, any of 'cprofile' and
+        'tracemalloc'
+    :type profile_modes: tuple[str, ...]
+
+    :return: Dictionary of datasets with their ingest
+        job and the message to log once it succeeds
+    :rtype: dict[str, tuple[Callable, str]]
+    '''
+    ingest_jobs = {}
+
+    for dataset in (datasets or INGEST_JOBS):
+        ingest_job = load_ingest_job(dataset)
+
+        # Only wrap the jobs when profiling was asked for, so normal runs call them directly
+        if profile_modes:
+            ingest_job = profile_job(ingest_job, tuple(profile_modes))
+
+        ingest_jobs[dataset] = (ingest_job, INGEST_JOBS[dataset][2])
+
+    return ingest_jobs
+
+def run_ingest_job(
+        ingest_job: Callable,
+        log_message: str
+) -> bool:
+    '''
+    Runs a single ingest job and logs its success,
+    skip or failure.
+
+    :param ingest_job: Ingest job to run
+    :type ingest_job: Callable
+
+    :param log_message: The message to log once
+        the ingest job succeeds
+    :type log_message: str
+
+    :return: True if the ingest job succeeded or
+        was skipped, otherwise False
+    :rtype: bool
+    '''
+    try:
+        ingest_job()
+
+    except PageNotModified as skip_reason:
+        generate_logs(f'(DEV): Skipped {ingest_job.__name__} because {skip_reason}.')
+        return True
+
+    except Exception as error:
+        generate_logs(f'(DEV): Failed to run {ingest_job.__name__}: {error!r}')
+        return False
+
+    generate_logs(log_message)
+    return True
+
+def run_ingest_jobs(
+        concurrent: bool = False,
+        max_workers: int = MAX_WORKERS,
+        profile_modes: tuple[str, ...] = (),
+        datasets: list[str] | None = None
+) -> bool:
+    '''
+    Runs the ingest jobs for the PAGASA-DOST
+    website and logs the success, skip or
+    failure of each job.
+
+    :param concurrent: Whether to run the ingest
+        jobs at the same time using a thread pool
+        instead of one after another
+    :type concurrent: bool
+
+    :param max_workers: Maximum number of ingest
+        jobs to run at the same time in concurrent
+        mode
+    :type max_workers: int
+
+    :param profile_modes: Profilers to run each
+        ingest job under, any of 'cprofile' and
+        'tracemalloc'
+    :type profile_modes: tuple[str, ...]
+
+    :param datasets: Datasets to run the ingest jobs
+        of, or None for all datasets
+    :type datasets: list[str] | None
+
+    :return: True if all ingest jobs succeeded,
+        otherwise False
+    :rtype: bool
+    '''
+    all_jobs_succeeded = True
+    ingest_jobs = list(load_ingest_jobs(datasets, profile_modes).values())
+
+    # Run the jobs one after another in the same order as they are declared
+    if not concurrent:
+        for ingest_job, log_message in ingest_jobs:
+            all_jobs_succeeded = run_ingest_job(ingest_job, log_message) and all_jobs_succeeded
+
+        flush_logs()
+        write_metrics()
+        return all_jobs_succeeded
+
+    # Each job hits an independent page and writes to its own data/raw/ subdirectory
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(ingest_job): (ingest_job, log_message)
+            for ingest_job, log_message in ingest_jobs
+        }
+
+        # Logs are only written from this thread as each job completes
+        for future in as_completed(futures):
+            ingest_job, log_message = futures[future]
+            error = future.exception()
+
+            # We need to check if the job was skipped because its page is unchanged
+            if isinstance(error, PageNotModified):
+                generate_logs(f'(DEV): Skipped {ingest_job.__name__} because {error}.')
+                continue
+
+            if error is not None:
+                all_jobs_succeeded = False
+                generate_logs(f'(DEV): Failed to run {ingest_job.__name__}: {error!r}')
+                continue
+
+            generate_logs(log_message)
+
+    flush_logs()
+    write_metrics()
+    return all_jobs_succeeded
+
+def run_extract_stage(
+) -> bool:
+    '''
+    Runs the extract stage of the ETL pipeline,
+    which stages the new or changed raw files of
+    every dataset, and logs how many were staged.
+
+    :return: True if the extract stage succeeded,
+        otherwise False
+    :rtype: bool
+    '''
+    try:
+        # Imported here so runs without the ETL stages don't have to import them
+        from executor.etl.execute_extract_stage import execute_extract_stage
+
+        list_of_all_staged_filepaths = execute_extract_stage()
+
+    except Exception as error:
+        generate_logs(f'(DEV): Failed to run execute_extract_stage: {error!r}')
+        flush_logs()
+        write_metrics()
+        return False
+
+    generate_logs(f'(DEV): Staged {len(list_of_all_staged_filepaths)} new or changed raw files.')
+    flush_logs()
+    write_metrics()
+    return True
+
+def run_transform_stage(
+        include_history: bool = False
+) -> bool:
+    '''
+    Runs the transform stage of the ETL pipeline,
+    which converts the staged datasets into numeric
+    tables, and logs how many rows were transformed.
+
+    :param include_history: Whether to also transform
+        the archived snapshots of the history store
+    :type include_history: bool
+
+    :return: True if the transform stage succeeded,
+        otherwise False
+    :rtype: bool
+    '''
+    try:
+        # Imported here so runs without the transform stage don't have to import pandas
+        from executor.etl.execute_transform_stage import execute_transform_stage
+
+        number_of_rows_by_table = execute_transform_stage(include_history)
+
+    except Exception as error:
+        generate_logs(f'(DEV): Failed to run execute_transform_stage: {error!r}')
+        flush_logs()
+        write_metrics()
+        return False
+
+    generate_logs(f'(DEV): Transformed {sum(number_of_rows_by_table.values())} rows into {len(number_of_rows_by_table)} tables.')
+    flush_logs()
+    write_metrics()
+    return True
+
+def run_download_stage(
+) -> bool:
+    '''
+    Runs the download stage of the ETL pipeline,
+    which downloads the new rainfall maps of the
+    tropical cyclone associated rainfall, and logs
+    how many were downloaded.
+
+    :return: True if every rainfall map was
+        downloaded, otherwise False
+    :rtype: bool
+    '''
+    try:
+        # Imported here so runs without the download stage don't have to import it
+        from executor.etl.execute_download_stage import execute_download_stage
+
+        list_of_all_downloaded_image_urls, errors_by_failed_image_url = execute_download_stage()
+
+    except Exception as error:
+        generate_logs(f'(DEV): Failed to run execute_download_stage: {error!r}')
+        flush_logs()
+        write_metrics()
+        return False
+
+    for image_url, error in errors_by_failed_image_url.items():
+        generate_logs(f'(DEV): Failed to download {image_url}: {error}')
+
+    generate_logs(f'(DEV): Downloaded {len(list_of_all_downloaded_image_urls)} new rainfall maps.')
+    flush_logs()
+    write_metrics()
+    return errors_by_failed_image_url == {}
+
+def run_backfill(
+        force: bool = False
+) -> bool:
+    '''
+    Runs the backfill of the tropical cyclone
+    associated rainfalls of every year and logs how
+    many years were saved.
+
+    :param force: Whether to crawl the years that
+        are already complete as well
+    :type force: bool
+
+    :return: True if every listing page was
+        backfilled, otherwise False
+    :rtype: bool
+    '''
+    try:
+        # Imported here so runs without the backfill don't have to import it
+        from executor.ingest.execute_ingest_tropical_cyclone_associated_rainfall_executor import backfill_tropical_cyclone_associated_rainfalls
+
+        number_of_images_by_year, errors_by_failed_page_url = backfill_tropical_cyclone_associated_rainfalls(force)
+
+    except Exception as error:
+        generate_logs(f'(DEV): Failed to run backfill_tropical_cyclone_associated_rainfalls: {error!r}')
+        flush_logs()
+        write_metrics()
+        return False
+
+    for page_url, error in errors_by_failed_page_url.items():
+        generate_logs(f'(DEV): Failed to backfill {page_url}: {error}')
+
+    generate_logs(f'(DEV): Backfilled {sum(number_of_images_by_year.values())} tropical cyclone associated rainfalls of {len(number_of_images_by_year)} years.')
+    flush_logs()
+    write_metrics()
+    return errors_by_failed_page_url == {}
+
+def run_daemon(
+        concurrent: bool = False,
+        max_workers: int = MAX_WORKERS,
+        profile_modes: tuple[str, ...] = (),
+        extract_stage: bool = False,
+        transform_stage: bool = False,
+        include_history: bool = False,
+        datasets: list[str] | None = None
+) -> None:
+    '''
+    Keeps running the ingest jobs, each on its own
+    polling interval, until SIGTERM or SIGINT. The
+    process stays resident, so the imports, the
+    pooled HTTP connections and the page validators
+    are reused by every run instead of paying for a
+    new interpreter each time.
+
+    :param concurrent: Whether to run the ingest
+        jobs that are due at the same time using a
+        thread pool
+    :type concurrent: bool
+
+    :param max_workers: Maximum number of ingest
+        jobs to run at the same time in concurrent
+        mode
+    :type max_workers: int
+
+    :param profile_modes: Profilers to run each
+        ingest job under, any of 'cprofile' and
+        'tracemalloc'
+    :type profile_modes: tuple[str, ...]
+
+    :param extract_stage: Whether to stage the new
+        or changed raw files after each round of
+        ingest jobs
+    :type extract_stage: bool
+
+    :param transform_stage: Whether to transform the
+        staged datasets after each round of ingest
+        jobs
+    :type transform_stage: bool
+
+    :param include_history: Whether to also transform
+        the archived snapshots of the history store
+    :type include_history: bool
+
+    :param datasets: Datasets to poll, or None for
+        all datasets
+    :type datasets: list[str] | None
+    '''
+    # Stop between two rounds of ingest jobs instead of in the middle of one
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signal_number, lambda signal_number, frame: _stop_event.set())
+
+    ingest_jobs_by_dataset = load_ingest_jobs(datasets, profile_modes)
+
+    # Every ingest job is due right away, then again after its own interval
+    now = time.monotonic()
+    schedule = [
+        (now, position, dataset)
+        for position, dataset in enumerate(ingest_jobs_by_dataset)
+    ]
+    heapq.heapify(schedule)
+
+    generate_logs(f'(DEV): Started the daemon with {len(schedule)} ingest jobs.')
+    flush_logs()
+
+    try:
+        while not _stop_event.is_set():
+            # Sleep until the next ingest job is due, waking up early if asked to stop
+            if _stop_event.wait(max(schedule[0][0] - time.monotonic(), 0)):
+                break
+
+            list_of_all_due_jobs = []
+            now = time.monotonic()
+
+            while schedule and schedule[0][0] <= now:
+                list_of_all_due_jobs.append(heapq.heappop(schedule))
+
+            ingest_jobs = [
+                ingest_jobs_by_dataset[dataset]
+                for _, _, dataset in list_of_all_due_jobs
+            ]
+
+            if concurrent and len(ingest_jobs) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for ingest_job, log_message in ingest_jobs:
+                        executor.submit(run_ingest_job, ingest_job, log_message)
+
+            else:
+                for ingest_job, log_message in ingest_jobs:
+                    run_ingest_job(ingest_job, log_message)
+
+            flush_logs()
+            write_metrics()
+
+            if extract_stage:
+                run_extract_stage()
+
+            if transform_stage:
+                run_transform_stage(include_history)
+
+            # We need to check if a run took longer than the interval, so missed runs are not repeated
+            for due_at, position, dataset in list_of_all_due_jobs:
+                next_due_at = due_at + POLLING_INTERVALS[dataset]
+
+                if next_due_at <= time.monotonic():
+                    next_due_at = time.monotonic() + POLLING_INTERVALS[dataset]
+
+                heapq.heappush(schedule, (next_due_at, position, dataset))
+
+    finally:
+        close_session()
+        generate_logs('(DEV): Stopped the daemon.')
+        flush_logs()
+        write_metrics()
 
 if __name__ == '__main__':
-    # Ingest data for daily weather forecast
-    ingest_daily_weather_forecast()
-    generate_logs(
-        '(DEV): Ingest the data for the daily weather forecast.'
+    parser = argparse.ArgumentParser(
+        description='Runs the ingest jobs for the PAGASA-DOST website.'
     )
-
-    # Ingest data for weather outlook for selected Philippine cities
-    ingest_weather_outlook_for_ph_cities()
-    generate_logs(
-        '(DEV): Ingest the data for the weather outlook for selected Philippine cities.'
+    parser.add_argument(
+        '--concurrent',
+        action='store_true',
+        default=os.environ.get('PAGASA_CONCURRENT', '') == '1',
+        help='run the ingest jobs at the same time using a thread pool'
     )
-
-    # Ingest data for weather outlook for selected Philippine tourist areas
-    ingest_weather_outlook_for_ph_tourist_areas()
-    generate_logs(
-        '(DEV): Ingest the data for the weather outlook for selected Philippine tourist areas.'
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=MAX_WORKERS,
+        help='maximum number of ingest jobs to run at the same time'
     )
-
-    # Ingest data for the weather advisory
-    ingest_weather_advisory()
-    generate_logs(
-        '(DEV): Ingest the data for the weather advisory'
+    parser.add_argument(
+        '--profile',
+        nargs='+',
+        choices=SUPPORTED_PROFILE_MODES,
+        default=[],
+        help='profile each ingest job and write the profiles to src/logs/profiles'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        default=os.environ.get('PAGASA_DAEMON', '') == '1',
+        help='keep running and poll each dataset on its own interval'
+    )
+    parser.add_argument(
+        '--backfill',
+        action='store_true',
+        help='crawl the tropical cyclone associated rainfalls of every year that is not complete'
+    )
+    parser.add_argument(
+        '--extract-stage',
+        action='store_true',
+        default=os.environ.get('PAGASA_RUN_EXTRACT_STAGE', '') == '1',
+        help='stage the new or changed raw files to data/stage after ingesting'
+    )
+    parser.add_argument(
+        '--transform-stage',
+        action='store_true',
+        default=os.environ.get('PAGASA_RUN_TRANSFORM_STAGE', '') == '1',
+        help='transform the staged datasets into numeric tables in data/transform'
     )
+    parser.add_argument(
+        '--download-stage',
+        action='store_true',
+        default=os.environ.get('PAGASA_RUN_DOWNLOAD_STAGE', '') == '1',
+        help='download the new rainfall maps to the content addressed store in data/images'
+    )
+    parser.add_argument(
+        '--include-history',
+        action='store_true',
+        help='also transform every archived snapshot of the history store'
+    )
+    args = parser.parse_args()
+
+    # We need to check if one-off jobs were asked for together with the daemon, which would never run them
+    if args.daemon and (args.backfill or args.download_stage):
+        parser.error('--backfill and --download-stage can\'t be combined with --daemon, run them without it')
+
+    # Keep polling in this process until it is stopped
+    if args.daemon:
+        run_daemon(
+            concurrent=args.concurrent,
+            max_workers=args.max_workers,
+            profile_modes=tuple(args.profile),
+            extract_stage=args.extract_stage,
+            transform_stage=args.transform_stage,
+            include_history=args.include_history
+        )
+        sys.exit(0)
 
-    # Ingest data for the tropical cyclone advisory
-    ingest_tropical_cyclone_advisory()
-    generate_logs(
-        '(DEV): Ingests the data for the tropical cyclone advisory'
+    # Ingest data for all datasets from the PAGASA-DOST website
+    all_jobs_succeeded = run_ingest_jobs(
+        concurrent=args.concurrent,
+        max_workers=args.max_workers,
+        profile_modes=tuple(args.profile)
     )
 
-    # Ingest data for the tropical cyclone associated rainfall
-    ingest_tropical_cyclone_associated_rainfall()
-    generate_logs(
-        '(DEV): Ingest the data for the tropical cyclone associated rainfall'
-    )
\ No newline at end of file
+    if args.backfill:
+        all_jobs_succeeded = run_backfill() and all_jobs_succeeded
+
+    # Download the rainfall maps after the backfill so the maps of every year are included
+    if args.download_stage:
+        all_jobs_succeeded = run_download_stage() and all_jobs_succeeded
+
+    # Stage only what the ingest jobs changed
+    if args.extract_stage:
+        all_jobs_succeeded = run_extract_stage() and all_jobs_succeeded
+
+    if args.transform_stage:
+        all_jobs_succeeded = run_transform_stage(args.include_history) and all_jobs_succeeded
+
+    if not all_jobs_succeeded:
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1 @@
+from . import timing
\ No newline at end of file
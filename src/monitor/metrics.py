@@ -0,0 +1,501 @@
+'''
+    Module for exposing the metrics of the ingest
+    jobs in the Prometheus text exposition format,
+    written to a file that the textfile collector
+    of the node exporter can scrape.
+'''
+import os
+import json
+import time
+import threading
+
+# File locking is only available on POSIX systems
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
+from monitor.timing import add_span_observer
+from monitor.timing import current_dataset
+
+# Metrics settings (can be overridden using environment variables)
+USE_METRICS = os.environ.get('PAGASA_USE_METRICS', '1') == '1'
+METRICS_FILEPATH = os.environ.get('PAGASA_METRICS_FILEPATH', 'src/logs/metrics/pagasa.prom')
+METRICS_STATE_FILEPATH = os.environ.get('PAGASA_METRICS_STATE_FILEPATH', 'data/cache/metrics_state.json')
+RAW_SUBDIR = os.environ.get('PAGASA_RAW_SUBDIR', 'data/raw')
+
+# Upper bounds in seconds of the buckets of the duration histograms
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Statuses of a job span that count as a successful run, since a skipped page is up to date
+SUCCESS_STATUSES = ('ok', 'PageNotModified', 'PageUnchanged')
+
+# Metrics with their type and help text, in the order they are written
+METRICS = {
+    'pagasa_fetch_duration_seconds': (
+        'histogram',
+        'Time to fetch a page from the PAGASA-DOST website.'
+    ),
+    'pagasa_fetch_queue_wait_seconds': (
+        'histogram',
+        'Time a fetch waited for a free slot under the concurrency cap and rate limit of its host.'
+    ),
+    'pagasa_http_responses_total': (
+        'counter',
+        'HTTP responses from the PAGASA-DOST website by status code.'
+    ),
+    'pagasa_fetch_errors_total': (
+        'counter',
+        'Fetches from the PAGASA-DOST website that failed without a response.'
+    ),
+    'pagasa_response_bytes_total': (
+        'counter',
+        'Bytes of the response bodies from the PAGASA-DOST website.'
+    ),
+    'pagasa_parse_duration_seconds': (
+        'histogram',
+        'Time to parse a page into a BeautifulSoup object.'
+    ),
+    'pagasa_records_extracted': (
+        'gauge',
+        'Records extracted by the last run of an ingest job, such as cities, tourist areas or forecast places.'
+    ),
+    'pagasa_file_bytes_written_total': (
+        'counter',
+        'Bytes of the files written to data/raw by the ingest jobs.'
+    ),
+    'pagasa_job_runs_total': (
+        'counter',
+        'Runs of the ingest jobs by status.'
+    ),
+    'pagasa_job_duration_seconds': (
+        'gauge',
+        'Duration of the last run of an ingest job.'
+    ),
+    'pagasa_last_success_timestamp_seconds': (
+        'gauge',
+        'Unix time of the last successful run of an ingest job.'
+    )
+}
+
+# Values recorded by this process that are not written yet, by metric name and labels
+_pending_metrics = {}
+_metrics_lock = threading.Lock()
+
+def get_labels_key(
+        labels: dict[str, str]
+) -> str:
+    '''
+    Turns labels into a key that is the same for
+    the same labels in any order.
+
+    :param labels: Labels of a sample, such as
+        {'url': '...'}
+    :type labels: dict[str, str]
+
+    :return: JSON array of the sorted labels
+    :rtype: str
+    '''
+    return json.dumps(sorted((name, str(value)) for name, value in labels.items()))
+
+def increment_counter(
+        name: str,
+        labels: dict[str, str],
+        amount: float = 1
+) -> None:
+    '''
+    Adds an amount to a counter.
+
+    :param name: Name of the metric
+    :type name: str
+
+    :param labels: Labels of the sample
+    :type labels: dict[str, str]
+
+    :param amount: Amount to add
+    :type amount: float
+    '''
+    labels_key = get_labels_key(labels)
+
+    with _metrics_lock:
+        samples = _pending_metrics.setdefault(name, {})
+        samples[labels_key] = samples.get(labels_key, 0) + amount
+
+def set_gauge(
+        name: str,
+        labels: dict[str, str],
+        value: float
+) -> None:
+    '''
+    Sets the value of a gauge.
+
+    :param name: Name of the metric
+    :type name: str
+
+    :param labels: Labels of the sample
+    :type labels: dict[str, str]
+
+    :param value: New value of the gauge
+    :type value: float
+    '''
+    labels_key = get_labels_key(labels)
+
+    with _metrics_lock:
+        _pending_metrics.setdefault(name, {})[labels_key] = value
+
+def observe_histogram(
+        name: str,
+        labels: dict[str, str],
+        value: float
+) -> None:
+    '''
+    Adds a value to a histogram, counting it in
+    every bucket whose upper bound it fits under.
+
+    :param name: Name of the metric
+    :type name: str
+
+    :param labels: Labels of the sample
+    :type labels: dict[str, str]
+
+    :param value: Observed value, such as a
+        duration in seconds
+    :type value: float
+    '''
+    labels_key = get_labels_key(labels)
+
+    with _metrics_lock:
+        histogram = _pending_metrics.setdefault(name, {}).setdefault(
+            labels_key,
+            {'buckets': [0] * len(DURATION_BUCKETS), 'sum': 0, 'count': 0}
+        )
+
+        for index, upper_bound in enumerate(DURATION_BUCKETS):
+            if value <= upper_bound:
+                histogram['buckets'][index] += 1
+
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+def observe_records(
+        number_of_records: int
+) -> None:
+    '''
+    Records how many records the ingest job running
+    in the current thread extracted, such as the
+    number of cities, tourist areas or forecast
+    places.
+
+    :param number_of_records: Number of records
+    :type number_of_records: int
+    '''
+    # We need to check if metrics are turned off so nothing is recorded
+    if not USE_METRICS:
+        return
+
+    set_gauge('pagasa_records_extracted', {'dataset': current_dataset()}, number_of_records)
+
+def get_bytes_written(
+        dataset: str,
+        since: float
+) -> int:
+    '''
+    Sums the sizes of the files of a dataset in the
+    data/raw subdirectory that were written since
+    a point in time.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :param since: Unix time to count files from
+    :type since: float
+
+    :return: Number of bytes written
+    :rtype: int
+    '''
+    dataset_subdir = os.path.join(RAW_SUBDIR, dataset)
+
+    # We need to check if the job has its own subdirectory, which the ETL stages don't
+    if not os.path.isdir(dataset_subdir):
+        return 0
+
+    bytes_written = 0
+
+    with os.scandir(dataset_subdir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+
+            stat_result = entry.stat()
+            if stat_result.st_mtime >= since:
+                bytes_written += stat_result.st_size
+
+    return bytes_written
+
+def observe_span(
+        span: dict
+) -> None:
+    '''
+    Turns a finished timing span into metrics: fetch
+    spans into fetch durations, queue waits, status
+    codes and response bytes, parse spans into parse
+    durations and job spans into runs, durations,
+    bytes written and last-success timestamps.
+
+    :param span: Span recorded by timing_span()
+    :type span: dict
+    '''
+    stage = span['stage']
+    duration_seconds = span['duration_seconds']
+
+    if stage == 'fetch':
+        url = span.get('url', '')
+        observe_histogram('pagasa_fetch_duration_seconds', {'url': url}, duration_seconds)
+        observe_histogram('pagasa_fetch_queue_wait_seconds', {'url': url}, span.get('queue_wait_seconds', 0))
+
+        # We need to check if the fetch failed before there was a response
+        if 'status_code' not in span:
+            increment_counter('pagasa_fetch_errors_total', {'url': url, 'error': span['status']})
+            return
+
+        increment_counter('pagasa_http_responses_total', {'url': url, 'status_code': span['status_code']})
+        increment_counter('pagasa_response_bytes_total', {'url': url}, span.get('response_bytes', 0))
+
+    elif stage == 'parse':
+        observe_histogram(
+            'pagasa_parse_duration_seconds',
+            {'dataset': span['dataset'], 'html_parser': span.get('html_parser', '')},
+            duration_seconds
+        )
+
+    elif stage == 'job':
+        dataset = span['dataset']
+        finished_at = time.time()
+
+        increment_counter('pagasa_job_runs_total', {'dataset': dataset, 'status': span['status']})
+        set_gauge('pagasa_job_duration_seconds', {'dataset': dataset}, duration_seconds)
+
+        if span['status'] == 'ok':
+            increment_counter(
+                'pagasa_file_bytes_written_total',
+                {'dataset': dataset},
+                get_bytes_written(dataset, finished_at - duration_seconds)
+            )
+
+        if span['status'] in SUCCESS_STATUSES:
+            set_gauge('pagasa_last_success_timestamp_seconds', {'dataset': dataset}, round(finished_at, 3))
+
+def merge_metrics(
+        metrics: dict,
+        pending_metrics: dict
+) -> None:
+    '''
+    Merges the values recorded by this process into
+    the metrics of earlier runs: counters and
+    histograms are added up and gauges are replaced.
+
+    :param metrics: Metrics of earlier runs, which
+        are updated in place
+    :type metrics: dict
+
+    :param pending_metrics: Values recorded by this
+        process
+    :type pending_metrics: dict
+    '''
+    for name, samples in pending_metrics.items():
+        metric_type = METRICS[name][0]
+        merged_samples = metrics.setdefault(name, {})
+
+        for labels_key, value in samples.items():
+            previous_value = merged_samples.get(labels_key)
+
+            if metric_type == 'gauge' or previous_value is None:
+                merged_samples[labels_key] = value
+
+            elif metric_type == 'counter':
+                merged_samples[labels_key] = previous_value + value
+
+            # We need to check if the buckets of an earlier run are still the same
+            elif len(previous_value['buckets']) != len(value['buckets']):
+                merged_samples[labels_key] = value
+
+            else:
+                merged_samples[labels_key] = {
+                    'buckets': [a + b for a, b in zip(previous_value['buckets'], value['buckets'])],
+                    'sum': previous_value['sum'] + value['sum'],
+                    'count': previous_value['count'] + value['count']
+                }
+
+def format_labels(
+        labels: list,
+        **extra_labels
+) -> str:
+    '''
+    Formats labels as they are written in the
+    Prometheus text exposition format, escaping
+    backslashes, double quotes and line feeds.
+
+    :param labels: Sorted [name, value] pairs
+    :type labels: list
+
+    :param extra_labels: Labels to add at the end,
+        such as the upper bound of a bucket
+    :type extra_labels: dict
+
+    :return: Labels such as {url="...",le="0.5"}
+    :rtype: str
+    '''
+    all_labels = list(labels) + list(extra_labels.items())
+
+    # We need to check if there are any labels so no empty braces are written
+    if all_labels == []:
+        return ''
+
+    formatted_labels = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        )
+        for name, value in all_labels
+    )
+
+    return '{' + formatted_labels + '}'
+
+def format_value(
+        value: float
+) -> str:
+    '''
+    Formats a sample value, writing whole numbers
+    without a fraction.
+
+    :param value: Value of a sample
+    :type value: float
+
+    :return: Formatted value
+    :rtype: str
+    '''
+    if float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
+
+def render_metrics(
+        metrics: dict
+) -> str:
+    '''
+    Renders metrics in the Prometheus text
+    exposition format.
+
+    :param metrics: Metrics by name and labels key
+    :type metrics: dict
+
+    :return: Text of the metrics file
+    :rtype: str
+    '''
+    lines = []
+
+    for name, (metric_type, help_text) in METRICS.items():
+        samples = metrics.get(name)
+
+        # We need to check if the metric was ever recorded
+        if not samples:
+            continue
+
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+
+        for labels_key in sorted(samples):
+            labels = json.loads(labels_key)
+            value = samples[labels_key]
+
+            if metric_type != 'histogram':
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+                continue
+
+            for upper_bound, bucket_count in zip(DURATION_BUCKETS, value['buckets']):
+                lines.append(f'{name}_bucket{format_labels(labels, le=format_value(upper_bound))} {bucket_count}')
+
+            lines.append(f'{name}_bucket{format_labels(labels, le="+Inf")} {value["count"]}')
+            lines.append(f'{name}_sum{format_labels(labels)} {format_value(round(value["sum"], 6))}')
+            lines.append(f'{name}_count{format_labels(labels)} {value["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+def write_file_atomically(
+        filepath: str,
+        text: str
+) -> None:
+    '''
+    Writes a text file through a temporary file so
+    the node exporter never scrapes a half-written
+    file.
+
+    :param filepath: Path of the file
+    :type filepath: str
+
+    :param text: Text to write
+    :type text: str
+    '''
+    subdir = os.path.dirname(filepath)
+    if subdir and not os.path.exists(subdir):
+        os.makedirs(subdir, exist_ok=True)
+
+    temporary_filepath = f'{filepath}.{os.getpid()}.tmp'
+
+    with open(temporary_filepath, 'w') as temporary_file:
+        temporary_file.write(text)
+
+    os.replace(temporary_filepath, filepath)
+
+def write_metrics(
+) -> None:
+    '''
+    Merges the metrics recorded by this process with
+    those of earlier runs and writes them to the
+    metrics file. Counters keep counting across runs
+    and last-success timestamps survive runs in which
+    a job failed, since the values are kept in a
+    state file next to the other caches.
+    '''
+    # We need to check if metrics are turned off so nothing is written
+    if not USE_METRICS:
+        return
+
+    with _metrics_lock:
+        pending_metrics = dict(_pending_metrics)
+        _pending_metrics.clear()
+
+    state_subdir = os.path.dirname(METRICS_STATE_FILEPATH)
+    if state_subdir and not os.path.exists(state_subdir):
+        os.makedirs(state_subdir, exist_ok=True)
+
+    # Lock the state so several runners don't lose each other's values
+    lock_descriptor = os.open(f'{METRICS_STATE_FILEPATH}.lock', os.O_WRONLY | os.O_CREAT, 0o644)
+
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_descriptor, fcntl.LOCK_EX)
+
+        metrics = {}
+        if os.path.exists(METRICS_STATE_FILEPATH):
+            with open(METRICS_STATE_FILEPATH, 'r') as state_file:
+                metrics = json.load(state_file)
+
+        # Leave out metrics that are no longer written
+        metrics = {name: samples for name, samples in metrics.items() if name in METRICS}
+        merge_metrics(metrics, pending_metrics)
+
+        write_file_atomically(METRICS_STATE_FILEPATH, json.dumps(metrics))
+        write_file_atomically(METRICS_FILEPATH, render_metrics(metrics))
+
+    finally:
+        if fcntl is not None:
+            fcntl.flock(lock_descriptor, fcntl.LOCK_UN)
+
+        os.close(lock_descriptor)
+
+# Feed the metrics from the timing spans of every ingest job
+if USE_METRICS:
+    add_span_observer(observe_span)
@@ -0,0 +1,193 @@
+'''
+    Module for profiling the ingest jobs with cProfile
+    and tracemalloc, so a single slow run can be
+    inspected without changing any code.
+'''
+import os
+import io
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime
+from functools import wraps
+from typing import Callable
+
+# Profilers to run: any of 'cprofile' and 'tracemalloc', separated by commas
+PROFILE_MODES = tuple(
+    mode.strip()
+    for mode in os.environ.get('PAGASA_PROFILE', '').lower().split(',')
+    if mode.strip()
+)
+
+SUPPORTED_PROFILE_MODES = ['cprofile', 'tracemalloc']
+
+PROFILES_SUBDIR = os.environ.get('PAGASA_PROFILES_SUBDIR', 'src/logs/profiles')
+PROFILE_TOP_N = int(os.environ.get('PAGASA_PROFILE_TOP_N', '25'))
+
+# Both profilers see the whole process, so profiled jobs run one at a time
+_profile_lock = threading.Lock()
+_profile_state = threading.local()
+
+def run_profiled(
+        function: Callable,
+        profile_modes: tuple[str, ...],
+        *args,
+        **kwargs
+):
+    '''
+    Runs a function under cProfile and/or tracemalloc
+    and writes a .prof file and a top-N allocation
+    report named after the function to the profiles
+    subdirectory.
+
+    :param function: Function to profile, such as
+        an ingest job
+    :type function: Callable
+
+    :param profile_modes: Profilers to run, any of
+        'cprofile' and 'tracemalloc'
+    :type profile_modes: tuple[str, ...]
+
+    :return: Return value of the function
+    '''
+    unknown_profile_modes = set(profile_modes) - set(SUPPORTED_PROFILE_MODES)
+    if unknown_profile_modes:
+        raise ValueError(f'Unknown profile modes: {", ".join(sorted(unknown_profile_modes))}')
+
+    # We need to check if the job is already profiled, such as by both PAGASA_PROFILE and --profile
+    if getattr(_profile_state, 'active', False):
+        return function(*args, **kwargs)
+
+    os.makedirs(PROFILES_SUBDIR, exist_ok=True)
+
+    with _profile_lock:
+        _profile_state.active = True
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        profile_filepath = os.path.join(PROFILES_SUBDIR, f'{function.__name__}_{timestamp}')
+
+        profiler = cProfile.Profile() if 'cprofile' in profile_modes else None
+        trace_memory = 'tracemalloc' in profile_modes and not tracemalloc.is_tracing()
+
+        if trace_memory:
+            tracemalloc.start()
+
+        if profiler is not None:
+            profiler.enable()
+
+        try:
+            return function(*args, **kwargs)
+
+        finally:
+            _profile_state.active = False
+
+            # Write the profiles even if the job failed, since failures are often what is slow
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(f'{profile_filepath}.prof')
+
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                write_allocation_report(
+                    f'{profile_filepath}_allocations.txt',
+                    function.__name__,
+                    snapshot,
+                    current,
+                    peak
+                )
+
+def write_allocation_report(
+        report_filepath: str,
+        function_name: str,
+        snapshot: tracemalloc.Snapshot,
+        current: int,
+        peak: int
+) -> None:
+    '''
+    Writes the top-N lines of code by allocated
+    memory of a tracemalloc snapshot to a text file.
+
+    :param report_filepath: Path of the report
+    :type report_filepath: str
+
+    :param function_name: Name of the profiled
+        function
+    :type function_name: str
+
+    :param snapshot: Snapshot taken when the function
+        finished
+    :type snapshot: tracemalloc.Snapshot
+
+    :param current: Bytes still allocated when the
+        function finished
+    :type current: int
+
+    :param peak: Peak bytes allocated while the
+        function ran
+    :type peak: int
+    '''
+    # Leave out the allocations of the profilers themselves
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>')
+    ])
+
+    buffer = io.StringIO()
+    buffer.write(f'Allocations of {function_name}\n')
+    buffer.write(f'Current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB\n\n')
+    buffer.write(f'Top {PROFILE_TOP_N} lines by allocated memory:\n')
+
+    for statistic in snapshot.statistics('lineno')[:PROFILE_TOP_N]:
+        buffer.write(f'{statistic}\n')
+
+    with open(report_filepath, 'w') as report_file:
+        report_file.write(buffer.getvalue())
+
+def profile_job(
+        ingest_job: Callable,
+        profile_modes: tuple[str, ...]
+) -> Callable:
+    '''
+    Wraps an ingest job so every run of it is
+    profiled with the given profilers.
+
+    :param ingest_job: Ingest job to profile
+    :type ingest_job: Callable
+
+    :param profile_modes: Profilers to run, any of
+        'cprofile' and 'tracemalloc'
+    :type profile_modes: tuple[str, ...]
+
+    :return: Profiled ingest job
+    :rtype: Callable
+    '''
+    @wraps(ingest_job)
+    def wrapper(*args, **kwargs):
+        return run_profiled(ingest_job, profile_modes, *args, **kwargs)
+
+    return wrapper
+
+def profiled(
+        ingest_job: Callable
+) -> Callable:
+    '''
+    Decorates an ingest job so it runs under the
+    profilers set in PAGASA_PROFILE. The setting is
+    read once at import time, and without it the
+    ingest job is returned as it is, so profiling
+    adds no overhead when it is turned off.
+
+    :param ingest_job: Ingest job to profile
+    :type ingest_job: Callable
+
+    :return: Profiled ingest job, or the ingest job
+        itself if profiling is turned off
+    :rtype: Callable
+    '''
+    if not PROFILE_MODES:
+        return ingest_job
+
+    return profile_job(ingest_job, PROFILE_MODES)
@@ -0,0 +1,196 @@
+'''
+    Module for recording timing spans of the fetch,
+    parse, extract and save stages of the ingest
+    jobs that process data from the PAGASA-DOST
+    website.
+'''
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Iterator
+
+# Timing span settings (can be overridden using environment variables)
+USE_TIMING_SPANS = os.environ.get('PAGASA_USE_TIMING_SPANS', '1') == '1'
+SPANS_FILEPATH = os.environ.get('PAGASA_SPANS_FILEPATH', 'src/logs/spans.jsonl')
+
+# Dataset of the ingest job running in the current thread
+_current_dataset = contextvars.ContextVar('current_dataset', default='')
+
+_pending_spans = []
+_spans_lock = threading.Lock()
+
+# Functions called with every finished span, such as the metrics of the runner
+_span_observers = []
+
+def add_span_observer(
+        observer: Callable[[dict], None]
+) -> None:
+    '''
+    Registers a function that is called with every
+    span once it finishes, before it is written.
+
+    :param observer: Function that takes a span
+    :type observer: Callable[[dict], None]
+    '''
+    if observer not in _span_observers:
+        _span_observers.append(observer)
+
+def current_dataset(
+) -> str:
+    '''
+    Returns the dataset of the ingest job running
+    in the current thread.
+
+    :return: Name of the dataset, or an empty
+        string outside of an ingest job
+    :rtype: str
+    '''
+    return _current_dataset.get()
+
+@contextmanager
+def timing_span(
+        stage: str,
+        **attributes
+) -> Iterator[dict]:
+    '''
+    Times the code inside the with block and
+    records it as a span of the ingest job
+    running in the current thread. The span
+    observers, such as the metrics, get every span
+    even if writing the spans file is turned off.
+
+    :param stage: Stage of the ingest job, such
+        as fetch, parse, extract or save
+    :type stage: str
+
+    :param attributes: Extra values to record
+        with the span
+    :type attributes: dict
+
+    :return: Dictionary of span attributes that
+        the with block can add values to
+    :rtype: Iterator[dict]
+    '''
+    span_attributes = dict(attributes)
+    started_at = datetime.now()
+    start = time.perf_counter()
+    status = 'ok'
+
+    try:
+        yield span_attributes
+
+    except BaseException as error:
+        # Record the name of the exception as the status of the span
+        status = type(error).__name__
+        raise
+
+    finally:
+        span = {
+            'timestamp': started_at.strftime('%Y-%m-%d %H:%M:%S.%f'),
+            'dataset': _current_dataset.get(),
+            'stage': stage,
+            'duration_seconds': round(time.perf_counter() - start, 6),
+            'status': status
+        }
+        span.update(span_attributes)
+
+        # We need to check if timing spans are turned off so nothing is written to the spans file
+        if USE_TIMING_SPANS:
+            with _spans_lock:
+                _pending_spans.append(span)
+
+        for observer in _span_observers:
+            observer(span)
+
+def timed_call(
+        stage: str,
+        function: Callable,
+        *args,
+        **kwargs
+):
+    '''
+    Calls a function of an ingest module inside
+    a timing span named after the function.
+
+    :param stage: Stage of the ingest job, such
+        as extract or save
+    :type stage: str
+
+    :param function: Function to call
+    :type function: Callable
+
+    :return: Return value of the function
+    '''
+    with timing_span(stage, function=function.__name__):
+        return function(*args, **kwargs)
+
+def timed_job(
+        dataset: str
+) -> Callable:
+    '''
+    Decorates an ingest job so it runs inside a
+    timing span for its dataset. All spans recorded
+    while the job runs are tagged with the dataset
+    and written once the job finishes.
+
+    :param dataset: Name of the dataset that the
+        ingest job processes
+    :type dataset: str
+
+    :return: Decorator for the ingest job
+    :rtype: Callable
+    '''
+    def decorator(
+            ingest_job: Callable
+    ) -> Callable:
+        @wraps(ingest_job)
+        def wrapper(*args, **kwargs):
+            token = _current_dataset.set(dataset)
+
+            try:
+                with timing_span('job', function=ingest_job.__name__):
+                    return ingest_job(*args, **kwargs)
+
+            finally:
+                _current_dataset.reset(token)
+                flush_spans()
+
+        return wrapper
+
+    return decorator
+
+def flush_spans(
+) -> None:
+    '''
+    Appends all recorded timing spans as JSON lines
+    to the spans file next to the logs dataset.
+    '''
+    with _spans_lock:
+        # We need to check if there is anything to write
+        if _pending_spans == []:
+            return
+
+        lines = ''.join(json.dumps(span) + '\n' for span in _pending_spans)
+        _pending_spans.clear()
+
+    spans_subdir = os.path.dirname(SPANS_FILEPATH)
+    if spans_subdir and not os.path.exists(spans_subdir):
+        os.makedirs(spans_subdir, exist_ok=True)
+
+    # A single append keeps lines from concurrent jobs and processes whole
+    file_descriptor = os.open(
+        SPANS_FILEPATH,
+        os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+        0o644
+    )
+
+    try:
+        os.write(file_descriptor, lines.encode('utf-8'))
+
+    finally:
+        os.close(file_descriptor)
\ No newline at end of file
@@ -0,0 +1 @@
+from . import parse
\ No newline at end of file
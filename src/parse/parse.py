@@ -0,0 +1,193 @@
+'''
+    Module for parsing pages from the PAGASA-DOST
+    website into BeautifulSoup objects using a
+    configurable HTML parser backend.
+'''
+import os
+import warnings
+from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from monitor.timing import timing_span
+
+# HTML parser backend to use: 'html.parser', 'lxml' or 'selectolax'
+HTML_PARSER = os.environ.get('PAGASA_HTML_PARSER', 'html.parser')
+
+SUPPORTED_HTML_PARSERS = ['html.parser', 'lxml', 'selectolax']
+
+# Tags that no extractor reads and that the selectolax backend drops before building the tree
+TAGS_TO_STRIP = ['script', 'style', 'noscript', 'template']
+
+_resolved_html_parsers = {}
+
+def is_html_parser_available(
+        html_parser: str
+) -> bool:
+    '''
+    Checks if the package of an HTML parser
+    backend is installed.
+
+    :param html_parser: Name of the HTML parser
+        backend
+    :type html_parser: str
+
+    :return: True if the HTML parser backend can
+        be used, otherwise False
+    :rtype: bool
+    '''
+    # Python's built-in parser is always available
+    if html_parser == 'html.parser':
+        return True
+
+    try:
+        if html_parser == 'lxml':
+            import lxml
+
+        elif html_parser == 'selectolax':
+            import selectolax.lexbor
+
+        else:
+            return False
+
+    except ImportError:
+        return False
+
+    return True
+
+def resolve_html_parser(
+        html_parser: str | None = None
+) -> str:
+    '''
+    Resolves the HTML parser backend to use,
+    falling back to html.parser if the requested
+    backend isn't installed.
+
+    :param html_parser: Name of the requested HTML
+        parser backend, or None to use the
+        PAGASA_HTML_PARSER setting
+    :type html_parser: str | None
+
+    :return: Name of the HTML parser backend to use
+    :rtype: str
+    '''
+    if html_parser is None:
+        html_parser = HTML_PARSER
+
+    # Resolve each requested backend only once since import checks aren't free
+    if html_parser not in _resolved_html_parsers:
+        resolved_html_parser = html_parser
+
+        if html_parser not in SUPPORTED_HTML_PARSERS:
+            warnings.warn(f'Unknown HTML parser {html_parser!r}, falling back to html.parser')
+            resolved_html_parser = 'html.parser'
+
+        elif not is_html_parser_available(html_parser):
+            warnings.warn(f'HTML parser {html_parser!r} is not installed, falling back to html.parser')
+            resolved_html_parser = 'html.parser'
+
+        _resolved_html_parsers[html_parser] = resolved_html_parser
+
+    return _resolved_html_parsers[html_parser]
+
+def make_soup_strainer(
+        regions: list[tuple[str, str]]
+) -> SoupStrainer:
+    '''
+    Creates a SoupStrainer that only keeps the
+    regions of a page that the extractors read.
+
+    :param regions: List of (tag name, class
+        attribute) pairs of the regions to keep
+    :type regions: list[tuple[str, str]]
+
+    :return: SoupStrainer for the regions
+    :rtype: SoupStrainer
+    '''
+    list_of_all_tag_names = list(dict.fromkeys(tag_name for tag_name, _ in regions))
+    list_of_all_class_attributes = list(dict.fromkeys(class_attribute for _, class_attribute in regions))
+
+    # Match the whole class attribute the same way the extractors' find() calls do
+    return SoupStrainer(
+        list_of_all_tag_names,
+        attrs={
+            'class': list_of_all_class_attributes
+        }
+    )
+
+def make_css_selector(
+        regions: list[tuple[str, str]]
+) -> str:
+    '''
+    Creates a CSS selector that matches the
+    regions of a page that the extractors read.
+
+    :param regions: List of (tag name, class
+        attribute) pairs of the regions to keep
+    :type regions: list[tuple[str, str]]
+
+    :return: CSS selector for the regions
+    :rtype: str
+    '''
+    # Use exact attribute matching the same way the extractors' find() calls do
+    return ', '.join(
+        f'{tag_name}[class="{class_attribute}"]'
+        for tag_name, class_attribute in regions
+    )
+
+def make_beautiful_soup_object(
+        markup: str,
+        regions: list[tuple[str, str]] | None = None,
+        html_parser: str | None = None
+) -> BeautifulSoup:
+    '''
+    Parses the HTML of a PAGASA-DOST page as a
+    BeautifulSoup object using the configured
+    HTML parser backend. Every backend produces
+    a tree that the extractors read the same way.
+
+    :param markup: HTML content of the page
+    :type markup: str
+
+    :param regions: List of (tag name, class
+        attribute) pairs of the only regions to
+        build, or None to build the whole page
+    :type regions: list[tuple[str, str]] | None
+
+    :param html_parser: Name of the HTML parser
+        backend, or None to use the PAGASA_HTML_PARSER
+        setting
+    :type html_parser: str | None
+
+    :return: BeautifulSoup object for navigating
+        and manipulating the page content
+    :rtype: BeautifulSoup
+    '''
+    html_parser = resolve_html_parser(html_parser)
+
+    # Record how long it takes to construct the BeautifulSoup object
+    with timing_span('parse', html_parser=html_parser, markup_length=len(markup)):
+        if html_parser != 'selectolax':
+            # We need to check if only some regions of the page have to be built
+            if regions is None:
+                return BeautifulSoup(markup, html_parser)
+
+            return BeautifulSoup(
+                markup,
+                html_parser,
+                parse_only=make_soup_strainer(regions)
+            )
+
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(markup)
+
+        # Let lexbor select the regions, or drop the heavy script and style sections
+        if regions is not None:
+            markup = ''.join(node.html for node in tree.css(make_css_selector(regions)))
+
+        else:
+            tree.strip_tags(TAGS_TO_STRIP)
+            markup = tree.html
+
+        # Build the tree from the smaller document with the fastest tree builder installed
+        tree_builder = 'lxml' if is_html_parser_available('lxml') else 'html.parser'
+        return BeautifulSoup(markup, tree_builder)
\ No newline at end of file
@@ -0,0 +1,16 @@
+import importlib
+
+# Modules are only imported when they are first used, so running one job doesn't import the sinks it doesn't use
+__all__ = [
+    'snapshot',
+    'parquet',
+    'history',
+    'sqlite',
+    'images'
+]
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,341 @@
+'''
+    Module for keeping every published snapshot of
+    a dataset in a history store partitioned by its
+    issued datetime, with a sorted index per dataset
+    for fast "latest" and "as of" lookups.
+'''
+import os
+import re
+import json
+import uuid
+import bisect
+import shutil
+import threading
+import warnings
+from datetime import datetime
+from datetime import timedelta
+from storage.snapshot import publish_snapshot
+
+# File locking is only available on POSIX systems
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
+# History store settings (can be overridden using environment variables)
+USE_HISTORY_STORE = os.environ.get('PAGASA_USE_HISTORY_STORE', '1') == '1'
+HISTORY_SUBDIR = os.environ.get('PAGASA_HISTORY_SUBDIR', 'data/history')
+
+# Issued datetimes look like "Issued at: 4:00 AM, 06 December 2025"
+ISSUED_DATETIME_PATTERN = re.compile(
+    r'(\d{1,2}:\d{2})\s*([AP]M)\D*?(\d{1,2})\s+([A-Za-z]+)\s+(\d{4})',
+    re.IGNORECASE
+)
+
+# Valid periods look like "Valid Beginning: 8:00 AM today until 8:00 AM tomorrow"
+VALID_PERIOD_PATTERN = re.compile(
+    r'(\d{1,2}:\d{2})\s*([AP]M)\s+(today|tomorrow)\s+until\s+(\d{1,2}:\d{2})\s*([AP]M)\s+(today|tomorrow)',
+    re.IGNORECASE
+)
+
+# Format of the partition of each snapshot, such as 2025/12/06/0400
+PARTITION_FORMAT = '%Y/%m/%d/%H%M'
+
+_index_lock = threading.Lock()
+
+def parse_issued_datetime(
+        issued_datetime: str | None
+) -> datetime | None:
+    '''
+    Parses the issued datetime scraped from a page,
+    such as "Issued at: 8:00 AM 06 December 2025".
+
+    :param issued_datetime: Issued datetime scraped
+        from the page
+    :type issued_datetime: str | None
+
+    :return: Parsed issued datetime, or None if it is
+        in an unknown format
+    :rtype: datetime | None
+    '''
+    if issued_datetime is None:
+        return None
+
+    match = ISSUED_DATETIME_PATTERN.search(issued_datetime)
+
+    # We need to check if the issued datetime is in an unknown format
+    if match is None:
+        return None
+
+    time, meridiem, day, month, year = match.groups()
+
+    try:
+        return datetime.strptime(
+            f'{time} {meridiem.upper()} {day} {month} {year}',
+            '%I:%M %p %d %B %Y'
+        )
+
+    except ValueError:
+        return None
+
+def parse_valid_period(
+        valid_period: str | None,
+        issued_at: datetime
+) -> tuple[datetime | None, datetime | None]:
+    '''
+    Parses a valid period such as "Valid Beginning:
+    8:00 AM today until 8:00 AM tomorrow" into
+    datetimes relative to the issued datetime.
+
+    :param valid_period: Valid period scraped from
+        the page
+    :type valid_period: str | None
+
+    :param issued_at: Parsed issued datetime of the
+        page
+    :type issued_at: datetime
+
+    :return: Start and end of the valid period, or
+        None for both if it is in an unknown format
+    :rtype: tuple[datetime | None, datetime | None]
+    '''
+    if valid_period is None:
+        return None, None
+
+    match = VALID_PERIOD_PATTERN.search(valid_period)
+
+    # We need to check if the valid period is in an unknown format
+    if match is None:
+        return None, None
+
+    start_time, start_meridiem, start_day, end_time, end_meridiem, end_day = match.groups()
+
+    def resolve(time: str, meridiem: str, day: str) -> datetime:
+        clock = datetime.strptime(f'{time} {meridiem.upper()}', '%I:%M %p')
+        resolved = issued_at.replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+
+        return resolved + timedelta(days=1) if day.lower() == 'tomorrow' else resolved
+
+    return resolve(start_time, start_meridiem, start_day), resolve(end_time, end_meridiem, end_day)
+
+def get_index_filepath(
+        dataset: str
+) -> str:
+    '''
+    Returns the path of the history index of a
+    dataset.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :return: Path of the history index
+    :rtype: str
+    '''
+    return os.path.join(HISTORY_SUBDIR, dataset, 'index.json')
+
+def load_history_index(
+        dataset: str
+) -> list[dict]:
+    '''
+    Loads the history index of a dataset, which
+    lists every archived snapshot sorted by its
+    issued datetime.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :return: List of snapshot entries sorted by
+        issued datetime
+    :rtype: list[dict]
+    '''
+    index_filepath = get_index_filepath(dataset)
+
+    # We need to check if the dataset has no history yet
+    if not os.path.exists(index_filepath):
+        return []
+
+    with open(index_filepath, 'r') as json_file:
+        return json.load(json_file)['snapshots']
+
+def save_history_index(
+        dataset: str,
+        snapshots: list[dict]
+) -> None:
+    '''
+    Saves the history index of a dataset, writing
+    to a temporary file first so the index is never
+    left half-written.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :param snapshots: List of snapshot entries sorted
+        by issued datetime
+    :type snapshots: list[dict]
+    '''
+    index_filepath = get_index_filepath(dataset)
+    temporary_filepath = f'{index_filepath}.{os.getpid()}.tmp'
+
+    with open(temporary_filepath, 'w') as json_file:
+        json.dump({'snapshots': snapshots}, json_file, indent=4)
+
+    os.replace(temporary_filepath, index_filepath)
+
+def archive_snapshot(
+        dataset_subdir: str,
+        dataset: str,
+        issued_datetime: str,
+        valid_period: str | None = None
+) -> str | None:
+    '''
+    Copies the published snapshot of a dataset into
+    the history store under a partition named after
+    its issued datetime, such as
+    data/history/daily_weather_forecast/2025/12/06/0400,
+    and adds it to the history index of the dataset.
+    A snapshot that was issued again replaces the
+    one archived for the same issued datetime.
+
+    :param dataset_subdir: Path of the published
+        dataset subdirectory, such as
+        data/raw/daily_weather_forecast
+    :type dataset_subdir: str
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :param issued_datetime: Issued datetime scraped
+        from the page
+    :type issued_datetime: str
+
+    :param valid_period: Valid period scraped from
+        the page, if the page has one
+    :type valid_period: str | None
+
+    :return: Path of the archived snapshot, or None
+        if nothing was archived
+    :rtype: str | None
+    '''
+    # We need to check if the history store is turned off so nothing is archived
+    if not USE_HISTORY_STORE:
+        return None
+
+    issued_at = parse_issued_datetime(issued_datetime)
+
+    # We need to check if the issued datetime can't be used as a partition
+    if issued_at is None:
+        warnings.warn(f'Unknown issued datetime {issued_datetime!r}, skipping the history store')
+        return None
+
+    valid_from, valid_until = parse_valid_period(valid_period, issued_at)
+
+    partition = issued_at.strftime(PARTITION_FORMAT)
+    snapshot_subdir = os.path.join(HISTORY_SUBDIR, dataset, partition)
+    parent_subdir = os.path.dirname(snapshot_subdir)
+    os.makedirs(parent_subdir, exist_ok=True)
+
+    # Stage the copy next to its partition so it is published with one rename
+    staging_subdir = os.path.join(
+        parent_subdir,
+        f'.{os.path.basename(snapshot_subdir)}.staging-{uuid.uuid4().hex}'
+    )
+
+    try:
+        shutil.copytree(dataset_subdir, staging_subdir)
+        publish_snapshot(staging_subdir, snapshot_subdir)
+
+    finally:
+        shutil.rmtree(staging_subdir, ignore_errors=True)
+
+    entry = {
+        'issued_at': issued_at.isoformat(),
+        'issued_datetime': issued_datetime,
+        'valid_from': valid_from.isoformat() if valid_from is not None else None,
+        'valid_until': valid_until.isoformat() if valid_until is not None else None,
+        'partition': partition,
+        'archived_at': datetime.now().isoformat(timespec='seconds')
+    }
+
+    lock_filepath = f'{get_index_filepath(dataset)}.lock'
+
+    # Lock the index so concurrent jobs and processes don't lose each other's entries
+    with _index_lock, open(lock_filepath, 'w') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+        snapshots = load_history_index(dataset)
+        list_of_all_issued_ats = [snapshot['issued_at'] for snapshot in snapshots]
+        position = bisect.bisect_left(list_of_all_issued_ats, entry['issued_at'])
+
+        # Replace the entry of a snapshot that was issued again, otherwise insert it in order
+        if position < len(snapshots) and list_of_all_issued_ats[position] == entry['issued_at']:
+            snapshots[position] = entry
+
+        else:
+            snapshots.insert(position, entry)
+
+        save_history_index(dataset, snapshots)
+
+    return snapshot_subdir
+
+def find_latest_snapshot(
+        dataset: str
+) -> dict | None:
+    '''
+    Finds the most recently issued snapshot of a
+    dataset in the history store.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :return: Index entry of the snapshot, with its
+        path under the "subdir" key, or None if the
+        dataset has no history
+    :rtype: dict | None
+    '''
+    snapshots = load_history_index(dataset)
+
+    if snapshots == []:
+        return None
+
+    return dict(snapshots[-1], subdir=os.path.join(HISTORY_SUBDIR, dataset, snapshots[-1]['partition']))
+
+def find_snapshot_as_of(
+        dataset: str,
+        as_of: datetime
+) -> dict | None:
+    '''
+    Finds the snapshot of a dataset that was the
+    latest one issued at a given time, using a
+    binary search over the history index.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :param as_of: Time to look up the snapshot for
+    :type as_of: datetime
+
+    :return: Index entry of the snapshot, with its
+        path under the "subdir" key, or None if no
+        snapshot was issued before that time
+    :rtype: dict | None
+    '''
+    snapshots = load_history_index(dataset)
+    list_of_all_issued_ats = [snapshot['issued_at'] for snapshot in snapshots]
+
+    # ISO datetimes sort the same way as the datetimes they represent
+    position = bisect.bisect_right(list_of_all_issued_ats, as_of.isoformat())
+
+    if position == 0:
+        return None
+
+    snapshot = snapshots[position - 1]
+
+    return dict(snapshot, subdir=os.path.join(HISTORY_SUBDIR, dataset, snapshot['partition']))
@@ -0,0 +1,180 @@
+'''
+    Module for storing downloaded images, such as the
+    rainfall maps of the tropical cyclones, by the
+    SHA-256 hash of their content in the data/images
+    subdirectory, with an index of the URL each image
+    was downloaded from.
+'''
+import os
+import json
+import hashlib
+from urllib.parse import urlsplit
+
+# Image store settings (can be overridden using environment variables)
+IMAGES_SUBDIR = os.environ.get('PAGASA_IMAGES_SUBDIR', 'data/images')
+IMAGE_INDEX_FILEPATH = os.path.join(IMAGES_SUBDIR, 'index.json')
+
+# Size of the chunks that files are hashed in, so images are never read into memory whole
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def get_partial_filepath(
+        url: str
+) -> str:
+    '''
+    Returns the path of the partial file that an
+    image is downloaded to, which stays the same
+    across runs so interrupted downloads resume.
+
+    :param url: URL of the image
+    :type url: str
+
+    :return: Path of the partial file, such as
+        data/images/partial/<hash of the URL>.part
+    :rtype: str
+    '''
+    url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    return os.path.join(IMAGES_SUBDIR, 'partial', f'{url_hash}.part')
+
+def get_object_filepath(
+        content_hash: str,
+        extension: str
+) -> str:
+    '''
+    Returns the path of an image in the content
+    addressed store, fanned out by the first two
+    characters of its hash.
+
+    :param content_hash: SHA-256 hash of the image
+    :type content_hash: str
+
+    :param extension: Extension of the image, such
+        as .jpg
+    :type extension: str
+
+    :return: Path of the image, such as
+        data/images/objects/3f/3f9a...c1.jpg
+    :rtype: str
+    '''
+    return os.path.join(IMAGES_SUBDIR, 'objects', content_hash[:2], f'{content_hash}{extension}')
+
+def hash_file(
+        filepath: str
+) -> str:
+    '''
+    Hashes a file chunk by chunk.
+
+    :param filepath: Path of the file
+    :type filepath: str
+
+    :return: SHA-256 hash of the file
+    :rtype: str
+    '''
+    content_hash = hashlib.sha256()
+
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            content_hash.update(chunk)
+
+    return content_hash.hexdigest()
+
+def load_image_index(
+) -> dict[str, dict]:
+    '''
+    Loads the index of the downloaded images.
+
+    :return: Dictionary of image URLs with the hash,
+        size and path of their stored image
+    :rtype: dict[str, dict]
+    '''
+    # We need to check if no image was downloaded yet
+    if not os.path.exists(IMAGE_INDEX_FILEPATH):
+        return {}
+
+    with open(IMAGE_INDEX_FILEPATH, 'r') as json_file:
+        return json.load(json_file)
+
+def save_image_index(
+        image_index: dict[str, dict]
+) -> None:
+    '''
+    Saves the index of the downloaded images,
+    writing to a temporary file first so it is
+    never left half-written.
+
+    :param image_index: Dictionary of image URLs
+        with the hash, size and path of their
+        stored image
+    :type image_index: dict[str, dict]
+    '''
+    os.makedirs(IMAGES_SUBDIR, exist_ok=True)
+
+    temporary_filepath = f'{IMAGE_INDEX_FILEPATH}.{os.getpid()}.tmp'
+    with open(temporary_filepath, 'w') as json_file:
+        json.dump(image_index, json_file, indent=4, sort_keys=True)
+
+    os.replace(temporary_filepath, IMAGE_INDEX_FILEPATH)
+
+def is_image_stored(
+        url: str,
+        image_index: dict[str, dict]
+) -> bool:
+    '''
+    Checks if the image of a URL was already
+    downloaded and is still in the store.
+
+    :param url: URL of the image
+    :type url: str
+
+    :param image_index: Dictionary of image URLs
+        with the hash, size and path of their
+        stored image
+    :type image_index: dict[str, dict]
+
+    :return: True if the image doesn't have to be
+        downloaded again
+    :rtype: bool
+    '''
+    entry = image_index.get(url)
+
+    return entry is not None and os.path.exists(entry['filepath'])
+
+def store_image(
+        url: str,
+        partial_filepath: str
+) -> dict:
+    '''
+    Moves a fully downloaded image into the content
+    addressed store. An image with the same content
+    that is already stored, such as one listed under
+    two URLs, is kept and the download is dropped.
+
+    :param url: URL the image was downloaded from
+    :type url: str
+
+    :param partial_filepath: Path of the fully
+        downloaded partial file
+    :type partial_filepath: str
+
+    :return: Index entry of the image with its hash,
+        size and path
+    :rtype: dict
+    '''
+    content_hash = hash_file(partial_filepath)
+    size = os.path.getsize(partial_filepath)
+    extension = os.path.splitext(urlsplit(url).path)[1].lower()
+    object_filepath = get_object_filepath(content_hash, extension)
+
+    # We need to check if the same image is already stored
+    if os.path.exists(object_filepath):
+        os.remove(partial_filepath)
+
+    else:
+        os.makedirs(os.path.dirname(object_filepath), exist_ok=True)
+        os.replace(partial_filepath, object_filepath)
+
+    return {
+        'content_hash': content_hash,
+        'size': size,
+        'filepath': object_filepath
+    }
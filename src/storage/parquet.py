@@ -0,0 +1,173 @@
+'''
+    Module for writing the weather outlooks of
+    selected Philippine cities and tourist areas as
+    typed, columnar Parquet files with one row per
+    area and date, so analytics jobs can read only
+    the columns they need.
+'''
+import os
+import re
+import warnings
+from datetime import date
+from datetime import datetime
+
+# Parquet sink settings (can be overridden using environment variables)
+USE_PARQUET_SINK = os.environ.get('PAGASA_USE_PARQUET_SINK', '0') == '1'
+PARQUET_SUBDIR = os.environ.get('PAGASA_PARQUET_SUBDIR', 'data/parquet')
+
+# Format of the weather dates, such as "Saturday December 06, 2025"
+WEATHER_DATE_FORMAT = '%A %B %d, %Y'
+
+INTEGER_PATTERN = re.compile(r'-?\d+')
+
+def parse_integer(
+        value: str | None
+) -> int | None:
+    '''
+    Parses the first integer of a value such as
+    "25°C" or "Chance of rain: 100%".
+
+    :param value: Value scraped from the page
+    :type value: str | None
+
+    :return: Integer in the value, or None if there
+        is no integer in it
+    :rtype: int | None
+    '''
+    if value is None:
+        return None
+
+    match = INTEGER_PATTERN.search(value)
+
+    # We need to check if the value has no number, such as an empty cell
+    if match is None:
+        return None
+
+    return int(match.group())
+
+def parse_weather_date(
+        weather_date: str
+) -> date | None:
+    '''
+    Parses a weather date such as "Saturday
+    December 06, 2025" into a date.
+
+    :param weather_date: Weather date scraped from
+        the page
+    :type weather_date: str
+
+    :return: Parsed date, or None if the weather
+        date is in an unknown format
+    :rtype: date | None
+    '''
+    try:
+        return datetime.strptime(' '.join(weather_date.split()), WEATHER_DATE_FORMAT).date()
+
+    except (AttributeError, ValueError):
+        return None
+
+def flatten_weather_outlook(
+        weather_outlook: dict[str, dict]
+) -> dict[str, list]:
+    '''
+    Flattens a nested weather outlook into columns
+    with one row per area and date.
+
+    :param weather_outlook: Dictionary of areas with
+        their weather dates, temperature ranges and,
+        for cities, chance of rain percentages
+    :type weather_outlook: dict[str, dict]
+
+    :return: Dictionary of column names with their
+        values
+    :rtype: dict[str, list]
+    '''
+    columns = {
+        'area': [],
+        'weather_date': [],
+        'min_temperature_celsius': [],
+        'max_temperature_celsius': [],
+        'chance_of_rain_percent': []
+    }
+
+    for area, outlook in weather_outlook.items():
+        weather_dates = outlook.get('weather_dates', [])
+        temperature_ranges = outlook.get('temperature_ranges', [])
+        chance_of_rain_percentages = outlook.get('chance_of_rain_percentages', [])
+
+        for index, weather_date in enumerate(weather_dates):
+            temperature_range = temperature_ranges[index] if index < len(temperature_ranges) else []
+            chance_of_rain_percentage = (
+                chance_of_rain_percentages[index]
+                if index < len(chance_of_rain_percentages)
+                else None
+            )
+
+            columns['area'].append(area)
+            columns['weather_date'].append(parse_weather_date(weather_date))
+            columns['min_temperature_celsius'].append(
+                parse_integer(temperature_range[0]) if len(temperature_range) > 0 else None
+            )
+            columns['max_temperature_celsius'].append(
+                parse_integer(temperature_range[1]) if len(temperature_range) > 1 else None
+            )
+            columns['chance_of_rain_percent'].append(parse_integer(chance_of_rain_percentage))
+
+    return columns
+
+def save_weather_outlook_to_parquet(
+        weather_outlook: dict[str, dict],
+        dataset: str,
+        filename: str
+) -> None:
+    '''
+    Saves a weather outlook as a Parquet file under
+    the Parquet subdirectory of its dataset, if the
+    Parquet sink is turned on. Area names are
+    dictionary-encoded and all values are stored
+    as integers and dates instead of strings.
+
+    :param weather_outlook: Dictionary of areas with
+        their weather outlook
+    :type weather_outlook: dict[str, dict]
+
+    :param dataset: Name of the dataset, such as
+        weather_outlook_for_ph_cities
+    :type dataset: str
+
+    :param filename: Name of the Parquet file, such
+        as ph_cities_weather_outlook.parquet
+    :type filename: str
+    '''
+    # We need to check if the Parquet sink is turned off so nothing is written
+    if not USE_PARQUET_SINK:
+        return
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    except ImportError:
+        warnings.warn('pyarrow is not installed, skipping the Parquet sink')
+        return
+
+    columns = flatten_weather_outlook(weather_outlook)
+
+    table = pa.table({
+        'area': pa.array(columns['area'], type=pa.string()).dictionary_encode(),
+        'weather_date': pa.array(columns['weather_date'], type=pa.date32()),
+        'min_temperature_celsius': pa.array(columns['min_temperature_celsius'], type=pa.int16()),
+        'max_temperature_celsius': pa.array(columns['max_temperature_celsius'], type=pa.int16()),
+        'chance_of_rain_percent': pa.array(columns['chance_of_rain_percent'], type=pa.int8())
+    })
+
+    subdir = os.path.join(PARQUET_SUBDIR, dataset)
+    if not os.path.exists(subdir):
+        os.makedirs(subdir, exist_ok=True)
+
+    filepath = os.path.join(subdir, filename)
+
+    # Write to a temporary file first so readers never see a half-written file
+    temporary_filepath = f'{filepath}.{os.getpid()}.tmp'
+    pq.write_table(table, temporary_filepath, compression='zstd')
+    os.replace(temporary_filepath, filepath)
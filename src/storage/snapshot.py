@@ -0,0 +1,183 @@
+'''
+    Module for writing all JSON files of a dataset
+    as one snapshot that is staged in a temporary
+    directory and published with a single atomic
+    rename, so readers never see a mix of old and
+    new files.
+'''
+import os
+import uuid
+import errno
+import ctypes
+import shutil
+from contextlib import contextmanager
+from typing import Iterator
+from monitor.timing import timing_span
+
+# Flags for the Linux renameat2() system call
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+def exchange_subdirs(
+        first_subdir: str,
+        second_subdir: str
+) -> bool:
+    '''
+    Atomically swaps two directories with the
+    Linux renameat2() system call, so each path
+    points to the other directory's contents.
+
+    :param first_subdir: Path of the first directory
+    :type first_subdir: str
+
+    :param second_subdir: Path of the second directory
+    :type second_subdir: str
+
+    :return: True if the directories were swapped,
+        or False if the platform doesn't support it
+    :rtype: bool
+    '''
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = libc.renameat2
+
+    except (OSError, AttributeError, TypeError):
+        return False
+
+    result = renameat2(
+        AT_FDCWD,
+        os.fsencode(first_subdir),
+        AT_FDCWD,
+        os.fsencode(second_subdir),
+        RENAME_EXCHANGE
+    )
+
+    if result != 0:
+        error_number = ctypes.get_errno()
+
+        # We need to check if the kernel or filesystem doesn't support swapping directories
+        if error_number in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+            return False
+
+        raise OSError(error_number, os.strerror(error_number), first_subdir)
+
+    return True
+
+def fsync_subdir(
+        subdir: str
+) -> None:
+    '''
+    Flushes every file in a directory, and the
+    directory itself, to disk.
+
+    :param subdir: Path of the directory
+    :type subdir: str
+    '''
+    for filename in os.listdir(subdir):
+        filepath = os.path.join(subdir, filename)
+
+        if os.path.isfile(filepath):
+            with open(filepath, 'rb') as file:
+                os.fsync(file.fileno())
+
+    # Directories can't be opened for fsync on Windows
+    if hasattr(os, 'O_DIRECTORY'):
+        file_descriptor = os.open(subdir, os.O_RDONLY | os.O_DIRECTORY)
+
+        try:
+            os.fsync(file_descriptor)
+
+        finally:
+            os.close(file_descriptor)
+
+def publish_snapshot(
+        staging_subdir: str,
+        dataset_subdir: str
+) -> None:
+    '''
+    Publishes a staged snapshot as the dataset
+    subdirectory. Files of the current snapshot
+    that weren't staged again are carried over
+    so the published snapshot is always complete.
+
+    :param staging_subdir: Path of the directory
+        containing the staged files
+    :type staging_subdir: str
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory, such as
+        data/raw/daily_weather_forecast
+    :type dataset_subdir: str
+    '''
+    with timing_span('publish', subdir=dataset_subdir):
+        # Carry over files of the current snapshot that weren't written again
+        if os.path.isdir(dataset_subdir):
+            list_of_all_staged_filenames = set(os.listdir(staging_subdir))
+
+            for filename in os.listdir(dataset_subdir):
+                filepath = os.path.join(dataset_subdir, filename)
+
+                if filename not in list_of_all_staged_filenames and os.path.isfile(filepath):
+                    shutil.copy2(filepath, os.path.join(staging_subdir, filename))
+
+        fsync_subdir(staging_subdir)
+
+        # We need to check if there is no current snapshot to swap with
+        if not os.path.exists(dataset_subdir):
+            os.replace(staging_subdir, dataset_subdir)
+            return
+
+        # Swap the staged and current snapshots with a single atomic rename
+        if exchange_subdirs(staging_subdir, dataset_subdir):
+            shutil.rmtree(staging_subdir)
+            return
+
+        # Otherwise replace the files one at a time, where each file is still replaced atomically
+        for filename in os.listdir(staging_subdir):
+            os.replace(
+                os.path.join(staging_subdir, filename),
+                os.path.join(dataset_subdir, filename)
+            )
+
+        shutil.rmtree(staging_subdir)
+
+@contextmanager
+def snapshot_writer(
+        dataset_subdir: str
+) -> Iterator[str]:
+    '''
+    Creates a temporary staging directory next to
+    the dataset subdirectory for the save functions
+    to write into, and publishes it as one snapshot
+    once the with block finishes without errors.
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory, such as
+        data/raw/daily_weather_forecast
+    :type dataset_subdir: str
+
+    :return: Path of the staging directory
+    :rtype: Iterator[str]
+    '''
+    # Stage on the same filesystem as the dataset so the rename stays atomic
+    parent_subdir, dataset_name = os.path.split(os.path.normpath(dataset_subdir))
+    staging_subdir = os.path.join(
+        parent_subdir,
+        f'.{dataset_name}.staging-{uuid.uuid4().hex}'
+    )
+    os.makedirs(staging_subdir)
+
+    try:
+        yield staging_subdir
+
+    except BaseException:
+        # Discard the partially staged snapshot so the current one stays untouched
+        shutil.rmtree(staging_subdir, ignore_errors=True)
+        raise
+
+    try:
+        publish_snapshot(staging_subdir, dataset_subdir)
+
+    finally:
+        # Clean up the staging directory if publishing failed halfway
+        shutil.rmtree(staging_subdir, ignore_errors=True)
\ No newline at end of file
@@ -0,0 +1,626 @@
+'''
+    Module for loading the published snapshots of
+    every dataset into normalized, indexed tables of
+    a local SQLite database, so dashboards can query
+    them instead of globbing JSON files.
+'''
+import os
+import re
+import json
+import sqlite3
+from datetime import datetime
+from storage.history import parse_issued_datetime
+from storage.parquet import parse_integer
+from storage.parquet import parse_weather_date
+
+# SQLite sink settings (can be overridden using environment variables)
+USE_SQLITE_SINK = os.environ.get('PAGASA_USE_SQLITE_SINK', '0') == '1'
+SQLITE_FILEPATH = os.environ.get('PAGASA_SQLITE_FILEPATH', 'data/pagasa.sqlite3')
+
+# Seconds to wait for concurrent ingest jobs to finish writing
+SQLITE_TIMEOUT = float(os.environ.get('PAGASA_SQLITE_TIMEOUT', '30'))
+
+# Numbers such as "29.9" in "29.9 °C"
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+# Years of the yearly rainfall files, such as tropical_cyclone_associated_rainfalls_of_2025.json
+RAINFALL_YEAR_PATTERN = re.compile(r'^tropical_cyclone_associated_rainfalls_of_(\d{4})\.json$')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    issued_at TEXT,
+    issued_datetime TEXT,
+    valid_period TEXT,
+    ingested_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_dataset_and_issued_at
+    ON snapshots (dataset, issued_at);
+
+CREATE TABLE IF NOT EXISTS areas (
+    area_id INTEGER PRIMARY KEY,
+    area_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (name, area_type)
+);
+
+CREATE TABLE IF NOT EXISTS weather_outlooks (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    area_id INTEGER NOT NULL REFERENCES areas (area_id),
+    forecast_date TEXT,
+    min_temperature_celsius INTEGER,
+    max_temperature_celsius INTEGER,
+    chance_of_rain_percent INTEGER,
+    PRIMARY KEY (snapshot_id, area_id, forecast_date)
+);
+CREATE INDEX IF NOT EXISTS weather_outlooks_by_area_and_snapshot
+    ON weather_outlooks (area_id, snapshot_id);
+CREATE INDEX IF NOT EXISTS weather_outlooks_by_forecast_date
+    ON weather_outlooks (forecast_date);
+
+CREATE TABLE IF NOT EXISTS synopses (
+    snapshot_id INTEGER PRIMARY KEY REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    synopsis TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tropical_cyclone_information (
+    snapshot_id INTEGER PRIMARY KEY REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    current_update TEXT,
+    tropical_cyclone_name TEXT,
+    location TEXT,
+    maximum_sustained_winds_kph INTEGER,
+    gustiness_kph INTEGER,
+    movement TEXT
+);
+
+CREATE TABLE IF NOT EXISTS forecast_weather_conditions (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    place TEXT,
+    weather_condition TEXT,
+    caused_by TEXT,
+    impacts TEXT,
+    PRIMARY KEY (snapshot_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS forecast_wind_and_coastal_water_conditions (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    place TEXT,
+    speed TEXT,
+    direction TEXT,
+    coastal_water TEXT,
+    PRIMARY KEY (snapshot_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS temperature_and_relative_humidity (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    measure TEXT NOT NULL,
+    extreme TEXT NOT NULL,
+    value REAL,
+    observed_time TEXT,
+    PRIMARY KEY (snapshot_id, measure, extreme)
+);
+
+CREATE TABLE IF NOT EXISTS weather_advisories (
+    snapshot_id INTEGER PRIMARY KEY REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    pdf_url TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tropical_cyclone_associated_rainfalls (
+    image_url TEXT PRIMARY KEY,
+    year INTEGER,
+    first_snapshot_id INTEGER REFERENCES snapshots (snapshot_id) ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS tropical_cyclone_associated_rainfalls_by_year
+    ON tropical_cyclone_associated_rainfalls (year);
+
+CREATE TABLE IF NOT EXISTS current_tropical_cyclone_associated_rainfalls (
+    snapshot_id INTEGER PRIMARY KEY REFERENCES snapshots (snapshot_id) ON DELETE CASCADE,
+    image_url TEXT
+);
+'''
+
+def connect(
+        filepath: str | None = None
+) -> sqlite3.Connection:
+    '''
+    Opens the SQLite database, creating its tables
+    and indexes if they don't exist yet.
+
+    :param filepath: Path of the SQLite database,
+        or None to use the PAGASA_SQLITE_FILEPATH
+        setting
+    :type filepath: str | None
+
+    :return: Connection in autocommit mode, so each
+        run controls its own transaction
+    :rtype: sqlite3.Connection
+    '''
+    if filepath is None:
+        filepath = SQLITE_FILEPATH
+
+    sqlite_subdir = os.path.dirname(filepath)
+    if sqlite_subdir and not os.path.exists(sqlite_subdir):
+        os.makedirs(sqlite_subdir, exist_ok=True)
+
+    connection = sqlite3.connect(filepath, timeout=SQLITE_TIMEOUT, isolation_level=None)
+
+    # WAL lets dashboards read while an ingest job is writing
+    connection.execute('PRAGMA journal_mode = WAL')
+    connection.execute('PRAGMA synchronous = NORMAL')
+    connection.execute('PRAGMA foreign_keys = ON')
+    connection.executescript(SCHEMA)
+
+    return connection
+
+def read_json(
+        dataset_subdir: str,
+        filename: str
+) -> dict | None:
+    '''
+    Reads a JSON file of a published snapshot.
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory
+    :type dataset_subdir: str
+
+    :param filename: Name of the JSON file
+    :type filename: str
+
+    :return: Content of the JSON file, or None if
+        the snapshot doesn't have it
+    :rtype: dict | None
+    '''
+    filepath = os.path.join(dataset_subdir, filename)
+
+    # We need to check if the snapshot has this file
+    if not os.path.exists(filepath):
+        return None
+
+    with open(filepath, 'r') as json_file:
+        return json.load(json_file)
+
+def parse_number(
+        value: str | None
+) -> float | None:
+    '''
+    Parses the first number of a value such as
+    "29.9 °C".
+
+    :param value: Value scraped from the page
+    :type value: str | None
+
+    :return: Number in the value, or None if there
+        is no number in it
+    :rtype: float | None
+    '''
+    if value is None:
+        return None
+
+    match = NUMBER_PATTERN.search(value)
+
+    return float(match.group()) if match is not None else None
+
+def insert_snapshot(
+        cursor: sqlite3.Cursor,
+        dataset: str,
+        dataset_subdir: str
+) -> int:
+    '''
+    Inserts a row for a published snapshot. A
+    snapshot that was issued again replaces the
+    rows of the one stored for the same issued
+    datetime.
+
+    :param cursor: Cursor inside the transaction
+        of the run
+    :type cursor: sqlite3.Cursor
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory
+    :type dataset_subdir: str
+
+    :return: ID of the inserted snapshot
+    :rtype: int
+    '''
+    issued_datetime = (read_json(dataset_subdir, 'issued_datetime.json') or {}).get('issued_datetime')
+    valid_period = (read_json(dataset_subdir, 'valid_period.json') or {}).get('valid_period')
+
+    issued_at = parse_issued_datetime(issued_datetime)
+    issued_at = issued_at.isoformat() if issued_at is not None else None
+
+    if issued_at is not None:
+        cursor.execute(
+            'DELETE FROM snapshots WHERE dataset = ? AND issued_at = ?',
+            (dataset, issued_at)
+        )
+
+    cursor.execute(
+        '''
+        INSERT INTO snapshots (dataset, issued_at, issued_datetime, valid_period, ingested_at)
+        VALUES (?, ?, ?, ?, ?)
+        ''',
+        (dataset, issued_at, issued_datetime, valid_period, datetime.now().isoformat(timespec='seconds'))
+    )
+
+    return cursor.lastrowid
+
+def insert_weather_outlook(
+        cursor: sqlite3.Cursor,
+        snapshot_id: int,
+        weather_outlook: dict[str, dict],
+        area_type: str
+) -> None:
+    '''
+    Inserts one row per area and forecast date of
+    a weather outlook, with the temperatures and
+    chance of rain stored as integers.
+
+    :param cursor: Cursor inside the transaction
+        of the run
+    :type cursor: sqlite3.Cursor
+
+    :param snapshot_id: ID of the snapshot
+    :type snapshot_id: int
+
+    :param weather_outlook: Dictionary of areas with
+        their weather outlook
+    :type weather_outlook: dict[str, dict]
+
+    :param area_type: Type of the areas, either
+        city or tourist_area
+    :type area_type: str
+    '''
+    cursor.executemany(
+        'INSERT OR IGNORE INTO areas (area_type, name) VALUES (?, ?)',
+        [(area_type, area) for area in weather_outlook]
+    )
+    area_ids = dict(cursor.execute(
+        'SELECT name, area_id FROM areas WHERE area_type = ?',
+        (area_type,)
+    ).fetchall())
+
+    rows = []
+
+    for area, outlook in weather_outlook.items():
+        temperature_ranges = outlook.get('temperature_ranges', [])
+        chance_of_rain_percentages = outlook.get('chance_of_rain_percentages', [])
+
+        for index, weather_date in enumerate(outlook.get('weather_dates', [])):
+            forecast_date = parse_weather_date(weather_date)
+            temperature_range = temperature_ranges[index] if index < len(temperature_ranges) else []
+
+            rows.append((
+                snapshot_id,
+                area_ids[area],
+                forecast_date.isoformat() if forecast_date is not None else weather_date,
+                parse_integer(temperature_range[0]) if len(temperature_range) > 0 else None,
+                parse_integer(temperature_range[1]) if len(temperature_range) > 1 else None,
+                parse_integer(chance_of_rain_percentages[index]) if index < len(chance_of_rain_percentages) else None
+            ))
+
+    cursor.executemany(
+        '''
+        INSERT OR REPLACE INTO weather_outlooks (
+            snapshot_id,
+            area_id,
+            forecast_date,
+            min_temperature_celsius,
+            max_temperature_celsius,
+            chance_of_rain_percent
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''',
+        rows
+    )
+
+def insert_daily_weather_forecast(
+        cursor: sqlite3.Cursor,
+        snapshot_id: int,
+        dataset_subdir: str
+) -> None:
+    '''
+    Inserts every section of a daily weather
+    forecast snapshot.
+
+    :param cursor: Cursor inside the transaction
+        of the run
+    :type cursor: sqlite3.Cursor
+
+    :param snapshot_id: ID of the snapshot
+    :type snapshot_id: int
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory
+    :type dataset_subdir: str
+    '''
+    synopsis = read_json(dataset_subdir, 'synopsis.json')
+    if synopsis is not None:
+        cursor.execute(
+            'INSERT INTO synopses (snapshot_id, synopsis) VALUES (?, ?)',
+            (snapshot_id, synopsis.get('synopsis'))
+        )
+
+    # We need to check if there is an active tropical cyclone before storing its information
+    tc_information = read_json(dataset_subdir, 'tropical_cyclone_information.json') or {}
+    if tc_information.get('tropical_cyclone_name'):
+        cursor.execute(
+            '''
+            INSERT INTO tropical_cyclone_information (
+                snapshot_id,
+                current_update,
+                tropical_cyclone_name,
+                location,
+                maximum_sustained_winds_kph,
+                gustiness_kph,
+                movement
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''',
+            (
+                snapshot_id,
+                tc_information.get('current_update'),
+                tc_information.get('tropical_cyclone_name'),
+                tc_information.get('location'),
+                parse_integer(tc_information.get('maximum_sustained_winds')),
+                parse_integer(tc_information.get('gustiness')),
+                tc_information.get('movement')
+            )
+        )
+
+    forecast_weather_conditions = read_json(dataset_subdir, 'forecast_weather_conditions.json') or {}
+    cursor.executemany(
+        '''
+        INSERT INTO forecast_weather_conditions (
+            snapshot_id,
+            position,
+            place,
+            weather_condition,
+            caused_by,
+            impacts
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''',
+        [
+            (snapshot_id, position, *row)
+            for position, row in enumerate(zip(
+                forecast_weather_conditions.get('place', []),
+                forecast_weather_conditions.get('weather_condition', []),
+                forecast_weather_conditions.get('caused_by', []),
+                forecast_weather_conditions.get('impacts', [])
+            ))
+        ]
+    )
+
+    forecast_wind_and_coastal_water_conditions = read_json(
+        dataset_subdir,
+        'forecast_wind_and_coastal_water_conditions.json'
+    ) or {}
+    cursor.executemany(
+        '''
+        INSERT INTO forecast_wind_and_coastal_water_conditions (
+            snapshot_id,
+            position,
+            place,
+            speed,
+            direction,
+            coastal_water
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''',
+        [
+            (snapshot_id, position, *row)
+            for position, row in enumerate(zip(
+                forecast_wind_and_coastal_water_conditions.get('place', []),
+                forecast_wind_and_coastal_water_conditions.get('speed', []),
+                forecast_wind_and_coastal_water_conditions.get('direction', []),
+                forecast_wind_and_coastal_water_conditions.get('coastal_water', [])
+            ))
+        ]
+    )
+
+    temperature_and_relative_humidity = read_json(dataset_subdir, 'temperature_and_relative_humidity.json') or {}
+    cursor.executemany(
+        '''
+        INSERT INTO temperature_and_relative_humidity (
+            snapshot_id,
+            measure,
+            extreme,
+            value,
+            observed_time
+        )
+        VALUES (?, ?, ?, ?, ?)
+        ''',
+        [
+            (
+                snapshot_id,
+                measure,
+                extreme,
+                parse_number(value_and_time[0]) if len(value_and_time) > 0 else None,
+                value_and_time[1] if len(value_and_time) > 1 else None
+            )
+            for measure, extremes in temperature_and_relative_humidity.items()
+            for extreme, value_and_time in extremes.items()
+        ]
+    )
+
+def insert_weather_outlook_for_ph_cities(
+        cursor: sqlite3.Cursor,
+        snapshot_id: int,
+        dataset_subdir: str
+) -> None:
+    '''
+    Inserts a snapshot of the weather outlook for
+    selected Philippine cities.
+
+    :param cursor: Cursor inside the transaction
+        of the run
+    :type cursor: sqlite3.Cursor
+
+    :param snapshot_id: ID of the snapshot
+    :type snapshot_id: int
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory
+    :type dataset_subdir: str
+    '''
+    weather_outlook = read_json(dataset_subdir, 'ph_cities_weather_outlook.json') or {}
+    insert_weather_outlook(cursor, snapshot_id, weather_outlook, 'city')
+
+def insert_weather_outlook_for_ph_tourist_areas(
+        cursor: sqlite3.Cursor,
+        snapshot_id: int,
+        dataset_subdir: str
+) -> None:
+    '''
+    Inserts a snapshot of the weather outlook for
+    selected Philippine tourist areas.
+
+    :param cursor: Cursor inside the transaction
+        of the run
+    :type cursor: sqlite3.Cursor
+
+    :param snapshot_id: ID of the snapshot
+    :type snapshot_id: int
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory
+    :type dataset_subdir: str
+    '''
+    weather_outlook = read_json(dataset_subdir, 'ph_tourist_areas_weather_outlook.json') or {}
+    insert_weather_outlook(cursor, snapshot_id, weather_outlook, 'tourist_area')
+
+def insert_weather_advisory(
+        cursor: sqlite3.Cursor,
+        snapshot_id: int,
+        dataset_subdir: str
+) -> None:
+    '''
+    Inserts a snapshot of the weather advisory.
+
+    :param cursor: Cursor inside the transaction
+        of the run
+    :type cursor: sqlite3.Cursor
+
+    :param snapshot_id: ID of the snapshot
+    :type snapshot_id: int
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory
+    :type dataset_subdir: str
+    '''
+    weather_advisory = read_json(dataset_subdir, 'weather_advisory.json') or {}
+    cursor.execute(
+        'INSERT INTO weather_advisories (snapshot_id, pdf_url) VALUES (?, ?)',
+        (snapshot_id, weather_advisory.get('weather_advisory'))
+    )
+
+def insert_tropical_cyclone_associated_rainfall(
+        cursor: sqlite3.Cursor,
+        snapshot_id: int,
+        dataset_subdir: str
+) -> None:
+    '''
+    Inserts a snapshot of the tropical cyclone
+    associated rainfall. Rainfall images of past
+    years are stored only once, however many
+    snapshots list them.
+
+    :param cursor: Cursor inside the transaction
+        of the run
+    :type cursor: sqlite3.Cursor
+
+    :param snapshot_id: ID of the snapshot
+    :type snapshot_id: int
+
+    :param dataset_subdir: Path of the dataset
+        subdirectory
+    :type dataset_subdir: str
+    '''
+    current_rainfall = read_json(dataset_subdir, 'current_tropical_cyclone_associated_rainfall.json') or {}
+    cursor.execute(
+        'INSERT INTO current_tropical_cyclone_associated_rainfalls (snapshot_id, image_url) VALUES (?, ?)',
+        (snapshot_id, current_rainfall.get('tropical_cyclone_associated_rainfall'))
+    )
+
+    rows = []
+
+    for filename in sorted(os.listdir(dataset_subdir)):
+        match = RAINFALL_YEAR_PATTERN.match(filename)
+
+        if match is None:
+            continue
+
+        yearly_rainfalls = read_json(dataset_subdir, filename) or {}
+        year = int(match.group(1))
+
+        rows.extend(
+            (image_url, year, snapshot_id)
+            for image_url in yearly_rainfalls.get(f'tropical_cyclone_associated_rainfalls_of_{year}', [])
+        )
+
+    cursor.executemany(
+        '''
+        INSERT OR IGNORE INTO tropical_cyclone_associated_rainfalls (image_url, year, first_snapshot_id)
+        VALUES (?, ?, ?)
+        ''',
+        rows
+    )
+
+# Datasets with the function that inserts their snapshots
+INSERT_FUNCTIONS = {
+    'daily_weather_forecast': insert_daily_weather_forecast,
+    'weather_outlook_for_ph_cities': insert_weather_outlook_for_ph_cities,
+    'weather_outlook_for_ph_tourist_areas': insert_weather_outlook_for_ph_tourist_areas,
+    'weather_advisory': insert_weather_advisory,
+    'tropical_cyclone_associated_rainfall': insert_tropical_cyclone_associated_rainfall
+}
+
+def save_snapshot_to_sqlite(
+        dataset: str,
+        dataset_subdir: str
+) -> None:
+    '''
+    Loads the published snapshot of a dataset into
+    the SQLite database in one transaction, if the
+    SQLite sink is turned on.
+
+    :param dataset: Name of the dataset, such as
+        daily_weather_forecast
+    :type dataset: str
+
+    :param dataset_subdir: Path of the published
+        dataset subdirectory, such as
+        data/raw/daily_weather_forecast
+    :type dataset_subdir: str
+    '''
+    # We need to check if the SQLite sink is turned off so nothing is written
+    if not USE_SQLITE_SINK:
+        return
+
+    connection = connect()
+
+    try:
+        cursor = connection.cursor()
+
+        # Take the write lock up front so concurrent ingest jobs queue instead of deadlocking
+        cursor.execute('BEGIN IMMEDIATE')
+
+        try:
+            snapshot_id = insert_snapshot(cursor, dataset, dataset_subdir)
+            INSERT_FUNCTIONS[dataset](cursor, snapshot_id, dataset_subdir)
+
+        except BaseException:
+            cursor.execute('ROLLBACK')
+            raise
+
+        cursor.execute('COMMIT')
+
+    finally:
+        connection.close()
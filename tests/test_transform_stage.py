@@ -0,0 +1,62 @@
+'''
+    Tests for the transform stage of the ETL pipeline
+    with the history store turned on.
+'''
+import os
+import json
+import shutil
+from storage.history import archive_snapshot
+from etl.extract.stage import stage_json_file
+from executor.etl.execute_transform_stage import execute_transform_stage
+
+REPO_SUBDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET = 'weather_outlook_for_ph_cities'
+
+def ingest_snapshot(
+        issued_datetime: str
+) -> None:
+    '''
+    Publishes, archives and stages a copy of the
+    stored weather outlook for selected Philippine
+    cities under another issued datetime.
+    '''
+    dataset_subdir = os.path.join('data/raw', DATASET)
+    shutil.rmtree(dataset_subdir, ignore_errors=True)
+    shutil.copytree(os.path.join(REPO_SUBDIR, 'data/raw', DATASET), dataset_subdir)
+
+    with open(os.path.join(dataset_subdir, 'issued_datetime.json'), 'w') as json_file:
+        json.dump({'issued_datetime': issued_datetime}, json_file)
+
+    with open(os.path.join(dataset_subdir, 'valid_period.json'), 'r') as json_file:
+        valid_period = json.load(json_file).get('valid_period')
+
+    archive_snapshot(dataset_subdir, DATASET, issued_datetime, valid_period)
+
+    for filename in os.listdir(dataset_subdir):
+        stage_json_file(os.path.join(dataset_subdir, filename), DATASET)
+
+def test_latest_snapshot_is_transformed_once_with_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    ingest_snapshot('Issued at: 8:00 AM 06 December 2025')
+    rows_of_one_snapshot = execute_transform_stage()['ph_cities_weather_outlook']
+
+    ingest_snapshot('Issued at: 8:00 AM 07 December 2025')
+    number_of_rows_by_table = execute_transform_stage(include_history=True)
+
+    # The staged snapshot is the latest archived one, so only the two archived snapshots count
+    assert number_of_rows_by_table['ph_cities_weather_outlook'] == 2 * rows_of_one_snapshot
+
+def test_staged_snapshot_is_kept_if_it_was_not_archived(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    ingest_snapshot('Issued at: 8:00 AM 06 December 2025')
+    rows_of_one_snapshot = execute_transform_stage()['ph_cities_weather_outlook']
+
+    # Stage a snapshot with an issued datetime that is missing from the history index
+    with open(os.path.join('data/stage', DATASET, 'issued_datetime.json'), 'w') as json_file:
+        json.dump({'issued_datetime': 'Issued at: 8:00 AM 08 December 2025'}, json_file)
+
+    number_of_rows_by_table = execute_transform_stage(include_history=True)
+
+    assert number_of_rows_by_table['ph_cities_weather_outlook'] == 2 * rows_of_one_snapshot